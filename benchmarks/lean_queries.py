@@ -0,0 +1,134 @@
+"""
+Benchmark: wire bytes and parse time of lean vs. library GraphQL queries.
+
+Builds a synthetic response for each query from its own selection set
+(every selected field filled with a typical value, lists holding
+``--rows`` items), then reports the JSON size of the response and the
+time ``json.loads`` takes to parse it.  The library documents are
+captured by calling ``MonarchMoney.get_transactions`` and
+``get_accounts`` against a stub ``gql_call``, so the comparison tracks
+whatever the installed library version asks for.
+
+Run from the repository root::
+
+    PYTHONPATH=src python benchmarks/lean_queries.py [--rows 100] [--repeat 200]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from graphql import FieldNode, FragmentDefinitionNode, FragmentSpreadNode, InlineFragmentNode
+from monarchmoney import MonarchMoney
+
+from monarch_mcp import documents, queries
+
+# Fields returned as lists by the Monarch API
+_LIST_FIELDS = {"results", "accounts", "tags", "attachments", "transactionRules"}
+
+
+def _capture(method, *args, **kwargs):
+    """Return the document a library method sends to ``gql_call``."""
+    client = MonarchMoney()
+    sent = {}
+
+    async def _gql_call(operation, graphql_query, variables=None):  # pylint: disable=unused-argument
+        sent["query"] = graphql_query
+        return {}
+
+    client.gql_call = _gql_call
+    asyncio.run(getattr(client, method)(*args, **kwargs))
+    return sent["query"]
+
+
+def _document(query):
+    # gql() returns a GraphQLRequest wrapping the DocumentNode in gql 4
+    return getattr(query, "document", query)
+
+
+def _value(name):
+    """A typical value for a scalar field, judged by its name."""
+    lowered = name.lower()
+    if name == "__typename":
+        return "Transaction"
+    if lowered == "id" or lowered.endswith("id"):
+        return "160826837451924573"
+    if lowered.endswith("at") or lowered == "date":
+        return "2025-01-15T14:03:27.181394+00:00"
+    if name.startswith(("is", "has", "include", "hide", "sync")) or name == "pending":
+        return False
+    if "balance" in lowered or lowered in ("amount", "order", "sizebytes") or "count" in lowered:
+        return -1234.56
+    return "Sample value text"
+
+
+def _build(selection_set, fragments, rows):
+    obj = {}
+    for node in selection_set.selections:
+        if isinstance(node, FragmentSpreadNode):
+            obj.update(_build(fragments[node.name.value].selection_set, fragments, rows))
+        elif isinstance(node, InlineFragmentNode):
+            obj.update(_build(node.selection_set, fragments, rows))
+        elif isinstance(node, FieldNode):
+            name = node.name.value
+            if node.selection_set is None:
+                obj[name] = _value(name)
+            elif name in _LIST_FIELDS:
+                count = rows if name in ("results", "accounts") else 2
+                obj[name] = [_build(node.selection_set, fragments, rows) for _ in range(count)]
+            else:
+                obj[name] = _build(node.selection_set, fragments, rows)
+    return obj
+
+
+def synthetic_response(query, rows):
+    """Return a response for *query* with *rows* items in each top-level list."""
+    document = _document(query)
+    fragments = {
+        node.name.value: node for node in document.definitions
+        if isinstance(node, FragmentDefinitionNode)
+    }
+    [operation] = [
+        node for node in document.definitions if not isinstance(node, FragmentDefinitionNode)
+    ]
+    return _build(operation.selection_set, fragments, rows)
+
+
+def measure(query, rows, repeat):
+    """Return (wire bytes, median parse seconds) of a synthetic response."""
+    text = json.dumps(synthetic_response(query, rows))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        json.loads(text)
+        timings.append(time.perf_counter() - started)
+    return len(text.encode("utf-8")), statistics.median(timings)
+
+
+def main():
+    """Print wire bytes and parse time for each lean query and its library original."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--rows", type=int, default=100, help="list items per response")
+    parser.add_argument("--repeat", type=int, default=200, help="parse timings per query")
+    args = parser.parse_args()
+
+    cases = [
+        ("get_transactions", _capture("get_transactions", limit=args.rows),
+         documents.get(queries.TRANSACTIONS_QUERY)),
+        ("get_accounts", _capture("get_accounts"), documents.get(queries.ACCOUNTS_QUERY)),
+    ]
+    print(f"{'query':<18}{'library bytes':>15}{'lean bytes':>12}{'saved':>8}"
+          f"{'library parse':>16}{'lean parse':>12}")
+    for name, library, lean in cases:
+        full_bytes, full_parse = measure(library, args.rows, args.repeat)
+        lean_bytes, lean_parse = measure(lean, args.rows, args.repeat)
+        print(
+            f"{name:<18}{full_bytes:>15,}{lean_bytes:>12,}{1 - lean_bytes / full_bytes:>8.0%}"
+            f"{full_parse * 1000:>14.3f}ms{lean_parse * 1000:>10.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
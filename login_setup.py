@@ -4,6 +4,7 @@ Standalone script to perform interactive Monarch Money login with MFA support.
 Run this script to authenticate and save a session file that the MCP server can use.
 """
 
+import argparse
 import asyncio
 import os
 import getpass
@@ -20,10 +21,24 @@ sys.path.insert(0, str(src_path))
 from monarchmoney import MonarchMoney, MonarchMoneyEndpoints, RequireMFAException
 from dotenv import load_dotenv
 
-from monarch_mcp.secure_session import secure_session
+from monarch_mcp import tenants
 
 async def main():
     load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Log in to Monarch Money and save the session.")
+    parser.add_argument(
+        "--tenant",
+        help="Save the session for this tenant (listed in MONARCH_MCP_TENANTS) "
+             "instead of the default login.",
+    )
+    args = parser.parse_args()
+    try:
+        tenant_id = tenants.validate(args.tenant) if args.tenant else tenants.DEFAULT_TENANT
+    except ValueError as e:
+        parser.error(str(e))
+    # The same keyring entry the server reads for this tenant
+    secure_session = tenants.get(tenant_id).session
     
     print("\n🏦 Monarch Money - Claude Desktop Setup")
     print("=" * 45)
@@ -0,0 +1,120 @@
+"""
+Balance-history CSV parsing for Monarch Money MCP Server.
+
+Reads a local CSV of daily balances (``Date``, ``Amount`` or ``Balance``,
+optional ``Account Name``) one row at a time.  The file is validated in a
+first pass without holding rows in memory, then streamed again in
+fixed-size chunks of :class:`BalanceHistoryRow` for upload, so even
+decades of daily balances never sit in memory at once.
+"""
+
+import csv
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+
+from monarchmoney.monarchmoney import BalanceHistoryRow
+
+# Header aliases (lower-cased) for each column
+_COLUMN_ALIASES = {
+    "date": ("date",),
+    "amount": ("amount", "balance"),
+    "account_name": ("account name", "account_name", "account"),
+}
+
+# Invalid rows reported back before validation stops listing them
+MAX_REPORTED_ERRORS = 20
+
+
+def _column_indexes(header: List[str]) -> Dict[str, int]:
+    """Map logical columns to positions in *header*; raise ValueError if absent."""
+    names = [h.strip().lower() for h in header]
+    indexes = {}
+    for column, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in names:
+                indexes[column] = names.index(alias)
+                break
+    missing = [c for c in ("date", "amount") if c not in indexes]
+    if missing:
+        raise ValueError(
+            "CSV header must include Date and Amount (or Balance) columns; "
+            f"got {header!r}"
+        )
+    return indexes
+
+
+def _parse_row(row: List[str], indexes: Dict[str, int]) -> BalanceHistoryRow:
+    """Convert one CSV row; raise ValueError with a readable reason."""
+    try:
+        raw_date = row[indexes["date"]].strip()
+        raw_amount = row[indexes["amount"]].strip()
+    except IndexError as exc:
+        raise ValueError("missing columns") from exc
+    try:
+        day = datetime.strptime(raw_date, "%Y-%m-%d")
+    except ValueError as exc:
+        raise ValueError(f"invalid date {raw_date!r} (use YYYY-MM-DD)") from exc
+    try:
+        amount = float(raw_amount.replace(",", "").replace("$", ""))
+    except ValueError as exc:
+        raise ValueError(f"invalid amount {raw_amount!r}") from exc
+    name = None
+    name_index = indexes.get("account_name")
+    if name_index is not None and name_index < len(row):
+        name = row[name_index].strip() or None
+    return BalanceHistoryRow(date=day, amount=amount, account_name=name)
+
+
+def _iter_parsed(path: str) -> Iterator[Tuple[int, object]]:
+    """Yield ``(line_number, BalanceHistoryRow | ValueError)`` for each data row."""
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("CSV file is empty")
+        indexes = _column_indexes(header)
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                yield reader.line_num, _parse_row(row, indexes)
+            except ValueError as exc:
+                yield reader.line_num, exc
+
+
+def validate(path: str) -> Tuple[int, List[Dict[str, object]]]:
+    """Check every row of *path*; return the row count and invalid rows.
+
+    Duplicate dates are reported as errors.  At most
+    :data:`MAX_REPORTED_ERRORS` errors are listed.
+    """
+    count = 0
+    errors: List[Dict[str, object]] = []
+    seen_dates = set()
+    for line, parsed in _iter_parsed(path):
+        if isinstance(parsed, BalanceHistoryRow):
+            if parsed.date in seen_dates:
+                parsed = ValueError(f"duplicate date {parsed.date:%Y-%m-%d}")
+            else:
+                seen_dates.add(parsed.date)
+                count += 1
+                continue
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "error": str(parsed)})
+        else:
+            break
+    return count, errors
+
+
+def iter_chunks(path: str, size: int) -> Iterator[List[BalanceHistoryRow]]:
+    """Stream valid rows of *path* in lists of at most *size* rows."""
+    chunk: List[BalanceHistoryRow] = []
+    for _line, parsed in _iter_parsed(path):
+        if not isinstance(parsed, BalanceHistoryRow):
+            continue
+        chunk.append(parsed)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
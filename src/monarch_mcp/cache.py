@@ -0,0 +1,306 @@
+"""
+In-memory response cache for Monarch Money MCP Server.
+
+The cache is guarded by a lock, so it can be shared by any thread, and
+stores plain Python objects keyed by hashable tuples.  Entries expire
+after a per-entry TTL.  Shared caches keep a separate :class:`TTLCache`
+per tenant, so one tenant never sees another's data.
+
+The response cache can instead live in a store shared by several server
+processes (see ``shared_cache``), chosen with ``MONARCH_MCP_CACHE_BACKEND``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from monarch_mcp import shared_cache, tenants
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live (seconds) for cached entries
+DEFAULT_TTL = 300
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe key/value cache with per-entry expiry."""
+
+    def __init__(self, default_ttl: float = DEFAULT_TTL, max_entries: int = 512) -> None:
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for *key*, or *default* if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store *value* under *key* for *ttl* seconds (default TTL if None)."""
+        expires_at = time.monotonic() + (self._default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                self._evict_locked()
+            self._entries[key] = (expires_at, value)
+
+    def incr(self, key: Hashable, ttl: Optional[float] = None) -> int:
+        """Add one to the counter under *key* (0 if absent) and return it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            value = entry[1] if entry is not None and entry[0] > time.monotonic() else 0
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                self._evict_locked()
+            value += 1
+            expires_at = time.monotonic() + (self._default_ttl if ttl is None else ttl)
+            self._entries[key] = (expires_at, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove *key* from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_prefix(self, *prefix: Hashable) -> int:
+        """Remove every tuple key starting with *prefix*; return how many."""
+        size = len(prefix)
+        with self._lock:
+            matches = [
+                key for key in self._entries
+                if isinstance(key, tuple) and key[:size] == prefix
+            ]
+            for key in matches:
+                del self._entries[key]
+        return len(matches)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _evict_locked(self) -> None:
+        """Drop expired entries, or the soonest-to-expire one if none are."""
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._entries.items() if exp <= now]
+        for key in expired:
+            del self._entries[key]
+        if not expired and self._entries:
+            oldest = min(self._entries, key=lambda k: self._entries[k][0])
+            del self._entries[oldest]
+            logger.debug("Cache full — evicted %r", oldest)
+
+
+def _store_key(namespace: str, key: Hashable) -> str:
+    """Encode *key* as a string whose tuple prefixes are string prefixes."""
+    parts = key if isinstance(key, tuple) else (key,)
+    return namespace + "".join(
+        "\x1f" + json.dumps(part, default=str, separators=(",", ":")) for part in parts
+    ) + "\x1f"
+
+
+class SharedCache:
+    """:class:`TTLCache` interface over a cross-process store.
+
+    Keys are namespaced (by tenant) within the store; values are encoded
+    with ``shared_cache.dumps``, and a value it cannot encode is simply not
+    cached.  A store that cannot be reached behaves as a cache miss, so
+    tools keep working (uncached) while it is down.
+    """
+
+    def __init__(self, store, namespace: str, default_ttl: float = DEFAULT_TTL) -> None:
+        self._store = store
+        self._namespace = namespace
+        self._default_ttl = default_ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for *key*, or *default* if absent or expired."""
+        try:
+            raw = self._store.get(_store_key(self._namespace, key))
+            return default if raw is None else shared_cache.loads(raw)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Shared cache read failed for %r: %s", key, exc)
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store *value* under *key* for *ttl* seconds (default TTL if None)."""
+        try:
+            self._store.set(
+                _store_key(self._namespace, key),
+                shared_cache.dumps(value),
+                self._default_ttl if ttl is None else ttl,
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Shared cache write failed for %r: %s", key, exc)
+
+    def incr(self, key: Hashable, ttl: Optional[float] = None) -> int:
+        """Atomically add one to the counter under *key* and return it."""
+        try:
+            return self._store.incr(
+                _store_key(self._namespace, key), self._default_ttl if ttl is None else ttl,
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Shared cache increment failed for %r: %s", key, exc)
+            return 0
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove *key* from the cache if present."""
+        try:
+            self._store.delete(_store_key(self._namespace, key))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Shared cache invalidation failed for %r: %s", key, exc)
+
+    def invalidate_prefix(self, *prefix: Hashable) -> int:
+        """Remove every tuple key starting with *prefix*; return how many."""
+        try:
+            return self._store.delete_prefix(_store_key(self._namespace, prefix))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Shared cache invalidation failed for %r: %s", prefix, exc)
+            return 0
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        self._store.delete_prefix(self._namespace + "\x1f")
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class TenantCache:
+    """A :class:`TTLCache` per tenant, chosen by the tenant being served.
+
+    Offers the same methods as :class:`TTLCache`; each applies to the
+    current tenant's entries only, except :meth:`clear`, which empties
+    every tenant's cache.  Given *open_store*, entries instead live in
+    the shared store it opens on first use, namespaced by tenant.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = DEFAULT_TTL,
+        max_entries: int = 512,
+        open_store: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._open_store = open_store
+        self._store = None
+        self._caches: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _cache(self):
+        tenant_id = tenants.current()
+        with self._lock:
+            cache = self._caches.get(tenant_id)
+            if cache is None:
+                if self._open_store is not None and self._store is None:
+                    self._store = self._open_store()
+                if self._store is not None:
+                    cache = SharedCache(self._store, tenant_id, self._default_ttl)
+                else:
+                    cache = TTLCache(self._default_ttl, self._max_entries)
+                self._caches[tenant_id] = cache
+            return cache
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the current tenant's value for *key*, or *default*."""
+        return self._cache().get(key, default)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store *value* under *key* for the current tenant."""
+        self._cache().set(key, value, ttl)
+
+    def incr(self, key: Hashable, ttl: Optional[float] = None) -> int:
+        """Add one to the current tenant's counter under *key* and return it."""
+        return self._cache().incr(key, ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove the current tenant's *key* if present."""
+        self._cache().invalidate(key)
+
+    def invalidate_prefix(self, *prefix: Hashable) -> int:
+        """Remove the current tenant's tuple keys starting with *prefix*."""
+        return self._cache().invalidate_prefix(*prefix)
+
+    def clear(self) -> None:
+        """Remove every entry of every tenant."""
+        with self._lock:
+            self._caches.clear()
+            store = self._store
+        if store is not None:
+            store.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._cache()
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a stable SHA-256 digest of JSON-serialisable *parts*.
+
+    Used to key derived results on the exact inputs they were computed
+    from, so a cached result is reused only while the inputs are unchanged.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_dir(*parts: str) -> str:
+    """Return the on-disk cache directory (optionally a subdirectory of it).
+
+    Defaults to ``$XDG_CACHE_HOME/monarch-mcp`` (``~/.cache/monarch-mcp``);
+    override with the ``MONARCH_MCP_CACHE_DIR`` environment variable.
+    Tenants other than the default get a ``tenants/<id>`` subdirectory.
+    The directory is not created here.
+    """
+    base = _cache_base()
+    tenant_id = tenants.current()
+    if tenant_id != tenants.DEFAULT_TENANT:
+        base = os.path.join(base, "tenants", tenant_id)
+    return os.path.join(base, *parts)
+
+
+def _cache_base() -> str:
+    base = os.getenv("MONARCH_MCP_CACHE_DIR")
+    if not base:
+        xdg = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg, "monarch-mcp")
+    return base
+
+
+def open_configured_store():
+    """Open the store named by ``MONARCH_MCP_CACHE_BACKEND`` (None: in-memory)."""
+    spec = os.getenv("MONARCH_MCP_CACHE_BACKEND", "memory")
+    store = shared_cache.open_store(
+        spec, os.path.join(_cache_base(), "response-cache.sqlite3"),
+    )
+    if store is not None:
+        logger.info("Using shared response cache: %s", spec.split("@")[-1])
+    return store
+
+
+def open_job_store():
+    """Open the store named by ``MONARCH_MCP_JOB_STORE`` (None: memory only)."""
+    spec = os.getenv("MONARCH_MCP_JOB_STORE", "memory")
+    store = shared_cache.open_store(spec, os.path.join(_cache_base(), "jobs.sqlite3"))
+    if store is not None:
+        logger.info("Saving background jobs to: %s", spec.split("@")[-1])
+    return store
+
+
+# Global response cache shared by all tools, kept separately per tenant
+response_cache = TenantCache(open_store=open_configured_store)
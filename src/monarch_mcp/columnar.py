@@ -0,0 +1,295 @@
+"""
+Columnar (Parquet / Arrow IPC) export for Monarch Money MCP Server.
+
+Writes typed, compressed tables that analysis notebooks can load without
+re-parsing CSV.  Each page of rows is appended as its own row group (or
+record batch), so memory stays bounded by the page size.  Tables can be
+partitioned by month in a Hive-style layout
+(``transactions/month=2025-01/data.parquet``); re-exporting a date range
+then replaces the partitions it covers, including removing those that no
+longer have any rows, and leaves the others alone.
+
+``pyarrow`` is an optional dependency, imported on first use.
+"""
+
+import os
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+# Supported columnar formats and their file extensions
+FORMATS = {"parquet": "parquet", "arrow": "arrow"}
+
+_COMPRESSION = "zstd"
+
+
+def _pyarrow():
+    """Import pyarrow, raising a readable error if it is not installed."""
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel,unused-import
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError as exc:
+        raise RuntimeError(
+            "Columnar export requires pyarrow. "
+            "Install it with: pip install 'monarch-mcp[columnar]'"
+        ) from exc
+    return pyarrow
+
+
+def _to_date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _name(obj: Optional[Dict[str, Any]], key: str = "name") -> Optional[str]:
+    return (obj or {}).get(key)
+
+
+# ── Table schemas and row conversion ──────────────────────────────────
+
+
+def transaction_schema():
+    """Arrow schema for exported transactions."""
+    pa = _pyarrow()
+    return pa.schema([
+        ("id", pa.string()),
+        ("date", pa.date32()),
+        ("amount", pa.float64()),
+        ("original_name", pa.string()),
+        ("category_id", pa.string()),
+        ("category", pa.string()),
+        ("account_id", pa.string()),
+        ("account", pa.string()),
+        ("merchant", pa.string()),
+        ("notes", pa.string()),
+        ("is_pending", pa.bool_()),
+        ("is_recurring", pa.bool_()),
+        ("tags", pa.list_(pa.string())),
+    ])
+
+
+def transaction_row(txn: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw API transaction to a typed row."""
+    amount = txn.get("amount")
+    return {
+        "id": txn.get("id"),
+        "date": _to_date(txn.get("date")),
+        "amount": float(amount) if amount is not None else None,
+        "original_name": txn.get("plaidName"),
+        "category_id": _name(txn.get("category"), "id"),
+        "category": _name(txn.get("category")),
+        "account_id": _name(txn.get("account"), "id"),
+        "account": _name(txn.get("account"), "displayName"),
+        "merchant": _name(txn.get("merchant")),
+        "notes": txn.get("notes"),
+        "is_pending": bool(txn.get("pending", False)),
+        "is_recurring": bool(txn.get("isRecurring", False)),
+        "tags": [tag.get("name") for tag in txn.get("tags") or []],
+    }
+
+
+def account_schema():
+    """Arrow schema for exported accounts."""
+    pa = _pyarrow()
+    return pa.schema([
+        ("id", pa.string()),
+        ("name", pa.string()),
+        ("type", pa.string()),
+        ("subtype", pa.string()),
+        ("institution", pa.string()),
+        ("balance", pa.float64()),
+        ("is_asset", pa.bool_()),
+        ("include_in_net_worth", pa.bool_()),
+        ("is_manual", pa.bool_()),
+        ("is_active", pa.bool_()),
+    ])
+
+
+def account_row(account: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw API account to a typed row."""
+    balance = account.get("currentBalance")
+    return {
+        "id": account.get("id"),
+        "name": account.get("displayName") or account.get("name"),
+        "type": _name(account.get("type")),
+        "subtype": _name(account.get("subtype")),
+        "institution": _name(account.get("institution")),
+        "balance": float(balance) if balance is not None else None,
+        "is_asset": account.get("isAsset"),
+        "include_in_net_worth": account.get("includeInNetWorth"),
+        "is_manual": account.get("isManual"),
+        "is_active": not account.get("deactivatedAt"),
+    }
+
+
+def balance_schema():
+    """Arrow schema for exported daily balances."""
+    pa = _pyarrow()
+    return pa.schema([
+        ("date", pa.date32()),
+        ("account_id", pa.string()),
+        ("balance", pa.float64()),
+    ])
+
+
+def balance_rows(points: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Unpivot daily balance points into one typed row per account and day."""
+    return [
+        {
+            "date": _to_date(point["date"]),
+            "account_id": account_id,
+            "balance": float(balance) if balance is not None else None,
+        }
+        for point in points
+        for account_id, balance in point["balances"].items()
+    ]
+
+
+def month_partition(row: Dict[str, Any]) -> str:
+    """Hive-style month partition name for a row with a ``date`` column."""
+    day = row.get("date")
+    return f"month={day:%Y-%m}" if day else "month=unknown"
+
+
+def month_partitions(start: date, end: date) -> Set[str]:
+    """Month partition names for every month from *start* to *end*."""
+    names = set()
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        names.add(f"month={year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return names
+
+
+# ── Writer ────────────────────────────────────────────────────────────
+
+
+class TableWriter:  # pylint: disable=too-many-instance-attributes
+    """Append pages of rows to one table, optionally partitioned.
+
+    Each :meth:`write` call becomes one row group (Parquet) or record
+    batch (Arrow IPC) per partition touched.  Files are written to
+    ``*.part`` and renamed into place by :meth:`close`, so an aborted
+    export never replaces an existing partition.  *replaces* selects the
+    partitions the export covers: :meth:`close` also deletes any of them
+    left over from an earlier export that received no rows this time.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        root: str,
+        table: str,
+        schema,
+        fmt: str,
+        partition: Optional[Callable[[Dict[str, Any]], str]] = None,
+        replaces: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported columnar format {fmt!r}")
+        self._pa = _pyarrow()
+        self._root = root
+        self._table = table
+        self._schema = schema
+        self._fmt = fmt
+        self._partition = partition
+        self._replaces = replaces
+        self._open: Dict[Optional[str], Dict[str, Any]] = {}
+
+    def _path(self, partition: Optional[str]) -> str:
+        ext = FORMATS[self._fmt]
+        if partition is None:
+            return os.path.join(self._root, f"{self._table}.{ext}")
+        return os.path.join(self._root, self._table, partition, f"data.{ext}")
+
+    def _writer(self, partition: Optional[str]) -> Dict[str, Any]:
+        state = self._open.get(partition)
+        if state is None:
+            path = self._path(partition)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            part_path = f"{path}.part"
+            if self._fmt == "parquet":
+                writer = self._pa.parquet.ParquetWriter(
+                    part_path, self._schema, compression=_COMPRESSION,
+                )
+                sink = None
+            else:
+                sink = self._pa.OSFile(part_path, "wb")
+                writer = self._pa.ipc.new_file(
+                    sink, self._schema,
+                    options=self._pa.ipc.IpcWriteOptions(compression=_COMPRESSION),
+                )
+            state = {"path": path, "part": part_path, "writer": writer,
+                     "sink": sink, "rows": 0}
+            self._open[partition] = state
+        return state
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        """Append *rows*, grouped by partition."""
+        groups: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        for row in rows:
+            key = self._partition(row) if self._partition else None
+            groups.setdefault(key, []).append(row)
+        for key, group in groups.items():
+            state = self._writer(key)
+            if self._fmt == "parquet":
+                state["writer"].write_table(
+                    self._pa.Table.from_pylist(group, schema=self._schema),
+                )
+            else:
+                state["writer"].write_batch(
+                    self._pa.RecordBatch.from_pylist(group, schema=self._schema),
+                )
+            state["rows"] += len(group)
+
+    def _close_handles(self, state: Dict[str, Any]) -> None:
+        state["writer"].close()
+        if state["sink"] is not None:
+            state["sink"].close()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish every file and move it into place; return per-file stats.
+
+        An unpartitioned table with no rows still produces an empty file.
+        """
+        if self._partition is None and None not in self._open:
+            self._writer(None)
+        files = []
+        for partition, state in sorted(self._open.items(), key=lambda kv: str(kv[0])):
+            self._close_handles(state)
+            os.replace(state["part"], state["path"])
+            files.append({
+                "table": self._table,
+                "partition": partition,
+                "path": state["path"],
+                "rows": state["rows"],
+            })
+        self._remove_stale()
+        self._open.clear()
+        return files
+
+    def _remove_stale(self) -> None:
+        """Delete covered partitions that this export wrote no rows to."""
+        table_dir = os.path.join(self._root, self._table)
+        if self._partition is None or self._replaces is None or not os.path.isdir(table_dir):
+            return
+        for partition in os.listdir(table_dir):
+            if (partition in self._open or not self._replaces(partition)
+                    or not os.path.isdir(os.path.join(table_dir, partition))):
+                continue
+            path = self._path(partition)
+            if os.path.exists(path):
+                os.remove(path)
+            if not os.listdir(os.path.dirname(path)):
+                os.rmdir(os.path.dirname(path))
+
+    def abort(self) -> None:
+        """Discard every partially written file."""
+        for state in self._open.values():
+            try:
+                self._close_handles(state)
+            finally:
+                if os.path.exists(state["part"]):
+                    os.remove(state["part"])
+        self._open.clear()
@@ -0,0 +1,125 @@
+"""
+Response size budget for Monarch Money MCP Server.
+
+Some tools (budgets, cashflow, recurring transactions, account history)
+can return far more text than a client can use in one message.  When a
+serialized result exceeds the budget, it is kept in a server-side buffer
+and returned in slices: each response carries one ``chunk`` of the JSON
+text plus an opaque ``continuation_token`` for the next one, which the
+``get_continuation`` tool redeems.  The result is serialized once; later
+chunks are plain slices of the buffered text.
+
+The budget is ``MONARCH_MCP_MAX_RESPONSE_CHARS`` characters (default
+100000); set it to 0 to disable chunking.
+"""
+
+import base64
+import json
+import os
+import secrets
+from typing import Optional, Tuple
+
+from monarch_mcp.cache import TenantCache
+
+# Default maximum characters per tool response
+DEFAULT_MAX_RESPONSE_CHARS = 100_000
+
+# Buffered results are kept this long after the last chunk is served
+BUFFER_TTL = 10 * 60
+
+# Room reserved for the envelope around each chunk
+_ENVELOPE_OVERHEAD = 400
+# Smallest chunk served, however small the configured budget
+_MIN_CHUNK = 1_000
+
+# Kept per tenant, so a token only redeems for the tenant that created it
+_buffers = TenantCache(default_ttl=BUFFER_TTL, max_entries=32)
+
+
+def max_response_chars() -> int:
+    """Return the configured response budget (0 means unlimited)."""
+    raw = os.getenv("MONARCH_MCP_MAX_RESPONSE_CHARS")
+    if not raw:
+        return DEFAULT_MAX_RESPONSE_CHARS
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_MAX_RESPONSE_CHARS
+
+
+def _encode_token(buffer_id: str, offset: int) -> str:
+    raw = f"{buffer_id}:{offset}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_token(token: str) -> Tuple[str, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        buffer_id, offset = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        return buffer_id, int(offset)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Malformed continuation token.") from exc
+
+
+def _chunk_end(text: str, offset: int, budget: int) -> int:
+    """Return the end of the longest slice from *offset* whose JSON-escaped
+    form fits in *budget* characters."""
+    size = min(budget, len(text) - offset)
+    while size > _MIN_CHUNK:
+        escaped = len(json.dumps(text[offset:offset + size]))
+        if escaped <= budget:
+            break
+        size = max(_MIN_CHUNK, size * budget // escaped - 1)
+    return offset + size
+
+
+def _envelope(buffer_id: str, text: str, offset: int, budget: int) -> str:
+    end = _chunk_end(text, offset, budget)
+    done = end >= len(text)
+    return json.dumps(
+        {
+            "chunk": text[offset:end],
+            "offset": offset,
+            "total_length": len(text),
+            "continuation_token": None if done else _encode_token(buffer_id, end),
+            "note": (
+                "Result exceeds the response size limit and is split into "
+                "chunks. Call get_continuation with continuation_token until "
+                "it is null, concatenate every 'chunk', then parse as JSON."
+            ),
+        },
+        indent=2,
+    )
+
+
+def paginate(text: str, limit: Optional[int] = None) -> str:
+    """Return *text* unchanged if it fits, else its first chunk envelope."""
+    limit = max_response_chars() if limit is None else limit
+    if not limit or len(text) <= limit:
+        return text
+    buffer_id = secrets.token_urlsafe(12)
+    _buffers.set(buffer_id, text)
+    return _envelope(buffer_id, text, 0, max(_MIN_CHUNK, limit - _ENVELOPE_OVERHEAD))
+
+
+def resume(token: str, limit: Optional[int] = None) -> str:
+    """Return the chunk envelope that *token* points to.
+
+    Raises ValueError for malformed tokens and KeyError when the buffer has
+    expired.  Tokens can be redeemed more than once until the buffer expires.
+    """
+    buffer_id, offset = _decode_token(token)
+    text = _buffers.get(buffer_id)
+    if text is None:
+        raise KeyError(buffer_id)
+    if not 0 <= offset < len(text):
+        raise ValueError("Malformed continuation token.")
+    _buffers.set(buffer_id, text)  # refresh TTL while the client is reading
+    limit = max_response_chars() if limit is None else limit
+    budget = max(_MIN_CHUNK, (limit or len(text)) - _ENVELOPE_OVERHEAD)
+    return _envelope(buffer_id, text, offset, budget)
+
+
+def clear() -> None:
+    """Drop every buffered result."""
+    _buffers.clear()
@@ -0,0 +1,97 @@
+"""
+Registry of named GraphQL documents for Monarch Money MCP Server.
+
+Calling ``gql()`` parses the document text every time, so building a
+query inside a tool re-parses it on every call.  Custom queries and
+mutations are instead declared once at import time with :func:`define`,
+which only records the text; :func:`get` parses it on first use and
+returns the same parsed request from then on.  :func:`execute` sends a
+registered document through ``client.gql_call`` and counts calls and
+errors per operation name for ``get_server_metrics``.
+
+Any new raw query or mutation should be defined here rather than parsed
+inline.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from gql import gql
+from graphql import OperationDefinitionNode
+from monarchmoney import MonarchMoney
+
+_lock = threading.Lock()
+_sources: Dict[str, str] = {}
+_parsed: Dict[str, Any] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def define(name: str, source: str) -> str:
+    """Register *source* as operation *name* and return *name*.
+
+    Redefining a name with different text raises ValueError.
+    """
+    with _lock:
+        if _sources.get(name, source) != source:
+            raise ValueError(f"GraphQL operation {name!r} is already defined")
+        _sources[name] = source
+    return name
+
+
+def get(name: str) -> Any:
+    """Return the parsed document for operation *name*, parsing it on first use."""
+    with _lock:
+        request = _parsed.get(name)
+        if request is not None:
+            return request
+        if name not in _sources:
+            raise KeyError(f"Unknown GraphQL operation {name!r}")
+        request = gql(_sources[name])
+        # gql() returns a GraphQLRequest wrapping the DocumentNode in gql 4
+        document = getattr(request, "document", request)
+        operations = [
+            node.name.value for node in document.definitions
+            if isinstance(node, OperationDefinitionNode) and node.name
+        ]
+        if operations != [name]:
+            raise ValueError(f"GraphQL document {name!r} defines operations {operations}")
+        _parsed[name] = request
+        return request
+
+
+async def execute(
+    client: MonarchMoney, name: str, variables: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Send registered operation *name* with *variables* through *client*."""
+    request = get(name)
+    try:
+        return await client.gql_call(
+            operation=name, graphql_query=request, variables=variables or {},
+        )
+    except Exception:
+        _record(name, "errors")
+        raise
+    finally:
+        _record(name, "calls")
+
+
+def _record(name: str, key: str) -> None:
+    with _lock:
+        counts = _stats.setdefault(name, {"calls": 0, "errors": 0})
+        counts[key] += 1
+
+
+def stats() -> Dict[str, Any]:
+    """Return per-operation call and error counts and which documents are parsed."""
+    with _lock:
+        return {
+            "defined": len(_sources),
+            "parsed": sorted(_parsed),
+            "operations": {name: dict(counts) for name, counts in sorted(_stats.items())},
+        }
+
+
+def reset_stats() -> None:
+    """Zero the per-operation counters."""
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,136 @@
+"""
+Streaming file export for Monarch Money MCP Server.
+
+Rows flow through an async generator pipeline — pages from the API,
+flattened to rows, encoded one at a time — straight into a file, so
+memory use does not grow with the number of rows exported.  The file is
+hashed as it is written and only appears at its final path once
+complete.  Paths are confined to the export directory (see ``paths``).
+"""
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from monarch_mcp.paths import confine, export_dir
+
+# Supported export formats and their file extensions
+FORMATS = {"csv": "csv", "ndjson": "ndjson"}
+
+# Rows encoded per disk write
+_FLUSH_ROWS = 500
+
+
+def resolve_path(path: str) -> str:
+    """Return *path* resolved inside the export directory (see ``paths.confine``)."""
+    return confine(path, export_dir())
+
+
+def default_path(name: str, fmt: Optional[str] = None) -> str:
+    """Return a timestamped path in the export directory for *name*.
+
+    Without *fmt* the path has no extension (used for dataset directories).
+    """
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = f".{FORMATS[fmt]}" if fmt else ""
+    return os.path.join(export_dir(), f"{name}-{stamp}{suffix}")
+
+
+class _HashingWriter:  # pylint: disable=too-few-public-methods
+    """Text sink that encodes, hashes and writes to a binary file."""
+
+    def __init__(self, fh) -> None:
+        self._fh = fh
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        """Write *text* as UTF-8, updating the running checksum."""
+        data = text.encode("utf-8")
+        self.sha256.update(data)
+        self._fh.write(data)
+        self.bytes += len(data)
+        return len(text)
+
+
+async def iter_rows(
+    pages: AsyncIterator[List[Dict[str, Any]]], transform,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Flatten an async iterator of pages into transformed rows."""
+    async for page in pages:
+        for item in page:
+            yield transform(item)
+
+
+def _csv_value(value: Any) -> Any:
+    """Render nested values for a CSV cell."""
+    if isinstance(value, list):
+        return ";".join(
+            str(v.get("name", "")) if isinstance(v, dict) else str(v) for v in value
+        )
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return value
+
+
+async def write_rows(
+    rows: AsyncIterator[Dict[str, Any]],
+    path: str,
+    fmt: str,
+    columns: Iterable[str],
+) -> Dict[str, Any]:
+    """Stream *rows* to *path* as CSV or NDJSON.
+
+    Rows are encoded in batches of ``_FLUSH_ROWS``; each batch is hashed
+    and written on a worker thread, so disk I/O never blocks the event
+    loop.  Data is written to ``<path>.part`` and renamed into place when
+    the stream is exhausted; on failure the partial file is removed.
+    Returns the path, format, row count, size and SHA-256 of the written
+    file.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}")
+    columns = list(columns)
+    directory = os.path.dirname(os.path.abspath(path))
+    await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+    part_path = f"{path}.part"
+    count = 0
+    try:
+        fh = await asyncio.to_thread(open, part_path, "wb")
+        try:
+            sink = _HashingWriter(fh)
+            batch = io.StringIO()
+            writer = csv.writer(batch, lineterminator="\n") if fmt == "csv" else None
+            if writer is not None:
+                writer.writerow(columns)
+            async for row in rows:
+                if writer is not None:
+                    writer.writerow([_csv_value(row.get(c)) for c in columns])
+                else:
+                    batch.write(json.dumps(row, default=str) + "\n")
+                count += 1
+                if count % _FLUSH_ROWS == 0:
+                    await asyncio.to_thread(sink.write, batch.getvalue())
+                    batch.seek(0)
+                    batch.truncate()
+            await asyncio.to_thread(sink.write, batch.getvalue())
+        finally:
+            await asyncio.to_thread(fh.close)
+        await asyncio.to_thread(os.replace, part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    return {
+        "path": os.path.abspath(path),
+        "format": fmt,
+        "rows": count,
+        "bytes": sink.bytes,
+        "sha256": sink.sha256.hexdigest(),
+    }
@@ -0,0 +1,181 @@
+"""
+Cashflow forecasting for Monarch Money MCP Server.
+
+Projects per-account balances day by day from three inputs:
+
+* current balances (``get_accounts``),
+* scheduled recurring items (``get_recurring_transactions``),
+* average daily spend per category over a lookback window, computed from
+  non-recurring transactions so scheduled items are not counted twice.
+
+Every date is converted once to an integer day offset from ``today``;
+amounts are then bucketed into a per-day delta array and the balance
+series is a single running sum over that array.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Projection milestones reported for bill-pay planning (days from today)
+MILESTONES = (30, 60, 90)
+
+# (account_id, day offset, amount)
+ScheduledItem = Tuple[str, int, float]
+
+
+def _day_offset(value: Any, today: date) -> Optional[int]:
+    """Return days between *today* and an ISO date string, or None if unparseable."""
+    try:
+        return (date.fromisoformat(str(value)[:10]) - today).days
+    except ValueError:
+        return None
+
+
+def current_balances(accounts: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Map account id to display name and current balance."""
+    balances = {}
+    for account in accounts:
+        account_id = account.get("id")
+        if not account_id:
+            continue
+        balances[account_id] = {
+            "name": account.get("displayName") or account.get("name"),
+            "balance": float(account.get("currentBalance") or 0),
+        }
+    return balances
+
+
+def scheduled_items(
+    recurring_items: Iterable[Dict[str, Any]],
+    today: date,
+    horizon_days: int,
+) -> List[ScheduledItem]:
+    """Return upcoming recurring items that fall inside the horizon.
+
+    Items already marked ``isPast`` are excluded — they are reflected in
+    the current balance.
+    """
+    items = []
+    for item in recurring_items:
+        if item.get("isPast"):
+            continue
+        account_id = (item.get("account") or {}).get("id")
+        offset = _day_offset(item.get("date"), today)
+        if not account_id or offset is None or not 0 <= offset <= horizon_days:
+            continue
+        amount = item.get("amount")
+        if amount is None:
+            amount = (item.get("stream") or {}).get("amount")
+        if amount is None:
+            continue
+        items.append((account_id, offset, float(amount)))
+    items.sort()
+    return items
+
+
+def category_run_rates(
+    transactions: Iterable[Dict[str, Any]],
+    lookback_days: int,
+) -> Dict[str, Dict[str, float]]:
+    """Return the average daily amount per account and category.
+
+    Transactions without an account are ignored; uncategorized ones are
+    grouped under ``"Uncategorized"``.
+    """
+    totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for txn in transactions:
+        account_id = (txn.get("account") or {}).get("id")
+        if not account_id or txn.get("amount") is None:
+            continue
+        category = (txn.get("category") or {}).get("name") or "Uncategorized"
+        totals[account_id][category] += float(txn["amount"])
+
+    return {
+        account_id: {
+            category: round(total / lookback_days, 4)
+            for category, total in sorted(categories.items())
+        }
+        for account_id, categories in totals.items()
+    }
+
+
+def project_balances(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    balances: Dict[str, Dict[str, Any]],
+    schedule: List[ScheduledItem],
+    run_rates: Dict[str, Dict[str, float]],
+    today: date,
+    horizon_days: int,
+    include_daily: bool = False,
+) -> Dict[str, Any]:
+    """Project each account's balance for ``horizon_days`` days.
+
+    Only accounts with scheduled items or a non-zero run-rate are included.
+    Day 0 is *today* and includes items scheduled for today.
+    """
+    deltas: Dict[str, List[float]] = {}
+    scheduled_totals: Dict[str, Tuple[int, float]] = defaultdict(lambda: (0, 0.0))
+    for account_id, offset, amount in schedule:
+        if account_id not in balances:
+            continue
+        series = deltas.setdefault(account_id, [0.0] * (horizon_days + 1))
+        series[offset] += amount
+        count, total = scheduled_totals[account_id]
+        scheduled_totals[account_id] = (count + 1, total + amount)
+
+    daily_rates = {
+        account_id: sum(categories.values())
+        for account_id, categories in run_rates.items()
+        if account_id in balances
+    }
+    for account_id, rate in daily_rates.items():
+        if not rate:
+            continue
+        series = deltas.setdefault(account_id, [0.0] * (horizon_days + 1))
+        for offset in range(1, horizon_days + 1):
+            series[offset] += rate
+
+    milestones = [m for m in MILESTONES if m < horizon_days] + [horizon_days]
+    accounts = []
+    totals = dict.fromkeys((str(m) for m in milestones), 0.0)
+    for account_id in sorted(deltas, key=lambda a: balances[a]["name"] or a):
+        start = balances[account_id]["balance"]
+        series = [start + running for running in accumulate(deltas[account_id])]
+        low = min(range(len(series)), key=series.__getitem__)
+        count, scheduled_total = scheduled_totals[account_id]
+
+        projected = {str(m): round(series[m], 2) for m in milestones}
+        for key, value in projected.items():
+            totals[key] += value
+
+        entry = {
+            "id": account_id,
+            "name": balances[account_id]["name"],
+            "current_balance": round(start, 2),
+            "projected_balance": projected,
+            "lowest_balance": {
+                "date": (today + timedelta(days=low)).isoformat(),
+                "balance": round(series[low], 2),
+            },
+            "scheduled_count": count,
+            "scheduled_total": round(scheduled_total, 2),
+            "daily_run_rate": round(daily_rates.get(account_id, 0.0), 2),
+            "run_rate_by_category": run_rates.get(account_id, {}),
+        }
+        if include_daily:
+            entry["daily"] = [
+                {
+                    "date": (today + timedelta(days=offset)).isoformat(),
+                    "balance": round(balance, 2),
+                }
+                for offset, balance in enumerate(series)
+            ]
+        accounts.append(entry)
+
+    return {
+        "as_of": today.isoformat(),
+        "horizon_days": horizon_days,
+        "accounts": accounts,
+        "total_projected_balance": {k: round(v, 2) for k, v in totals.items()},
+    }
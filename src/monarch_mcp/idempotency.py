@@ -0,0 +1,207 @@
+"""
+Idempotency keys for write tools in Monarch Money MCP Server.
+
+A write tool called with an ``idempotency_key`` records its result under
+that key in a local SQLite database (``idempotency.sqlite3`` in the
+tenant's cache directory).  Calling again with the same key and the same
+arguments returns the recorded result without writing to Monarch again,
+so a client may retry a write after a timeout without creating a
+duplicate.  Reusing a key with different arguments is an error.
+
+A key is claimed before the write starts.  While that call is still
+running, a repeat is refused rather than run twice; if the call raises,
+the claim is dropped so the write can be retried.  Error results the
+tool returns (such as validation errors) are not recorded.  Records are
+kept for a day.
+"""
+
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from fastmcp import Context
+
+from monarch_mcp.cache import cache_dir, fingerprint
+
+# Recorded results are kept this long
+DEFAULT_TTL = 24 * 60 * 60
+
+# A claim this old belongs to a call that never finished (the server
+# stopped mid-write); it no longer blocks the key
+PENDING_TIMEOUT = 10 * 60
+
+_PENDING = "pending"
+_DONE = "done"
+
+
+class IdempotencyStore:
+    """Durable map of idempotency key to recorded tool result."""
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL) -> None:
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        existed = os.path.exists(path)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        if not existed:
+            os.chmod(path, 0o600)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, state TEXT NOT NULL,"
+                " result TEXT, created_at REAL NOT NULL)"
+            )
+
+    def claim(self, key: str, digest: str) -> Tuple[str, Optional[str]]:
+        """Claim *key* for a call whose arguments hash to *digest*.
+
+        Returns ``("claimed", None)`` if the caller should run the write,
+        ``("done", result)`` if it already ran, ``("pending", None)`` if it
+        is still running, or ``("mismatch", None)`` if the key was used
+        with other arguments.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM results WHERE created_at <= ?"
+                    " OR (state = ? AND created_at <= ?)",
+                    (now - self._ttl, _PENDING, now - PENDING_TIMEOUT),
+                )
+                row = self._conn.execute(
+                    "SELECT fingerprint, state, result FROM results WHERE key = ?", (key,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO results (key, fingerprint, state, created_at)"
+                        " VALUES (?, ?, ?, ?)",
+                        (key, digest, _PENDING, now),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return "claimed", None
+        if row[0] != digest:
+            return "mismatch", None
+        return row[1], row[2]
+
+    def record(self, key: str, result: str) -> None:
+        """Record the result of the claimed call for *key*."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE results SET state = ?, result = ? WHERE key = ?",
+                (_DONE, result, key),
+            )
+
+    def release(self, key: str) -> None:
+        """Drop the claim on *key* so the write can be tried again."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM results WHERE key = ? AND state = ?", (key, _PENDING),
+            )
+
+
+_stores: Dict[str, IdempotencyStore] = {}
+_stores_lock = threading.Lock()
+
+
+def store() -> IdempotencyStore:
+    """Return the current tenant's idempotency store."""
+    path = cache_dir("idempotency.sqlite3")
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = IdempotencyStore(path)
+        return _stores[path]
+
+
+def _is_error(result: Any) -> bool:
+    if not isinstance(result, str):
+        return False
+    if result.startswith("Error "):
+        return True
+    try:
+        return "error" in json.loads(result)
+    except (ValueError, TypeError):
+        return False
+
+
+def _begin(tool: str, signature: inspect.Signature, args, kwargs):
+    """Claim the call's key; return (key, replayed result or None)."""
+    bound = signature.bind_partial(*args, **kwargs)
+    key = bound.arguments.pop("idempotency_key", None)
+    if not key:
+        return None, None
+    arguments = {
+        name: value for name, value in bound.arguments.items()
+        if not isinstance(value, Context)
+    }
+    state, result = store().claim(key, fingerprint(tool, arguments))
+    if state == "claimed":
+        return key, None
+    if state == _DONE:
+        return None, result
+    if state == _PENDING:
+        message = "A call with this idempotency_key is still in progress; retry shortly."
+    else:
+        message = "This idempotency_key was already used with different arguments."
+    return None, json.dumps({"error": message}, indent=2)
+
+
+def _finish(key: Optional[str], result: Any) -> None:
+    if key is None:
+        return
+    if _is_error(result):
+        store().release(key)
+    else:
+        store().record(key, result)
+
+
+def idempotent(func):
+    """Make a write tool honour its ``idempotency_key`` argument.
+
+    The tool must declare ``idempotency_key: Optional[str] = None``.
+    Works for both sync and async tools; place it below
+    ``_handle_mcp_errors`` so a raised error drops the claim.
+    """
+    signature = inspect.signature(func)
+    tool = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            key, replay = _begin(tool, signature, args, kwargs)
+            if replay is not None:
+                return replay
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                if key is not None:
+                    store().release(key)
+                raise
+            _finish(key, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key, replay = _begin(tool, signature, args, kwargs)
+        if replay is not None:
+            return replay
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            if key is not None:
+                store().release(key)
+            raise
+        _finish(key, result)
+        return result
+    return wrapper
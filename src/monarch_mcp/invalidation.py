@@ -0,0 +1,101 @@
+"""
+Cache dependencies of write tools in Monarch Money MCP Server.
+
+Cached reads are grouped under tags (``accounts``, ``transactions``,
+``budgets`` ...).  :data:`TAGS` lists the response-cache key prefixes and
+reference resources each tag covers, and :data:`WRITE_DEPENDENCIES`
+lists the tags each write tool makes stale.  When a write tool returns
+(or fails part-way), every entry under its tags is dropped, so cached
+reads can keep long TTLs and still never outlive a write.
+
+Entries for a single record (one transaction, one account's balance
+history) are dropped or patched by the tool itself; tags cover the
+shared results that any write of that kind can change.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from monarch_mcp import resources
+
+
+@dataclass(frozen=True)
+class CacheTag:
+    """Cached data of one kind."""
+
+    prefixes: Tuple[str, ...] = ()
+    resources: Tuple[str, ...] = ()
+
+
+TAGS: Dict[str, CacheTag] = {
+    "accounts": CacheTag(resources=(resources.ACCOUNTS_URI,)),
+    "holdings": CacheTag(prefixes=("account_holdings",)),
+    "balances": CacheTag(prefixes=("recent_account_balances",)),
+    "snapshots": CacheTag(prefixes=("aggregate_snapshots",)),
+    "transactions": CacheTag(prefixes=(
+        "transaction_page", "transaction", "transaction_details", "transaction_splits",
+    )),
+    "transaction_pages": CacheTag(prefixes=("transaction_page",)),
+    "forecasts": CacheTag(prefixes=("forecast_run_rates", "forecast_cashflow")),
+    "budgets": CacheTag(prefixes=("budgets",)),
+    "categories": CacheTag(resources=(
+        resources.CATEGORIES_URI, resources.CATEGORY_GROUPS_URI,
+    )),
+    "tags": CacheTag(resources=(resources.TAGS_URI,)),
+}
+
+# Tags each write tool makes stale.  start_accounts_refresh is not a write
+# tool, but each account its job finishes syncing brings in new data.
+WRITE_DEPENDENCIES: Dict[str, FrozenSet[str]] = {
+    "create_transaction": frozenset({"transaction_pages", "forecasts", "budgets", "accounts"}),
+    # Cached copies of the transaction are patched from the mutation response
+    "update_transaction": frozenset({"forecasts", "budgets"}),
+    # Tags carry a transactionCount, so removing a transaction changes them
+    "delete_transaction": frozenset({
+        "transaction_pages", "forecasts", "budgets", "accounts", "tags",
+    }),
+    "upload_attachments": frozenset(),
+    "create_transaction_tag": frozenset({"tags"}),
+    "delete_transaction_tag": frozenset({"tags", "transactions"}),
+    "set_transaction_tags": frozenset({"tags"}),
+    "set_budget_amount": frozenset({"budgets"}),
+    "update_transaction_splits": frozenset({"forecasts", "budgets"}),
+    "create_transaction_category": frozenset({"categories", "budgets"}),
+    "delete_transaction_category": frozenset({
+        "categories", "transactions", "forecasts", "budgets",
+    }),
+    "create_manual_account": frozenset({"accounts", "balances", "snapshots"}),
+    # hide_transactions_from_reports changes budget actuals
+    "update_account": frozenset({
+        "accounts", "transactions", "balances", "snapshots", "budgets",
+    }),
+    "delete_account": frozenset({
+        "accounts", "holdings", "transactions", "balances", "snapshots", "forecasts", "budgets",
+        "tags",
+    }),
+    "upload_account_balance_history": frozenset({"accounts", "balances", "snapshots"}),
+    "start_accounts_refresh": frozenset({
+        "accounts", "transactions", "balances", "snapshots", "forecasts", "budgets",
+    }),
+}
+
+# Further tags create_transaction makes stale when it also moves the
+# account balance (update_balance); the account's own balance history is
+# dropped by the tool.
+BALANCE_UPDATE_DEPENDENCIES: FrozenSet[str] = frozenset({"balances", "snapshots"})
+
+
+def entries(tags: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """Return the cache key prefixes and resource URIs covered by *tags*."""
+    prefixes: List[str] = []
+    uris: List[str] = []
+    for name in sorted(set(tags)):
+        tag = TAGS[name]
+        prefixes.extend(prefix for prefix in tag.prefixes if prefix not in prefixes)
+        uris.extend(uri for uri in tag.resources if uri not in uris)
+    return prefixes, uris
+
+
+def dependents(tool: str) -> Tuple[List[str], List[str]]:
+    """Return the cache key prefixes and resource URIs write *tool* makes stale."""
+    return entries(WRITE_DEPENDENCIES[tool])
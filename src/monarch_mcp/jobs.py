@@ -0,0 +1,290 @@
+"""
+Background jobs for Monarch Money MCP Server.
+
+Long-running work (exports, waiting for institutions to finish syncing)
+runs as an asyncio task on the server's event loop instead of blocking a
+tool call.  A tool starts a job and returns its id at once; later calls
+read the job's progress and result by id.  Jobs belong to the tenant
+that started them and are invisible to other tenants.
+
+At most ``MONARCH_MCP_JOB_WORKERS`` jobs (default 4) run at once; later
+jobs wait, ``queued``, in start order.  Finished jobs are kept for a
+while, then pruned.  With ``MONARCH_MCP_JOB_STORE`` set to ``sqlite``
+(``jobs.sqlite3`` in the cache directory), ``sqlite:///path`` or a
+``redis://`` URL, job state and results are also written to that store,
+so finished jobs can still be read after the server restarts.  A job
+that was still running when the server stopped is reported as failed.
+"""
+
+import asyncio
+import collections
+import functools
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from monarch_mcp import tenants
+from monarch_mcp.cache import open_job_store
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Finished jobs are forgotten this long after they end
+DEFAULT_JOB_TTL = 60 * 60
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def max_workers() -> int:
+    """Return how many jobs may run at once."""
+    try:
+        return max(1, int(os.getenv("MONARCH_MCP_JOB_WORKERS", str(DEFAULT_MAX_WORKERS))))
+    except ValueError:
+        return DEFAULT_MAX_WORKERS
+
+
+@dataclass
+class Job:  # pylint: disable=too-many-instance-attributes
+    """One background job and its observable state."""
+
+    id: str
+    kind: str
+    status: str = RUNNING
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    tenant: str = field(default_factory=tenants.current)
+
+    @property
+    def done(self) -> bool:
+        """True once the job has stopped running."""
+        return self.status not in (QUEUED, RUNNING)
+
+    def touch(self) -> None:
+        """Record that the job's state changed."""
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable snapshot."""
+        end = self.updated_at if self.done else time.time()
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "elapsed_seconds": round(end - self.created_at, 1),
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+def _store_key(tenant: str, job_id: str) -> str:
+    return f"jobs\x1f{tenant}\x1f{job_id}"
+
+
+class JobRegistry:
+    """Start background jobs on the running loop and look them up by id.
+
+    Given *open_store*, job snapshots are also saved to the store it opens
+    on first use (see ``shared_cache``) when a job starts and ends.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_JOB_TTL,
+        open_store: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self._ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queue: Deque[Tuple[Job, asyncio.Future]] = collections.deque()
+        self._open_store = open_store
+        self._store = None
+
+    def start(self, kind: str, work: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Create a job and run ``work(job)`` in the background.
+
+        *work* may update ``job.progress`` (calling ``job.touch()``) and
+        may set ``job.status`` itself to report a non-error outcome other
+        than completed; its return value becomes ``job.result``.  The job
+        is ``queued`` until a worker slot is free.
+        """
+        self._prune()
+        loop = asyncio.get_running_loop()
+        job = Job(id=secrets.token_hex(8), kind=kind, status=QUEUED)
+        turn = None
+        with self._lock:
+            self._jobs[job.id] = job
+            if self._active < max_workers():
+                self._active += 1
+                job.status = RUNNING
+            else:
+                turn = loop.create_future()
+                self._queue.append((job, turn))
+        self._save(job)
+        job.task = loop.create_task(self._run(job, work, turn))
+        job.task.add_done_callback(functools.partial(self._finished, job, turn))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the current tenant's job *job_id*, or None if unknown or pruned."""
+        self._prune()
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return self._load(job_id)
+        if job.tenant != tenants.current():
+            return None
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel the current tenant's job *job_id* if it has not finished.
+
+        Returns the job (finished jobs are returned unchanged), or None if
+        it is unknown.
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return job
+        job.status = CANCELLED
+        job.error = "Job was cancelled."
+        job.touch()
+        if job.task is not None:
+            job.task.cancel()
+        return job
+
+    def clear(self) -> None:
+        """Cancel running jobs and forget every job."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+            self._queue.clear()
+            self._active = 0
+        for job in jobs:
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+
+    async def _run(
+        self, job: Job, work: Callable[[Job], Awaitable[Any]],
+        turn: Optional[asyncio.Future],
+    ) -> None:
+        if turn is not None:
+            await turn
+            job.status = RUNNING
+            job.touch()
+        try:
+            job.result = await work(job)
+            if job.status == RUNNING:
+                job.status = COMPLETED
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error("Job %s (%s) failed: %s", job.id, job.kind, exc)
+            job.status = FAILED
+            job.error = str(exc)
+
+    def _finished(self, job: Job, turn: Optional[asyncio.Future], task: asyncio.Task) -> None:
+        # A done callback, so jobs cancelled before they first run are covered too
+        if task.cancelled():
+            job.status = CANCELLED
+            job.error = "Job was cancelled."
+        self._leave(job, turn)
+        job.touch()
+        self._save(job)
+
+    def _leave(self, job: Job, turn: Optional[asyncio.Future]) -> None:
+        """Free *job*'s worker slot (or queue place) for the next queued job."""
+        with self._lock:
+            if turn is not None and (job, turn) in self._queue:
+                self._queue.remove((job, turn))
+                return
+            if self._queue:
+                _next_job, next_turn = self._queue.popleft()
+                next_turn.get_loop().call_soon_threadsafe(_resolve, next_turn)
+            else:
+                self._active = max(0, self._active - 1)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self._ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.done and job.updated_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    # ── Durable snapshots ──
+
+    def _open(self):
+        with self._lock:
+            if self._open_store is not None:
+                # Open once; a store that fails to open is not retried
+                opener, self._open_store = self._open_store, None
+                try:
+                    self._store = opener()
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    logger.warning("Could not open job store: %s", exc)
+            return self._store
+
+    def _save(self, job: Job) -> None:
+        store = self._open()
+        if store is None:
+            return
+        record = dict(job.to_dict(), tenant=job.tenant)
+        try:
+            store.set(
+                _store_key(job.tenant, job.id),
+                json.dumps(record, default=str).encode(),
+                self._ttl,
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Could not save job %s: %s", job.id, exc)
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        store = self._open()
+        if store is None:
+            return None
+        try:
+            raw = store.get(_store_key(tenants.current(), job_id))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Could not load job %s: %s", job_id, exc)
+            return None
+        if raw is None:
+            return None
+        record = json.loads(raw)
+        job = Job(
+            id=record["job_id"], kind=record["kind"], status=record["status"],
+            created_at=record["created_at"], updated_at=record["updated_at"],
+            progress=record["progress"], result=record["result"],
+            error=record["error"], tenant=record["tenant"],
+        )
+        if not job.done:
+            # Not in memory, so this process never ran it to the end
+            job.status = FAILED
+            job.error = "The server stopped before the job finished."
+        return job
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Global registry shared by every tool
+job_registry = JobRegistry(open_store=open_job_store)
@@ -0,0 +1,227 @@
+"""
+Process-pool offload for CPU-heavy work in Monarch Money MCP Server.
+
+Async tools run on the server's event loop, so encoding a multi-megabyte
+result with ``json.dumps(indent=2)`` or aggregating a large transaction
+set there stalls every other session until it finishes.  :func:`run`
+sends such work to a pool of worker processes when its input is large,
+and runs small work inline where pickling would cost more than it saves.
+
+Configuration:
+
+* ``MONARCH_MCP_OFFLOAD_WORKERS``: worker processes (default: CPU count,
+  at most 4); ``0`` runs everything inline.
+* ``MONARCH_MCP_OFFLOAD_MIN_CHARS``: estimated JSON size of the inputs at
+  which work is offloaded (default 500000).
+
+:class:`LoopLagMonitor` measures how late the event loop wakes up, so
+``get_server_metrics`` can show whether the loop is being blocked and how
+often work was offloaded.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MIN_CHARS = 500_000
+
+# Loop lag above this is logged and counted as a stall
+STALL_SECONDS = 0.1
+
+
+def max_workers() -> int:
+    """Return the configured number of worker processes (0 = inline only)."""
+    default = min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+    try:
+        return max(0, int(os.getenv("MONARCH_MCP_OFFLOAD_WORKERS", str(default))))
+    except ValueError:
+        return default
+
+
+def min_chars() -> int:
+    """Return the estimated input size (JSON characters) that triggers offload."""
+    try:
+        return max(0, int(os.getenv("MONARCH_MCP_OFFLOAD_MIN_CHARS", str(DEFAULT_MIN_CHARS))))
+    except ValueError:
+        return DEFAULT_MIN_CHARS
+
+
+def estimate_chars(obj: Any, limit: int) -> int:
+    """Roughly estimate the JSON size of *obj*, stopping once past *limit*."""
+    total = 0
+    stack = [obj]
+    while stack and total <= limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            total += len(item) + 2
+        elif isinstance(item, dict):
+            total += 2 + 4 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            total += 2 + 2 * len(item)
+            stack.extend(item)
+        else:
+            total += 8
+    return total
+
+
+# ── Worker pool ─────────────────────────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None  # pylint: disable=invalid-name
+_pool_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, float] = {"offloaded": 0, "inline": 0, "offload_seconds": 0.0}
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool  # pylint: disable=global-statement
+    workers = max_workers()
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs threads is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown() -> None:
+    """Stop the worker processes; the pool restarts on next use."""
+    global _pool  # pylint: disable=global-statement
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _record(key: str, seconds: float = 0.0) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+        if key == "offloaded":
+            _stats["offload_seconds"] += seconds
+
+
+async def run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call ``fn(*args, **kwargs)``, in a worker process if the inputs are large.
+
+    *fn* must be a module-level function and its arguments picklable.
+    """
+    threshold = min_chars()
+    pool = _get_pool() if estimate_chars((args, kwargs), threshold) >= threshold else None
+    if pool is None:
+        _record("inline")
+        return fn(*args, **kwargs)
+    started = time.monotonic()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, functools.partial(fn, *args, **kwargs),
+        )
+    finally:
+        _record("offloaded", time.monotonic() - started)
+
+
+async def dumps(obj: Any, **kwargs: Any) -> str:
+    """``json.dumps`` that moves large payloads off the event loop."""
+    return await run(json.dumps, obj, **kwargs)
+
+
+def stats() -> Dict[str, Any]:
+    """Return offload counters and settings."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    snapshot["offload_seconds"] = round(snapshot["offload_seconds"], 3)
+    snapshot.update(workers=max_workers(), min_chars=min_chars())
+    return snapshot
+
+
+def reset_stats() -> None:
+    """Zero the offload counters."""
+    with _stats_lock:
+        _stats.update(offloaded=0, inline=0, offload_seconds=0.0)
+
+
+# ── Loop lag ────────────────────────────────────────────────────────────
+
+
+class LoopLagMonitor:  # pylint: disable=too-many-instance-attributes
+    """Measure how late the event loop runs a periodic wake-up.
+
+    A healthy loop wakes within a millisecond or two; a CPU-bound call
+    running on the loop shows up as lag of its whole duration.
+    """
+
+    def __init__(self, interval: float = 0.25) -> None:
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        with self._lock:
+            self._samples = 0
+            self._stalls = 0
+            self._last = 0.0
+            self._max = 0.0
+            self._total = 0.0
+
+    def start(self) -> None:
+        """Start sampling on the running loop (no-op if already running there)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def record(self, lag: float) -> None:
+        """Add one lag sample (seconds)."""
+        with self._lock:
+            self._samples += 1
+            self._last = lag
+            self._max = max(self._max, lag)
+            self._total += lag
+            if lag >= STALL_SECONDS:
+                self._stalls += 1
+        if lag >= STALL_SECONDS:
+            logger.warning("Event loop blocked for %.0f ms", lag * 1000)
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return lag statistics in milliseconds."""
+        with self._lock:
+            mean = self._total / self._samples if self._samples else 0.0
+            return {
+                "samples": self._samples,
+                "stalls": self._stalls,
+                "last_ms": round(self._last * 1000, 1),
+                "max_ms": round(self._max * 1000, 1),
+                "mean_ms": round(mean * 1000, 1),
+            }
+
+
+# Global monitor for the server loop
+loop_lag = LoopLagMonitor()
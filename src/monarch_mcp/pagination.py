@@ -0,0 +1,104 @@
+"""
+Keyset cursors for ``get_transactions``.
+
+Monarch returns transactions newest first and only supports ``offset``
+paging, so an offset drifts whenever new transactions sync during an
+iteration.  A cursor instead anchors on the last transaction returned —
+its ``(date, id)`` and its position among that date's transactions — and
+the next page is requested with ``end_date`` set to the anchor date.
+Newer transactions then cannot shift the page, and the offset stays
+bounded by one day's transactions however deep the iteration goes.
+
+Cursors are opaque to callers and are bound to the filters they were
+issued for.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from monarch_mcp.cache import fingerprint
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position after the last transaction of a page."""
+
+    date: str
+    id: str
+    position: int
+    filters: str
+
+    def encode(self) -> str:
+        """Return the opaque string form handed to clients."""
+        raw = json.dumps(
+            {"d": self.date, "i": self.id, "p": self.position, "f": self.filters},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def filters_key(filters: Dict[str, Any]) -> str:
+    """Short digest identifying a set of query filters."""
+    return fingerprint(filters)[:16]
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Parse a cursor string; raises ValueError if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        cursor = Cursor(
+            date=str(data["d"]), id=str(data["i"]),
+            position=int(data["p"]), filters=str(data["f"]),
+        )
+        date.fromisoformat(cursor.date)
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Malformed cursor.") from exc
+    if cursor.position < 1:
+        raise ValueError("Malformed cursor.")
+    return cursor
+
+
+def parse_cursor(token: Optional[str], offset: int, limit: int) -> Optional[Cursor]:
+    """Validate the ``cursor`` tool argument against ``offset`` and ``limit``.
+
+    Returns None when no cursor was given; raises ValueError with a
+    user-facing message otherwise.
+    """
+    if not token:
+        return None
+    if offset:
+        raise ValueError("Cannot use both cursor and offset. Use one or the other.")
+    if limit <= 0:
+        raise ValueError("limit must be positive when using a cursor.")
+    return decode_cursor(token)
+
+
+def next_cursor(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    page: List[Dict[str, Any]],
+    limit: int,
+    key: str,
+    anchor: Optional[Cursor] = None,
+    anchor_position: int = 0,
+    earlier: int = 0,
+) -> Optional[Cursor]:
+    """Return the cursor following *page*, or None if it was the last page.
+
+    A page shorter than *limit* is the last one.  *anchor_position* is the
+    current position of *anchor* within its date, used when the page
+    continues that date.  For an offset page, *earlier* is the number of
+    rows dated like the page's first row that precede the page.
+    """
+    if limit <= 0 or len(page) < limit:
+        return None
+    last = page[-1]
+    day = str(last.get("date"))
+    on_day = sum(1 for txn in page if str(txn.get("date")) == day)
+    if anchor is not None and anchor.date == day:
+        on_day += anchor_position
+    if str(page[0].get("date")) == day:
+        on_day += earlier
+    return Cursor(date=day, id=str(last.get("id")), position=on_day, filters=key)
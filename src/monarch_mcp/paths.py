@@ -0,0 +1,49 @@
+"""
+Local file locations for Monarch Money MCP Server.
+
+Tools that write files (exports) or read them (balance history and
+attachment uploads) take paths from the MCP client, which over HTTP may
+be any remote caller.  Every such path is resolved with :func:`confine`
+to a directory the server operator chose, so a caller cannot write or
+read elsewhere on the host:
+
+* ``MONARCH_MCP_EXPORT_DIR``: where exports are written (default
+  ``~/monarch-mcp-exports``).
+* ``MONARCH_MCP_IMPORT_DIR``: where uploaded files are read from
+  (default ``~/monarch-mcp-imports``).
+"""
+
+import os
+
+
+def export_dir() -> str:
+    """Return the export directory.
+
+    ``MONARCH_MCP_EXPORT_DIR`` if set, otherwise ``~/monarch-mcp-exports``.
+    """
+    return os.getenv("MONARCH_MCP_EXPORT_DIR") or os.path.join(
+        os.path.expanduser("~"), "monarch-mcp-exports",
+    )
+
+
+def import_dir() -> str:
+    """Return the directory uploads are read from.
+
+    ``MONARCH_MCP_IMPORT_DIR`` if set, otherwise ``~/monarch-mcp-imports``.
+    """
+    return os.getenv("MONARCH_MCP_IMPORT_DIR") or os.path.join(
+        os.path.expanduser("~"), "monarch-mcp-imports",
+    )
+
+
+def confine(path: str, root: str) -> str:
+    """Return *path* resolved inside directory *root*; raise ValueError if outside.
+
+    A relative *path* is taken relative to *root*.  Symlinks and ``..``
+    are resolved before the check, so neither can lead out of *root*.
+    """
+    base = os.path.realpath(os.path.expanduser(root))
+    resolved = os.path.realpath(os.path.join(base, os.path.expanduser(path)))
+    if os.path.commonpath([base, resolved]) != base:
+        raise ValueError(f"Path {path!r} is outside the allowed directory {base}.")
+    return resolved
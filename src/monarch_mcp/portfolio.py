@@ -0,0 +1,111 @@
+"""
+Portfolio aggregation for Monarch Money MCP Server.
+
+Combines ``get_account_holdings`` responses from several investment
+accounts into one view: positions merged by security, with a
+per-account breakdown, and allocation by asset class.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Monarch account type that holds securities
+INVESTMENT_ACCOUNT_TYPE = "brokerage"
+
+
+def is_investment_account(account: Dict[str, Any]) -> bool:
+    """Return True for brokerage accounts or any account reporting holdings."""
+    if (account.get("type") or {}).get("name") == INVESTMENT_ACCOUNT_TYPE:
+        return True
+    return bool(account.get("holdingsCount"))
+
+
+def _holding_nodes(holdings: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Yield aggregate holding nodes from a ``Web_GetHoldings`` response."""
+    edges = ((holdings.get("portfolio") or {}).get("aggregateHoldings") or {}).get("edges")
+    for edge in edges or []:
+        node = edge.get("node")
+        if node:
+            yield node
+
+
+def _security_identity(node: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Return a merge key and descriptive fields for a holding node."""
+    security = node.get("security") or {}
+    first = (node.get("holdings") or [{}])[0]
+    ticker = security.get("ticker") or first.get("ticker")
+    name = security.get("name") or first.get("name")
+    key = security.get("id") or ticker or name or node.get("id")
+    asset_class = (
+        security.get("typeDisplay") or first.get("typeDisplay")
+        or security.get("type") or first.get("type") or "Other"
+    )
+    return str(key), {"ticker": ticker, "name": name, "asset_class": asset_class}
+
+
+def _num(value: Any) -> float:
+    return float(value) if value is not None else 0.0
+
+
+def aggregate_holdings(  # pylint: disable=too-many-locals
+    account_holdings: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Aggregate ``(account, holdings_response)`` pairs into a portfolio view."""
+    positions: Dict[str, Dict[str, Any]] = {}
+    accounts = []
+    for account, holdings in account_holdings:
+        account_value = 0.0
+        count = 0
+        for node in _holding_nodes(holdings):
+            key, identity = _security_identity(node)
+            quantity = _num(node.get("quantity"))
+            value = _num(node.get("totalValue"))
+            position = positions.setdefault(key, {
+                "security_id": key,
+                **identity,
+                "total_quantity": 0.0,
+                "total_value": 0.0,
+                "total_basis": 0.0,
+                "accounts": [],
+            })
+            position["total_quantity"] += quantity
+            position["total_value"] += value
+            position["total_basis"] += _num(node.get("basis"))
+            position["accounts"].append({
+                "account_id": account.get("id"),
+                "account_name": account.get("displayName") or account.get("name"),
+                "quantity": quantity,
+                "value": round(value, 2),
+            })
+            account_value += value
+            count += 1
+        accounts.append({
+            "id": account.get("id"),
+            "name": account.get("displayName") or account.get("name"),
+            "positions": count,
+            "value": round(account_value, 2),
+        })
+
+    total_value = sum(p["total_value"] for p in positions.values())
+    by_class: Dict[str, float] = {}
+    for position in positions.values():
+        by_class[position["asset_class"]] = (
+            by_class.get(position["asset_class"], 0.0) + position["total_value"]
+        )
+        for field in ("total_quantity", "total_value", "total_basis"):
+            position[field] = round(position[field], 6 if field == "total_quantity" else 2)
+
+    allocation = [
+        {
+            "asset_class": asset_class,
+            "value": round(value, 2),
+            "percent": round(100 * value / total_value, 2) if total_value else 0.0,
+        }
+        for asset_class, value in sorted(by_class.items(), key=lambda kv: -kv[1])
+    ]
+
+    return {
+        "total_value": round(total_value, 2),
+        "accounts": accounts,
+        "positions": sorted(positions.values(), key=lambda p: -p["total_value"]),
+        "allocation": allocation,
+    }
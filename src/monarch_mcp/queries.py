@@ -0,0 +1,137 @@
+"""
+Lean GraphQL queries for Monarch Money MCP Server.
+
+The library's ``get_transactions`` and ``get_accounts`` select every
+field of Monarch's shared fragments (attachments, review state, sync
+metadata, institution branding ...), most of which the tools then throw
+away.  The queries here select only the fields ``get_transactions`` and
+``get_accounts`` return, which cuts the response several-fold and the
+time spent parsing it.  ``benchmarks/lean_queries.py`` measures both.
+
+The functions take the same arguments as the library methods they
+replace and return responses of the same shape.  Both documents live in
+the ``documents`` registry and are parsed on first use.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from monarchmoney import MonarchMoney
+
+from monarch_mcp import documents
+
+# Fields read by server._format_transaction (plus what cursors need)
+TRANSACTIONS_QUERY = documents.define(
+    "MCP_GetTransactionsLean",
+    """
+    query MCP_GetTransactionsLean(
+        $offset: Int, $limit: Int, $filters: TransactionFilterInput, $orderBy: TransactionOrdering
+    ) {
+        allTransactions(filters: $filters) {
+            totalCount
+            results(offset: $offset, limit: $limit, orderBy: $orderBy) {
+                id
+                date
+                amount
+                plaidName
+                notes
+                pending
+                isRecurring
+                category {
+                    id
+                    name
+                }
+                account {
+                    id
+                    displayName
+                }
+                merchant {
+                    id
+                    name
+                }
+                tags {
+                    id
+                    name
+                    color
+                }
+            }
+        }
+    }
+    """
+)
+
+# Fields read by server._format_accounts
+ACCOUNTS_QUERY = documents.define(
+    "MCP_GetAccountsLean",
+    """
+    query MCP_GetAccountsLean {
+        accounts {
+            id
+            displayName
+            currentBalance
+            deactivatedAt
+            type {
+                name
+            }
+            institution {
+                name
+            }
+        }
+    }
+    """
+)
+
+# get_transactions boolean filters and their TransactionFilterInput names
+_BOOLEAN_FILTERS = {
+    "has_attachments": "hasAttachments",
+    "has_notes": "hasNotes",
+    "hidden_from_reports": "hideFromReports",
+    "is_split": "isSplit",
+    "is_recurring": "isRecurring",
+    "synced_from_institution": "syncedFromInstitution",
+}
+
+
+def transaction_variables(  # pylint: disable=too-many-arguments
+    limit: int,
+    offset: int = 0,
+    *,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: str = "",
+    category_ids: Optional[List[str]] = None,
+    account_ids: Optional[List[str]] = None,
+    tag_ids: Optional[List[str]] = None,
+    **flags: Optional[bool],
+) -> Dict[str, Any]:
+    """Build ``TRANSACTIONS_QUERY`` variables as the library's get_transactions does."""
+    filters: Dict[str, Any] = {
+        "search": search,
+        "categories": category_ids or [],
+        "accounts": account_ids or [],
+        "tags": tag_ids or [],
+    }
+    for name, value in flags.items():
+        if name not in _BOOLEAN_FILTERS:
+            raise TypeError(f"Unknown transaction filter {name!r}")
+        if value is not None:
+            filters[_BOOLEAN_FILTERS[name]] = value
+    if bool(start_date) != bool(end_date):
+        raise ValueError("Both start_date and end_date are required when filtering by date.")
+    if start_date:
+        filters["startDate"] = start_date
+        filters["endDate"] = end_date
+    return {"offset": offset, "limit": limit, "orderBy": "date", "filters": filters}
+
+
+async def get_transactions(
+    client: MonarchMoney, limit: int, offset: int = 0, **filters: Any,
+) -> Dict[str, Any]:
+    """Fetch a page of transactions with only the fields tools return."""
+    return await documents.execute(
+        client, TRANSACTIONS_QUERY, transaction_variables(limit, offset, **filters),
+    )
+
+
+async def get_accounts(client: MonarchMoney) -> Dict[str, Any]:
+    """Fetch every account with only the fields tools return."""
+    return await documents.execute(client, ACCOUNTS_QUERY)
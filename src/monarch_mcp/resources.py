@@ -0,0 +1,136 @@
+"""
+MCP resource subscriptions for Monarch Money MCP Server.
+
+Reference data (accounts, categories, category groups, tags) is published
+as MCP resources.  Sessions that subscribe to a resource are remembered
+here, and receive ``notifications/resources/updated`` when the cached copy
+is refreshed with new data or a write tool changes it.
+:func:`serve_subscriptions` handles the subscribe requests and advertises
+the capability.
+
+Notifications may be raised from any thread (not only from the loop
+serving the session), so each session is stored with the event loop it
+lives on and sends are scheduled onto that loop.  Each session is also
+stored with its tenant, and only hears about the tenant's own data.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Dict, Iterable
+
+from pydantic import AnyUrl
+
+from monarch_mcp import tenants
+
+logger = logging.getLogger(__name__)
+
+# Resource URIs for cached reference data
+ACCOUNTS_URI = "monarch://accounts"
+CATEGORIES_URI = "monarch://categories"
+CATEGORY_GROUPS_URI = "monarch://category-groups"
+TAGS_URI = "monarch://tags"
+
+
+class ResourceSubscribers:
+    """Thread-safe registry of sessions interested in each resource URI.
+
+    Sessions are held weakly, so a closed session drops out on its own.
+    """
+
+    def __init__(self) -> None:
+        self._by_uri: Dict[str, "weakref.WeakKeyDictionary"] = {}
+        self._lock = threading.Lock()
+
+    def add(self, uri: str, session) -> None:
+        """Register *session* (on the running loop) for the current tenant's *uri*."""
+        target = (asyncio.get_running_loop(), tenants.current())
+        with self._lock:
+            self._by_uri.setdefault(uri, weakref.WeakKeyDictionary())[session] = target
+
+    def discard(self, uri: str, session) -> None:
+        """Stop sending updates for *uri* to *session*."""
+        with self._lock:
+            sessions = self._by_uri.get(uri)
+            if sessions is not None:
+                sessions.pop(session, None)
+
+    def count(self, uri: str) -> int:
+        """Return the number of sessions registered for *uri*."""
+        with self._lock:
+            return len(self._by_uri.get(uri, ()))
+
+    def clear(self) -> None:
+        """Forget every registration."""
+        with self._lock:
+            self._by_uri.clear()
+
+    def notify(self, uris: Iterable[str]) -> None:
+        """Send ``resources/updated`` for each of *uris* to the current tenant's sessions.
+
+        Safe to call from any thread; sends are fire-and-forget and a
+        session that can no longer be reached is unregistered.
+        """
+        tenant_id = tenants.current()
+        for uri in uris:
+            with self._lock:
+                targets = list(self._by_uri.get(uri, {}).items())
+            for session, (loop, session_tenant) in targets:
+                if session_tenant != tenant_id:
+                    continue
+                if loop.is_closed():
+                    self.discard(uri, session)
+                    continue
+                future = asyncio.run_coroutine_threadsafe(
+                    session.send_resource_updated(AnyUrl(uri)), loop,
+                )
+                future.add_done_callback(self._on_sent(uri, session))
+
+    def _on_sent(self, uri: str, session):
+        ref = weakref.ref(session)
+
+        def _callback(future) -> None:
+            if future.cancelled() or future.exception() is None:
+                return
+            logger.debug(
+                "Dropping subscriber for %s: %s", uri, future.exception(),
+            )
+            target = ref()
+            if target is not None:
+                self.discard(uri, target)
+
+        return _callback
+
+
+# Global registry shared by resource handlers and write tools
+subscribers = ResourceSubscribers()
+
+
+def serve_subscriptions(server) -> None:
+    """Handle ``resources/subscribe`` and ``resources/unsubscribe`` on *server*.
+
+    *server* is the MCP SDK's low-level server, which reports
+    ``resources.subscribe`` as False whatever handlers it has; its
+    initialization options are wrapped so clients are told subscriptions
+    are supported.
+    """
+    create_options = server.create_initialization_options
+
+    def _create_initialization_options(*args, **kwargs):
+        options = create_options(*args, **kwargs)
+        if options.capabilities.resources is not None:
+            options.capabilities.resources.subscribe = True
+        return options
+
+    server.create_initialization_options = _create_initialization_options
+
+    @server.subscribe_resource()
+    async def _subscribe(uri) -> None:
+        session = server.request_context.session
+        with tenants.use(tenants.for_session(session)):
+            subscribers.add(str(uri), session)
+
+    @server.unsubscribe_resource()
+    async def _unsubscribe(uri) -> None:
+        subscribers.discard(str(uri), server.request_context.session)
@@ -0,0 +1,315 @@
+"""
+Priority scheduling of upstream work for Monarch Money MCP Server.
+
+Every request to Monarch holds one of a fixed number of upstream slots
+while it is in flight, so a bulk export or a refresh job cannot crowd out
+an interactive ``get_accounts``: between two pages of an export, a
+waiting interactive request takes the freed slot first.  Each request
+belongs to one of three classes, served in priority order:
+
+* ``interactive``: ordinary tool calls a user is waiting on.
+* ``background``: background jobs, such as refresh polling.
+* ``bulk``: exports, uploads and other large batch work.
+
+Within a class, waiting sessions take turns (round robin), so one MCP
+session queueing many calls does not starve another.  The class and
+session are context variables: :class:`SchedulerMiddleware` sets them for
+each tool call, background jobs switch class with :func:`use`, and
+:class:`UpstreamClient` takes a slot around each client request.  Some slots are
+reserved for interactive work: background and bulk work together never
+hold more than ``capacity - reserve`` slots.
+
+Configuration:
+
+* ``MONARCH_MCP_UPSTREAM_CONCURRENCY``: upstream slots (default 4).
+* ``MONARCH_MCP_INTERACTIVE_RESERVE``: slots only interactive work may
+  use (default 1, always leaving at least one for the other classes).
+"""
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, FrozenSet, Hashable, Iterator, Optional
+
+from fastmcp.server.middleware import Middleware
+
+# Priority classes, highest first
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+BULK = "bulk"
+CLASSES = (INTERACTIVE, BACKGROUND, BULK)
+
+DEFAULT_CAPACITY = 4
+DEFAULT_INTERACTIVE_RESERVE = 1
+
+# Fairness key of the MCP session being served
+_session_key: contextvars.ContextVar[Hashable] = contextvars.ContextVar(
+    "monarch_scheduler_session", default=None,
+)
+
+# Priority class of the work being done
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "monarch_scheduler_priority", default=INTERACTIVE,
+)
+
+
+@contextlib.contextmanager
+def use(name: str) -> Iterator[None]:
+    """Schedule upstream requests made in the enclosed block as *name* work."""
+    if name not in CLASSES:
+        raise ValueError(f"Unknown priority class {name!r}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def capacity() -> int:
+    """Return the configured number of upstream slots."""
+    try:
+        return max(1, int(os.getenv("MONARCH_MCP_UPSTREAM_CONCURRENCY", str(DEFAULT_CAPACITY))))
+    except ValueError:
+        return DEFAULT_CAPACITY
+
+
+def interactive_reserve() -> int:
+    """Return the slots reserved for interactive work."""
+    try:
+        reserve = int(os.getenv(
+            "MONARCH_MCP_INTERACTIVE_RESERVE", str(DEFAULT_INTERACTIVE_RESERVE),
+        ))
+    except ValueError:
+        reserve = DEFAULT_INTERACTIVE_RESERVE
+    return min(max(0, reserve), capacity() - 1)
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    priority: str
+    queued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+@dataclass
+class _ClassStats:
+    active: int = 0
+    admitted: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class PriorityScheduler:
+    """Admit upstream work by priority class, fairly across sessions.
+
+    Callers may wait on different event loops (a test or embedding
+    application may run its own), so state is guarded by a lock and
+    waiters are woken on their own loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._queues: Dict[str, "collections.OrderedDict[Hashable, Deque[_Waiter]]"] = {
+            name: collections.OrderedDict() for name in CLASSES
+        }
+        self._stats = {name: _ClassStats() for name in CLASSES}
+
+    def _can_admit(self, priority: str) -> bool:
+        active = sum(stats.active for stats in self._stats.values())
+        if active >= capacity():
+            return False
+        if priority == INTERACTIVE:
+            return True
+        non_interactive = active - self._stats[INTERACTIVE].active
+        return non_interactive < capacity() - interactive_reserve()
+
+    def _queued_ahead(self, priority: str) -> bool:
+        for name in CLASSES[:CLASSES.index(priority) + 1]:
+            if self._queues[name]:
+                return True
+        return False
+
+    def _admit(self, priority: str, waited: float) -> None:
+        stats = self._stats[priority]
+        stats.active += 1
+        stats.admitted += 1
+        stats.wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    def _next_waiter(self, priority: str) -> _Waiter:
+        queue = self._queues[priority]
+        key, waiters = next(iter(queue.items()))
+        waiter = waiters.popleft()
+        del queue[key]
+        if waiters:
+            # Session goes to the back of the line for its next call
+            queue[key] = waiters
+        return waiter
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiters, highest class first (lock held)."""
+        for priority in CLASSES:
+            while self._queues[priority] and self._can_admit(priority):
+                waiter = self._next_waiter(priority)
+                waiter.granted = True
+                self._admit(priority, time.monotonic() - waiter.queued_at)
+                waiter.future.get_loop().call_soon_threadsafe(_resolve, waiter.future)
+            if self._queues[priority]:
+                # Lower classes never overtake a class that is still waiting
+                return
+
+    def _remove(self, key: Hashable, waiter: _Waiter) -> None:
+        waiters = self._queues[waiter.priority].get(key)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._queues[waiter.priority][key]
+
+    async def acquire(self, priority: str = INTERACTIVE, key: Hashable = None) -> None:
+        """Wait for an upstream slot for *priority* work from session *key*."""
+        if priority not in CLASSES:
+            raise ValueError(f"Unknown priority class {priority!r}")
+        with self._lock:
+            if not self._queued_ahead(priority) and self._can_admit(priority):
+                self._admit(priority, 0.0)
+                return
+            waiter = _Waiter(asyncio.get_running_loop().create_future(), priority)
+            self._queues[priority].setdefault(key, collections.deque()).append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release(priority)
+                else:
+                    self._remove(key, waiter)
+            raise
+
+    def _release(self, priority: str) -> None:
+        self._stats[priority].active -= 1
+        self._dispatch()
+
+    def release(self, priority: str = INTERACTIVE) -> None:
+        """Return a slot taken with :meth:`acquire`."""
+        with self._lock:
+            self._release(priority)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, priority: Optional[str] = None, key: Hashable = None,
+    ) -> AsyncIterator[None]:
+        """Hold an upstream slot for the enclosed block.
+
+        *priority* defaults to the current class (see :func:`use`)
+        and *key* to the MCP session being served.
+        """
+        if priority is None:
+            priority = _priority.get()
+        if key is None:
+            key = _session_key.get()
+        await self.acquire(priority, key)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-class queue and admission metrics."""
+        with self._lock:
+            classes = {}
+            for name in CLASSES:
+                stats = self._stats[name]
+                queued = self._queues[name]
+                classes[name] = {
+                    "active": stats.active,
+                    "queued": sum(len(waiters) for waiters in queued.values()),
+                    "queued_sessions": len(queued),
+                    "admitted": stats.admitted,
+                    "mean_wait_ms": round(
+                        stats.wait_seconds / stats.admitted * 1000 if stats.admitted else 0.0, 1,
+                    ),
+                    "max_wait_ms": round(stats.max_wait_seconds * 1000, 1),
+                }
+        return {
+            "capacity": capacity(),
+            "interactive_reserve": interactive_reserve(),
+            "classes": classes,
+        }
+
+    def reset_stats(self) -> None:
+        """Zero the admission counters (active slots are kept)."""
+        with self._lock:
+            for stats in self._stats.values():
+                stats.admitted = 0
+                stats.wait_seconds = 0.0
+                stats.max_wait_seconds = 0.0
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Global scheduler shared by every tool and job
+scheduler = PriorityScheduler()
+
+
+class UpstreamClient:  # pylint: disable=too-few-public-methods
+    """Client wrapper that holds an upstream slot for each request.
+
+    Every coroutine method of the wrapped client (``get_accounts``,
+    ``gql_call`` ...) first takes one request from *budget* (a tenant's
+    ``RequestBudget``, if given) and then waits for a slot of the current
+    class, so a tool or job holds exactly one slot per request in flight
+    and none while it is throttled or doing local work.  Other attributes
+    pass through unchanged.
+    """
+
+    def __init__(self, client: Any, budget: Any = None) -> None:
+        self.client = client
+        self.budget = budget
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _request(*args, **kwargs):
+            if self.budget is not None:
+                await self.budget.acquire()
+            async with scheduler.slot():
+                return await attr(*args, **kwargs)
+        return _request
+
+
+class SchedulerMiddleware(Middleware):
+    """Set the priority class and session of each tool call.
+
+    Requests made by tools in *bulk* are scheduled as bulk work, and
+    every other tool's as interactive.  Slots themselves are taken per
+    request by :class:`UpstreamClient`.
+    """
+
+    def __init__(self, bulk: FrozenSet[str] = frozenset()) -> None:
+        self._bulk = bulk
+
+    async def on_call_tool(self, context, call_next):
+        ctx = context.fastmcp_context
+        key: Optional[Hashable] = (
+            id(ctx.session) if ctx is not None and ctx.request_context else None
+        )
+        token = _session_key.set(key)
+        try:
+            with use(BULK if context.message.name in self._bulk else INTERACTIVE):
+                return await call_next(context)
+        finally:
+            _session_key.reset(token)
@@ -4,6 +4,7 @@ Secure session management for Monarch Money MCP Server using keyring.
 
 import logging
 import os
+import threading
 from typing import Optional
 
 import keyring
@@ -18,13 +19,31 @@ KEYRING_USERNAME = "monarch-token"
 
 
 class SecureMonarchSession:
-    """Manages Monarch Money sessions securely using the system keyring."""
+    """Manages Monarch Money sessions securely using the system keyring.
+
+    Each tenant (see ``tenants``) stores its token under its own keyring
+    entry; the default tenant uses ``KEYRING_USERNAME``.
+
+    The authenticated client is created once and shared by every tool call
+    (and, over HTTP, every MCP session) until the token changes.  The
+    library opens a fresh transport per request, so one instance is safe
+    to use from several threads and event loops at once.
+    """
+
+    def __init__(self, tenant_id: Optional[str] = None) -> None:
+        # The default tenant keeps the original keyring entry
+        self._username = (
+            f"{KEYRING_USERNAME}:{tenant_id}" if tenant_id else KEYRING_USERNAME
+        )
+        self._client: Optional[MonarchMoney] = None
+        self._client_lock = threading.Lock()
 
     def save_token(self, token: str) -> None:
         """Save the authentication token to the system keyring."""
         try:
-            keyring.set_password(KEYRING_SERVICE, KEYRING_USERNAME, token)
+            keyring.set_password(KEYRING_SERVICE, self._username, token)
             logger.info("Token saved securely to keyring")
+            self.forget_client()
 
             # Clean up any old insecure files
             self._cleanup_old_session_files()
@@ -36,7 +55,7 @@ class SecureMonarchSession:
     def load_token(self) -> Optional[str]:
         """Load the authentication token from the system keyring."""
         try:
-            token = keyring.get_password(KEYRING_SERVICE, KEYRING_USERNAME)
+            token = keyring.get_password(KEYRING_SERVICE, self._username)
             if token:
                 logger.info("Token loaded from keyring")
                 return token
@@ -48,8 +67,9 @@ class SecureMonarchSession:
 
     def delete_token(self) -> None:
         """Delete the authentication token from the system keyring."""
+        self.forget_client()
         try:
-            keyring.delete_password(KEYRING_SERVICE, KEYRING_USERNAME)
+            keyring.delete_password(KEYRING_SERVICE, self._username)
             logger.info("Token deleted from keyring")
 
             # Also clean up any old insecure files
@@ -61,18 +81,27 @@ class SecureMonarchSession:
             logger.error("Failed to delete token from keyring: %s", e)
 
     def get_authenticated_client(self) -> Optional[MonarchMoney]:
-        """Get an authenticated MonarchMoney client."""
-        token = self.load_token()
-        if not token:
-            return None
+        """Get the shared authenticated MonarchMoney client."""
+        with self._client_lock:
+            if self._client is not None:
+                return self._client
 
-        try:
-            client = MonarchMoney(token=token)
-            logger.info("MonarchMoney client created with stored token")
-            return client
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Failed to create MonarchMoney client: %s", e)
-            return None
+            token = self.load_token()
+            if not token:
+                return None
+
+            try:
+                self._client = MonarchMoney(token=token)
+                logger.info("MonarchMoney client created with stored token")
+                return self._client
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Failed to create MonarchMoney client: %s", e)
+                return None
+
+    def forget_client(self) -> None:
+        """Drop the shared client so the next call reloads the token."""
+        with self._client_lock:
+            self._client = None
 
     def save_authenticated_session(self, mm: MonarchMoney) -> None:
         """Save the session from an authenticated MonarchMoney instance."""
@@ -2,24 +2,32 @@
 # pylint: disable=too-many-lines
 
 import argparse
+import asyncio
+import calendar
+import contextlib
 import functools
+import inspect
 import json
 import logging
 import os
 import re
 import traceback
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from fastmcp import FastMCP
-from gql import gql
+from fastmcp import Context, FastMCP
 from gql.transport.exceptions import TransportServerError, TransportQueryError, TransportError
 from monarchmoney import MonarchMoney, LoginFailedException
 
 from monarch_mcp.secure_session import secure_session, is_auth_error
-from monarch_mcp.auth_server import trigger_auth_flow, _run_sync
+from monarch_mcp.auth_server import trigger_auth_flow
+from monarch_mcp.cache import fingerprint, response_cache
+from monarch_mcp import (
+    balance_upload, columnar, continuation, documents, export, forecast, idempotency, invalidation,
+    jobs, offload, pagination, paths, portfolio, queries, resources, scheduler, tenants,
+    timeseries, transaction_cache,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -43,91 +51,179 @@ _arg_parser.add_argument(
          "Accepts: --enable-write, --enable-write=true, --enable-write=false. "
          "Default: false (read-only mode).",
 )
+_arg_parser.add_argument(
+    "--transport",
+    choices=("stdio", "http"),
+    default="stdio",
+    help="stdio (default) serves one client over stdin/stdout; http serves "
+         "many MCP sessions from one process over streamable HTTP.",
+)
+_arg_parser.add_argument(
+    "--host",
+    default="127.0.0.1",
+    help="Interface for --transport http (default: 127.0.0.1).",
+)
+_arg_parser.add_argument(
+    "--port",
+    type=int,
+    default=8000,
+    help="Port for --transport http (default: 8000).",
+)
 _PARSED_ARGS, _ = _arg_parser.parse_known_args()
 _WRITE_ENABLED = _PARSED_ARGS.enable_write.lower() in ("true", "1")
 
+@contextlib.asynccontextmanager
+async def _lifespan(_server):
+    """Watch event-loop lag while serving; stop offload workers on exit."""
+    offload.loop_lag.start()
+    try:
+        yield {}
+    finally:
+        offload.loop_lag.stop()
+        offload.shutdown()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("Monarch Money MCP Server")
+mcp = FastMCP("Monarch Money MCP Server", lifespan=_lifespan)
+mcp.add_middleware(tenants.TenantMiddleware())
+
+# Batch tools queue behind interactive calls for upstream slots
+_BULK_TOOLS = frozenset({
+    "export_transactions", "export_columnar",
+    "upload_account_balance_history", "upload_attachments",
+})
+mcp.add_middleware(scheduler.SchedulerMiddleware(bulk=_BULK_TOOLS))
+
+
+def _tenant_session():
+    """Return the keyring session of the tenant being served."""
+    if tenants.current() == tenants.DEFAULT_TENANT:
+        return secure_session
+    return tenants.get().session
 
 
-def run_async(coro):
-    """Run async function in a new thread with its own event loop.
+def _tenant_login_hint(tenant_id: str) -> str:
+    return (
+        f"No valid Monarch session for tenant '{tenant_id}'. Run "
+        f"`python login_setup.py --tenant {tenant_id}` on the server host, "
+        "then try again."
+    )
+
 
-    If the coroutine raises an authentication error (expired token,
-    invalid credentials), the stale token is cleared from the keyring,
-    the browser-based auth flow is re-triggered, and a RuntimeError is
-    raised so the calling tool can inform the user.
+def _recover_from_auth_error(exc: Exception) -> None:
+    """Clear the token and re-trigger login if *exc* is an auth failure.
+
+    Raises RuntimeError (chained to *exc*) for auth failures; returns
+    normally otherwise so the caller can re-raise the original error.
+    """
+    if is_auth_error(exc):
+        logger.warning("Token appears expired — clearing and triggering re-auth")
+        _tenant_session().delete_token()
+        if tenants.current() != tenants.DEFAULT_TENANT:
+            raise RuntimeError(_tenant_login_hint(tenants.current())) from exc
+        trigger_auth_flow()
+        raise RuntimeError(
+            "Your session has expired. A login page has been opened in "
+            "your browser — please sign in and try again."
+        ) from exc
+
+
+async def await_async(coro):
+    """Await *coro* on the server's event loop, recovering from auth errors.
+
+    Tools are async and await upstream calls on the serving loop, so one
+    slow Monarch request never holds up other sessions.  If the coroutine
+    raises an authentication error (expired token, invalid credentials),
+    the stale token is cleared from the keyring, the browser-based auth
+    flow is re-triggered, and a RuntimeError is raised so the calling tool
+    can inform the user.
 
     Only catches the two exception types that ``is_auth_error`` can
     recognise; everything else propagates unchanged to the caller.
     """
-    with ThreadPoolExecutor() as executor:
-        future = executor.submit(_run_sync, coro)
-        try:
-            return future.result()
-        except (TransportServerError, LoginFailedException) as exc:
-            if is_auth_error(exc):
-                logger.warning("Token appears expired — clearing and triggering re-auth")
-                secure_session.delete_token()
-                trigger_auth_flow()
-                raise RuntimeError(
-                    "Your session has expired. A login page has been opened in "
-                    "your browser — please sign in and try again."
-                ) from exc
-            raise
+    try:
+        return await coro
+    except (TransportServerError, LoginFailedException) as exc:
+        _recover_from_auth_error(exc)
+        raise
 
 
 # ── MCP tool error handling ────────────────────────────────────────────
 
+def _format_mcp_error(operation: str, exc: Exception) -> str:
+    """Log *exc* and return the user-readable error string for a tool."""
+    if isinstance(exc, RuntimeError):
+        logger.error("Runtime error %s: %s", operation, exc)
+        return f"Error {operation}: {exc}"
+    if isinstance(exc, TransportServerError):
+        code = getattr(exc, "code", "unknown")
+        logger.error(
+            "Monarch API HTTP %s error %s: %s", code, operation, exc,
+        )
+        return f"Error {operation}: Monarch API returned HTTP {code}: {exc}"
+    if isinstance(exc, TransportQueryError):
+        logger.error("Monarch API query error %s: %s", operation, exc)
+        return f"Error {operation}: API query failed: {exc}"
+    if isinstance(exc, TransportError):
+        logger.error(
+            "Monarch API connection error %s: %s", operation, exc,
+        )
+        return f"Error {operation}: connection error: {exc}"
+    logger.error(
+        "Unexpected error %s: %s (%s)",
+        operation, exc, type(exc).__name__,
+    )
+    return f"Error {operation}: {exc}"
+
+
 def _handle_mcp_errors(operation: str):
     """Decorator providing granular exception handling for MCP tool functions.
 
     Catches specific known exception types with appropriate log messages,
     with a catch-all for anything unexpected.  Every path returns a
-    user-readable error string so the MCP tool never crashes.
+    user-readable error string so the MCP tool never crashes.  Works for
+    both sync and async tool functions.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    return _format_mcp_error(operation, exc)
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
-            except RuntimeError as exc:
-                logger.error("Runtime error %s: %s", operation, exc)
-                return f"Error {operation}: {exc}"
-            except TransportServerError as exc:
-                code = getattr(exc, "code", "unknown")
-                logger.error(
-                    "Monarch API HTTP %s error %s: %s", code, operation, exc,
-                )
-                return f"Error {operation}: Monarch API returned HTTP {code}: {exc}"
-            except TransportQueryError as exc:
-                logger.error("Monarch API query error %s: %s", operation, exc)
-                return f"Error {operation}: API query failed: {exc}"
-            except TransportError as exc:
-                logger.error(
-                    "Monarch API connection error %s: %s", operation, exc,
-                )
-                return f"Error {operation}: connection error: {exc}"
             except Exception as exc:  # pylint: disable=broad-exception-caught
-                logger.error(
-                    "Unexpected error %s: %s (%s)",
-                    operation, exc, type(exc).__name__,
-                )
-                return f"Error {operation}: {exc}"
+                return _format_mcp_error(operation, exc)
         return wrapper
     return decorator
 
 
 # ── Client helpers ─────────────────────────────────────────────────────
 
-async def get_monarch_client() -> MonarchMoney:
-    """Get or create MonarchMoney client instance using secure session storage."""
+async def get_monarch_client() -> scheduler.UpstreamClient:
+    """Get or create MonarchMoney client instance using secure session storage.
+
+    The client is wrapped so each request is charged to the current
+    tenant's request budget and holds an upstream slot (see ``scheduler``).
+    """
+    tenant = tenants.get()
+
     # Try to get authenticated client from secure session
-    client = secure_session.get_authenticated_client()
+    client = _tenant_session().get_authenticated_client()
 
     if client is not None:
         logger.info("Using authenticated client from secure keyring storage")
-        return client
+        return scheduler.UpstreamClient(client, tenant.budget)
+
+    # Environment credentials and browser login belong to the default tenant
+    if tenant.id != tenants.DEFAULT_TENANT:
+        raise RuntimeError(_tenant_login_hint(tenant.id))
 
     # If no secure session, try environment credentials
     email = os.getenv("MONARCH_EMAIL")
@@ -144,7 +240,7 @@ async def get_monarch_client() -> MonarchMoney:
             # Save the session securely
             secure_session.save_authenticated_session(client)
 
-            return client
+            return scheduler.UpstreamClient(client, tenant.budget)
         except Exception as e:
             logger.error("Failed to login to Monarch Money: %s", e)
             raise
@@ -157,6 +253,182 @@ async def get_monarch_client() -> MonarchMoney:
     )
 
 
+# Page size used when a tool walks every page of a transaction query
+_TRANSACTION_PAGE_SIZE = 500
+
+
+async def _iter_transaction_pages(client: MonarchMoney, on_page=None, fetch=None, **filters):
+    """Yield successive pages of raw transactions until the result set is exhausted.
+
+    Pages after the first follow keyset cursors (see ``pagination``), so
+    transactions that sync during the walk are neither repeated nor
+    skipped.  *on_page*, if given, is awaited after each page is consumed
+    with the number of transactions fetched so far and the server's
+    ``totalCount``.  *fetch* replaces ``client.get_transactions`` (e.g.
+    with a lean query).
+    """
+    fetch = fetch or client.get_transactions
+    key = pagination.filters_key(filters)
+    response = await fetch(limit=_TRANSACTION_PAGE_SIZE, offset=0, **filters)
+    total = response.get("allTransactions", {}).get("totalCount")
+    page, anchor, position, fetched = _page_results(response), None, 0, 0
+    while True:
+        if page:
+            yield page
+        fetched += len(page)
+        if on_page is not None:
+            await on_page(fetched, total)
+        anchor = pagination.next_cursor(page, _TRANSACTION_PAGE_SIZE, key, anchor, position)
+        if anchor is None:
+            return
+        page, position = await _transactions_after(
+            fetch, anchor, _TRANSACTION_PAGE_SIZE, filters,
+        )
+
+
+# ── Background jobs ──────────────────────────────────────────────────
+
+
+def _job_progress(job: jobs.Job):
+    """Return a ``ctx.report_progress``-style callback that records into *job*."""
+    async def _report(progress, total=None, message=None):
+        job.progress = {"progress": progress, "total": total, "message": message}
+        job.touch()
+    return _report
+
+
+def _start_bulk_job(kind: str, run) -> str:
+    """Start ``run(report_progress)`` as a bulk-priority job; return the job id JSON."""
+    async def _work(job):
+        with scheduler.use(scheduler.BULK):
+            return await await_async(run(_job_progress(job)))
+
+    job = jobs.job_registry.start(kind, _work)
+    return json.dumps({"job_id": job.id, "kind": kind, "status": job.status}, indent=2)
+
+
+# ── Reference data (also published as MCP resources) ──────────────────
+
+# Reference data changes rarely; cached copies are served for this long
+_REFERENCE_TTL = 10 * 60
+
+# Digest of the last published copy of each (tenant, resource), to detect changes
+_reference_digests: Dict[Tuple[str, str], str] = {}
+
+
+def _format_accounts(accounts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a ``get_accounts`` response for display."""
+    account_list = []
+    for account in accounts.get("accounts", []):
+        account_info = {
+            "id": account.get("id"),
+            "name": account.get("displayName") or account.get("name"),
+            "type": (account.get("type") or {}).get("name"),
+            "balance": account.get("currentBalance"),
+            "institution": (account.get("institution") or {}).get("name"),
+            "is_active": account.get("isActive")
+            if "isActive" in account
+            else not account.get("deactivatedAt"),
+        }
+        account_list.append(account_info)
+    return account_list
+
+
+def _format_tags(tags: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten a ``get_transaction_tags`` response for display."""
+    tag_list = []
+    for tag in tags.get("householdTransactionTags", []):
+        tag_info = {
+            "id": tag.get("id"),
+            "name": tag.get("name"),
+            "color": tag.get("color"),
+            "order": tag.get("order"),
+            "transactionCount": tag.get("transactionCount"),
+        }
+        tag_list.append(tag_info)
+    return tag_list
+
+
+async def _fetch_accounts(client: MonarchMoney):
+    return _format_accounts(await queries.get_accounts(client))
+
+
+async def _fetch_tags(client: MonarchMoney):
+    return _format_tags(await client.get_transaction_tags())
+
+
+_REFERENCE_FETCHERS = {
+    resources.ACCOUNTS_URI: _fetch_accounts,
+    resources.CATEGORIES_URI: lambda client: client.get_transaction_categories(),
+    resources.CATEGORY_GROUPS_URI: lambda client: client.get_transaction_category_groups(),
+    resources.TAGS_URI: _fetch_tags,
+}
+
+
+def _publish_reference(uri: str, data: Any) -> None:
+    """Cache freshly fetched reference *data*; notify subscribers if it changed."""
+    digest = fingerprint(data)
+    key = (tenants.current(), uri)
+    previous = _reference_digests.get(key)
+    _reference_digests[key] = digest
+    response_cache.set(("reference", uri), data, ttl=_REFERENCE_TTL)
+    if previous is not None and previous != digest:
+        resources.subscribers.notify([uri])
+
+
+async def _reference_data(uri: str) -> Any:
+    """Return cached reference data for *uri*, fetching it on a miss."""
+    data = response_cache.get(("reference", uri))
+    if data is None:
+        client = await get_monarch_client()
+        data = await _REFERENCE_FETCHERS[uri](client)
+        _publish_reference(uri, data)
+    return data
+
+
+def _invalidate_reference(*uris: str) -> None:
+    """Drop cached reference data after a write and notify subscribers."""
+    for uri in uris:
+        response_cache.invalidate(("reference", uri))
+        _reference_digests.pop((tenants.current(), uri), None)
+    resources.subscribers.notify(uris)
+
+
+def _invalidate_tags(tags) -> None:
+    """Drop every cached entry under *tags* (see ``invalidation.TAGS``)."""
+    prefixes, uris = invalidation.entries(tags)
+    for prefix in prefixes:
+        response_cache.invalidate_prefix(prefix)
+    if uris:
+        _invalidate_reference(*uris)
+
+
+def _invalidates_dependents(func):
+    """Drop the cached data a write tool makes stale once it returns or raises.
+
+    The tags come from ``invalidation.WRITE_DEPENDENCIES`` under the
+    tool's name.  Works for both sync and async tools.
+    """
+    tags = invalidation.WRITE_DEPENDENCIES[func.__name__]
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _invalidate_tags(tags)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _invalidate_tags(tags)
+    return wrapper
+
+
 # ── Tools ──────────────────────────────────────────────────────────────
 
 @mcp.tool()
@@ -193,12 +465,15 @@ def check_auth_status() -> str:
     """Check if already authenticated with Monarch Money."""
     try:
         # Check if we have a token in the keyring
-        token = secure_session.load_token()
+        token = _tenant_session().load_token()
         if token:
             status = "Authentication token found in secure keyring storage\n"
         else:
             status = "No authentication token found in keyring\n"
 
+        if tenants.current() != tenants.DEFAULT_TENANT:
+            status += f"Tenant: {tenants.current()}\n"
+
         email = os.getenv("MONARCH_EMAIL")
         if email:
             status += f"Environment email: {email}\n"
@@ -217,7 +492,7 @@ def debug_session_loading() -> str:
     """Debug keyring session loading issues."""
     try:
         # Check keyring access
-        token = secure_session.load_token()
+        token = _tenant_session().load_token()
         if token:
             return f"Token found in keyring (length: {len(token)})"
         return "No token found in keyring. Run login_setup.py to authenticate."
@@ -229,38 +504,161 @@ def debug_session_loading() -> str:
         )
 
 
+@mcp.tool()
+def select_tenant(ctx: Context, tenant_id: str, access_token: Optional[str] = None) -> str:
+    """
+    Choose which Monarch login (tenant) this session uses.
+
+    Later calls in the session read and write that tenant's data, with its
+    own caches.  Over HTTP, an ``X-Monarch-Tenant`` header takes precedence.
+
+    Args:
+        tenant_id: A tenant listed in MONARCH_MCP_TENANTS, or "default"
+        access_token: The tenant's token from MONARCH_MCP_TENANT_TOKENS
+            (over HTTP, an ``Authorization: Bearer`` header also works)
+    """
+    try:
+        tenants.select(ctx.session, tenant_id, access_token or tenants.request_token())
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}, indent=2)
+    return json.dumps({"tenant": tenant_id}, indent=2)
+
+
 @mcp.tool()
 @_handle_mcp_errors("getting accounts")
-def get_accounts() -> str:
-    """Get all financial accounts from Monarch Money."""
+async def get_accounts() -> str:
+    """Get all financial accounts from Monarch Money.
+
+    Also published as the cached ``monarch://accounts`` resource.
+    """
 
     async def _get_accounts():
         client = await get_monarch_client()
-        return await client.get_accounts()
+        return await queries.get_accounts(client)
 
-    accounts = run_async(_get_accounts())
+    accounts = await await_async(_get_accounts())
 
-    # Format accounts for display
-    account_list = []
-    for account in accounts.get("accounts", []):
-        account_info = {
-            "id": account.get("id"),
-            "name": account.get("displayName") or account.get("name"),
-            "type": (account.get("type") or {}).get("name"),
-            "balance": account.get("currentBalance"),
-            "institution": (account.get("institution") or {}).get("name"),
-            "is_active": account.get("isActive")
-            if "isActive" in account
-            else not account.get("deactivatedAt"),
-        }
-        account_list.append(account_info)
+    account_list = _format_accounts(accounts)
+    _publish_reference(resources.ACCOUNTS_URI, account_list)
 
     return json.dumps(account_list, indent=2, default=str)
 
 
+# Fields returned per transaction by get_transactions and export_transactions
+_TRANSACTION_FIELDS = (
+    "id", "date", "amount", "original_name", "category", "account",
+    "merchant", "notes", "is_pending", "is_recurring", "tags",
+)
+
+
+def _format_transaction(txn: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a raw API transaction to the fields shown to the client."""
+    return {
+        "id": txn.get("id"),
+        "date": txn.get("date"),
+        "amount": txn.get("amount"),
+        "original_name": txn.get("plaidName"),
+        "category": txn.get("category", {}).get("name")
+        if txn.get("category")
+        else None,
+        "account": txn.get("account", {}).get("displayName"),
+        "merchant": txn.get("merchant", {}).get("name")
+        if txn.get("merchant")
+        else None,
+        "notes": txn.get("notes"),
+        "is_pending": txn.get("pending", False),
+        "is_recurring": txn.get("isRecurring", False),
+        "tags": [
+            {
+                "id": tag.get("id"),
+                "name": tag.get("name"),
+                "color": tag.get("color"),
+            }
+            for tag in txn.get("tags", [])
+        ],
+    }
+
+
+# Bounds for cursor pages and counts when the caller gave no start_date or
+# end_date (the API only accepts start and end dates together)
+_EARLIEST_TRANSACTION_DATE = "1900-01-01"
+_LATEST_TRANSACTION_DATE = "9999-12-31"
+
+
+def _page_results(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return response.get("allTransactions", {}).get("results", [])
+
+
+async def _day_transactions(fetch, **filters) -> List[Dict[str, Any]]:
+    """Return every transaction matching *filters* (one date), by offset."""
+    day: List[Dict[str, Any]] = []
+    while True:
+        page = _page_results(
+            await fetch(limit=_TRANSACTION_PAGE_SIZE, offset=len(day), **filters)
+        )
+        day += page
+        if len(page) < _TRANSACTION_PAGE_SIZE:
+            return day
+
+
+async def _transactions_after(fetch, anchor, limit: int, filters):
+    """Return up to *limit* transactions after cursor *anchor*.
+
+    *fetch* takes ``client.get_transactions`` arguments.  Requests end at
+    the anchor date, so transactions synced since the previous page cannot
+    shift it.  The anchor's row is fetched with the page and checked; if
+    rows were added or removed on that date, the day is re-read to find
+    it.  Returns the page and the anchor's current position within its
+    date.
+    """
+    bounded = {
+        **filters,
+        "start_date": filters.get("start_date") or _EARLIEST_TRANSACTION_DATE,
+        "end_date": anchor.date,
+    }
+    response = await fetch(limit=limit + 1, offset=anchor.position - 1, **bounded)
+    results = _page_results(response)
+    if results and results[0].get("id") == anchor.id:
+        return results[1:], anchor.position
+
+    # The anchor moved: re-read its whole date to locate it
+    day = await _day_transactions(
+        fetch, **{**filters, "start_date": anchor.date, "end_date": anchor.date},
+    )
+    ids = [txn.get("id") for txn in day]
+    position = ids.index(anchor.id) + 1 if anchor.id in ids else anchor.position
+    page = day[position:position + limit]
+    previous_day = (datetime.strptime(anchor.date, "%Y-%m-%d") - timedelta(days=1))
+    previous_day = previous_day.strftime("%Y-%m-%d")
+    if len(page) < limit and bounded["start_date"] <= previous_day:
+        response = await fetch(
+            limit=limit - len(page), offset=0, **{**bounded, "end_date": previous_day},
+        )
+        page += _page_results(response)
+    return page, position
+
+
+async def _rows_before_on_day(fetch, day: str, offset: int, filters) -> int:
+    """Return how many of the first *offset* transactions are dated *day*.
+
+    Results are newest first and the transaction at *offset* is dated
+    *day*, so the rows before it are either on *day* or after it; one
+    single-row query counts those after it.
+    """
+    end_date = filters.get("end_date")
+    if end_date is not None and end_date <= day:
+        return offset
+    next_day = (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    response = await fetch(limit=1, offset=0, **{
+        **filters, "start_date": next_day, "end_date": end_date or _LATEST_TRANSACTION_DATE,
+    })
+    later = response.get("allTransactions", {}).get("totalCount") or 0
+    return max(offset - later, 0)
+
+
 @mcp.tool()
 @_handle_mcp_errors("getting transactions")
-def get_transactions(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-branches
+async def get_transactions(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-branches,too-many-statements
     limit: int = 100,
     offset: int = 0,
     start_date: Optional[str] = None,
@@ -276,13 +674,19 @@ def get_transactions(  # pylint: disable=too-many-arguments,too-many-positional-
     is_split: Optional[bool] = None,
     is_recurring: Optional[bool] = None,
     synced_from_institution: Optional[bool] = None,
+    cursor: Optional[str] = None,
 ) -> str:
     """
-    Get transactions from Monarch Money.
+    Get transactions from Monarch Money, newest first.
+
+    Returns ``{"transactions": [...], "cursor": ...}``.  To get the next
+    page, call again with the same filters and the returned ``cursor``;
+    it is null on the last page.  Cursor pages stay consistent while new
+    transactions sync, unlike ``offset``.
 
     Args:
         limit: Number of transactions to retrieve (default: 100)
-        offset: Number of transactions to skip (default: 0)
+        offset: Number of transactions to skip (default: 0; not used with cursor)
         start_date: Start date in YYYY-MM-DD format (requires end_date)
         end_date: End date in YYYY-MM-DD format (requires start_date)
         account_id: Specific account ID to filter by (shorthand for account_ids with one ID)
@@ -296,6 +700,7 @@ def get_transactions(  # pylint: disable=too-many-arguments,too-many-positional-
         is_split: Filter split/unsplit transactions
         is_recurring: Filter recurring/non-recurring transactions
         synced_from_institution: Filter synced/manual transactions
+        cursor: Cursor from the previous page to continue after it
     """
     if bool(start_date) != bool(end_date):
         return json.dumps(
@@ -309,76 +714,321 @@ def get_transactions(  # pylint: disable=too-many-arguments,too-many-positional-
             indent=2,
         )
 
+    try:
+        anchor = pagination.parse_cursor(cursor, offset, limit)
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}, indent=2)
+
+    filters = {}
+    if start_date:
+        filters["start_date"] = start_date
+    if end_date:
+        filters["end_date"] = end_date
+    if account_id:
+        filters["account_ids"] = [account_id]
+    if account_ids:
+        filters["account_ids"] = account_ids
+    if search:
+        filters["search"] = search
+    if category_ids:
+        filters["category_ids"] = category_ids
+    if tag_ids:
+        filters["tag_ids"] = tag_ids
+    if has_attachments is not None:
+        filters["has_attachments"] = has_attachments
+    if has_notes is not None:
+        filters["has_notes"] = has_notes
+    if hidden_from_reports is not None:
+        filters["hidden_from_reports"] = hidden_from_reports
+    if is_split is not None:
+        filters["is_split"] = is_split
+    if is_recurring is not None:
+        filters["is_recurring"] = is_recurring
+    if synced_from_institution is not None:
+        filters["synced_from_institution"] = synced_from_institution
+    key = pagination.filters_key(filters)
+
     async def _get_transactions():
         client = await get_monarch_client()
+        if anchor is None:
+            response = await queries.get_transactions(
+                client, limit=limit, offset=offset, **filters,
+            )
+            page = response.get("allTransactions", {}).get("results", [])
+            earlier = 0
+            if offset > 0 and len(page) == limit and page[0].get("date") == page[-1].get("date"):
+                # The page's only date may begin before the offset
+                earlier = await _rows_before_on_day(
+                    functools.partial(queries.get_transactions, client),
+                    str(page[0].get("date")), offset, filters,
+                )
+            return page, pagination.next_cursor(page, limit, key, earlier=earlier)
+        if anchor.filters != key:
+            raise ValueError("Cursor was issued for different filters.")
+        page, position = await _transactions_after(
+            functools.partial(queries.get_transactions, client), anchor, limit, filters,
+        )
+        return page, pagination.next_cursor(page, limit, key, anchor, position)
 
-        filters = {}
-        if start_date:
-            filters["start_date"] = start_date
-        if end_date:
-            filters["end_date"] = end_date
-        if account_id:
-            filters["account_ids"] = [account_id]
-        if account_ids:
-            filters["account_ids"] = account_ids
-        if search:
-            filters["search"] = search
-        if category_ids:
-            filters["category_ids"] = category_ids
-        if tag_ids:
-            filters["tag_ids"] = tag_ids
-        if has_attachments is not None:
-            filters["has_attachments"] = has_attachments
-        if has_notes is not None:
-            filters["has_notes"] = has_notes
-        if hidden_from_reports is not None:
-            filters["hidden_from_reports"] = hidden_from_reports
-        if is_split is not None:
-            filters["is_split"] = is_split
-        if is_recurring is not None:
-            filters["is_recurring"] = is_recurring
-        if synced_from_institution is not None:
-            filters["synced_from_institution"] = synced_from_institution
-
-        return await client.get_transactions(limit=limit, offset=offset, **filters)
-
-    transactions = run_async(_get_transactions())
+    page_key = transaction_cache.page_key(filters, key, limit, offset, cursor)
+    cached = transaction_cache.get_page(page_key)
+    if cached is not None:
+        page, encoded_cursor = cached
+    else:
+        try:
+            page, next_cursor = await await_async(_get_transactions())
+        except ValueError as exc:
+            if anchor is None:
+                raise
+            return json.dumps({"error": str(exc)}, indent=2)
+        encoded_cursor = next_cursor.encode() if next_cursor else None
+        transaction_cache.store_page(page_key, page, encoded_cursor)
 
     # Format transactions for display
-    transaction_list = []
-    for txn in transactions.get("allTransactions", {}).get("results", []):
-        transaction_info = {
-            "id": txn.get("id"),
-            "date": txn.get("date"),
-            "amount": txn.get("amount"),
-            "original_name": txn.get("plaidName"),
-            "category": txn.get("category", {}).get("name")
-            if txn.get("category")
-            else None,
-            "account": txn.get("account", {}).get("displayName"),
-            "merchant": txn.get("merchant", {}).get("name")
-            if txn.get("merchant")
-            else None,
-            "notes": txn.get("notes"),
-            "is_pending": txn.get("pending", False),
-            "is_recurring": txn.get("isRecurring", False),
-            "tags": [
-                {
-                    "id": tag.get("id"),
-                    "name": tag.get("name"),
-                    "color": tag.get("color"),
-                }
-                for tag in txn.get("tags", [])
-            ],
+    transaction_list = [_format_transaction(txn) for txn in page]
+
+    return json.dumps(
+        {
+            "transactions": transaction_list,
+            "cursor": encoded_cursor,
+        },
+        indent=2,
+        default=str,
+    )
+
+
+@mcp.tool()
+@_handle_mcp_errors("exporting transactions")
+async def export_transactions(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    ctx: Context,
+    file_format: str = "csv",
+    output_path: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    account_ids: Optional[List[str]] = None,
+    category_ids: Optional[List[str]] = None,
+    tag_ids: Optional[List[str]] = None,
+    overwrite: bool = False,
+    background: bool = False,
+) -> str:
+    """
+    Export all matching transactions to a local CSV or NDJSON file.
+
+    Pages through every result and streams rows to disk, so memory stays
+    flat regardless of size.  Only the file path, row count and SHA-256
+    checksum are returned — not the transactions themselves.  With
+    background, returns a ``job_id`` at once; follow it with
+    ``get_job_status`` and read the summary with ``get_job_result``.
+
+    Args:
+        file_format: "csv" or "ndjson" (default: "csv")
+        output_path: Destination file, relative to or inside
+            MONARCH_MCP_EXPORT_DIR (default ~/monarch-mcp-exports); paths
+            outside it are rejected (default: a timestamped file there)
+        start_date: Start date in YYYY-MM-DD format (requires end_date)
+        end_date: End date in YYYY-MM-DD format (requires start_date)
+        account_ids: List of account IDs to filter by
+        category_ids: List of category IDs to filter by
+        tag_ids: List of tag IDs to filter by
+        overwrite: Replace output_path if it already exists (default: False)
+        background: Run as a background job (default: False)
+    """
+    if file_format not in export.FORMATS:
+        return json.dumps(
+            {"error": "file_format must be 'csv' or 'ndjson'."}, indent=2,
+        )
+    if bool(start_date) != bool(end_date):
+        return json.dumps(
+            {"error": "Both start_date and end_date are required when filtering by date."},
+            indent=2,
+        )
+    try:
+        path = export.resolve_path(
+            output_path or export.default_path("transactions", file_format),
+        )
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}, indent=2)
+    if os.path.exists(path) and not overwrite:
+        return json.dumps(
+            {"error": f"{path} already exists. Pass overwrite=true to replace it."},
+            indent=2,
+        )
+
+    filters = {}
+    if start_date:
+        filters["start_date"] = start_date
+        filters["end_date"] = end_date
+    if account_ids:
+        filters["account_ids"] = account_ids
+    if category_ids:
+        filters["category_ids"] = category_ids
+    if tag_ids:
+        filters["tag_ids"] = tag_ids
+
+    async def _export_transactions(report_progress):
+        async def _on_page(fetched, total):
+            await report_progress(fetched, total, f"Exported {fetched} transactions")
+
+        client = await get_monarch_client()
+        rows = export.iter_rows(
+            _iter_transaction_pages(client, on_page=_on_page, **filters),
+            _format_transaction,
+        )
+        return await export.write_rows(rows, path, file_format, _TRANSACTION_FIELDS)
+
+    if background:
+        return _start_bulk_job("export_transactions", _export_transactions)
+    result = await await_async(_export_transactions(ctx.report_progress))
+
+    return json.dumps(result, indent=2, default=str)
+
+
+# Days of daily balances included in a columnar export without start_date
+_BALANCE_EXPORT_DAYS = 365
+
+
+@mcp.tool()
+@_handle_mcp_errors("exporting columnar dataset")
+async def export_columnar(  # pylint: disable=too-many-locals,too-many-arguments,too-many-positional-arguments,too-many-return-statements
+    ctx: Context,
+    output_dir: Optional[str] = None,
+    file_format: str = "parquet",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    partition_by_month: bool = False,
+    overwrite: bool = False,
+    background: bool = False,
+) -> str:
+    """
+    Export transactions, accounts and daily balances as typed columnar files.
+
+    Writes zstd-compressed Parquet or Arrow IPC files with typed columns
+    (date, amount, category, tags as a list).  Transactions are written
+    one row group per page as they arrive.  With partition_by_month, the
+    transactions and balances tables use a month=YYYY-MM directory
+    layout and the date range is widened to whole months, so re-exporting
+    a range with overwrite replaces the months it covers (removing months
+    that no longer have rows) and keeps the others.  With background,
+    returns a ``job_id`` at once (see ``get_job_status``).  Requires
+    pyarrow.
+
+    Args:
+        output_dir: Destination directory, relative to or inside
+            MONARCH_MCP_EXPORT_DIR (default ~/monarch-mcp-exports); paths
+            outside it are rejected (default: a timestamped directory there)
+        file_format: "parquet" or "arrow" (default: "parquet")
+        start_date: Start date in YYYY-MM-DD format (requires end_date)
+        end_date: End date in YYYY-MM-DD format (requires start_date)
+        partition_by_month: Write one file per month (default: False)
+        overwrite: Write into output_dir even if it already holds files
+            (default: False)
+        background: Run as a background job (default: False)
+    """
+    if file_format not in columnar.FORMATS:
+        return json.dumps(
+            {"error": "file_format must be 'parquet' or 'arrow'."}, indent=2,
+        )
+    if bool(start_date) != bool(end_date):
+        return json.dumps(
+            {"error": "Both start_date and end_date are required when filtering by date."},
+            indent=2,
+        )
+    start = timeseries.parse_date(start_date)
+    end = timeseries.parse_date(end_date)
+    if start_date and (start is None or end is None):
+        return json.dumps({"error": "Dates must be in YYYY-MM-DD format."}, indent=2)
+    if start and partition_by_month:
+        start = start.replace(day=1)
+        end = end.replace(day=calendar.monthrange(end.year, end.month)[1])
+
+    try:
+        root = export.resolve_path(output_dir or export.default_path("dataset"))
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}, indent=2)
+    if os.path.isdir(root) and os.listdir(root) and not overwrite:
+        return json.dumps(
+            {"error": f"{root} already exists. Pass overwrite=true to write into it."},
+            indent=2,
+        )
+
+    filters = {"start_date": start.isoformat(), "end_date": end.isoformat()} if start else {}
+    balance_start = start or datetime.now().date() - timedelta(days=_BALANCE_EXPORT_DAYS)
+    partition = columnar.month_partition if partition_by_month else None
+    # Month partitions covered by this export; stale ones among them are removed
+    transaction_months = (
+        columnar.month_partitions(start, end).__contains__ if start else lambda _name: True
+    )
+    balance_months = columnar.month_partitions(
+        balance_start, end or datetime.now().date(),
+    ).__contains__
+
+    async def _export_columnar(report_progress):
+        async def _on_page(fetched, total):
+            await report_progress(fetched, total, f"Exported {fetched} transactions")
+
+        client = await get_monarch_client()
+        writers = {
+            "accounts": columnar.TableWriter(
+                root, "accounts", columnar.account_schema(), file_format,
+            ),
+            "transactions": columnar.TableWriter(
+                root, "transactions", columnar.transaction_schema(), file_format,
+                partition=partition, replaces=transaction_months,
+            ),
+            "balances": columnar.TableWriter(
+                root, "balances", columnar.balance_schema(), file_format,
+                partition=partition, replaces=balance_months,
+            ),
+        }
+        try:
+            await report_progress(0, None, "Exporting accounts")
+            accounts = await client.get_accounts()
+            writers["accounts"].write(
+                [columnar.account_row(a) for a in accounts.get("accounts", [])]
+            )
+            async for page in _iter_transaction_pages(
+                client, on_page=_on_page, **filters,
+            ):
+                writers["transactions"].write(
+                    [columnar.transaction_row(txn) for txn in page]
+                )
+            await report_progress(0, None, "Exporting daily balances")
+            points = await _fetch_recent_balance_points(
+                client, balance_start.isoformat(), balance_start,
+            )
+            writers["balances"].write(
+                columnar.balance_rows(timeseries.slice_points(points, None, end))
+            )
+            files = [f for writer in writers.values() for f in writer.close()]
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+
+        rows: Dict[str, int] = {}
+        for info in files:
+            rows[info["table"]] = rows.get(info["table"], 0) + info["rows"]
+        return {
+            "output_dir": os.path.abspath(root),
+            "format": file_format,
+            "rows": rows,
+            "files": files,
         }
-        transaction_list.append(transaction_info)
 
-    return json.dumps(transaction_list, indent=2, default=str)
+    if background:
+        return _start_bulk_job("export_columnar", _export_columnar)
+    result = await await_async(_export_columnar(ctx.report_progress))
+
+    return json.dumps(result, indent=2, default=str)
+
+
+# Budgets are cached until a write that changes them (see invalidation.py)
+_BUDGETS_TTL = 30 * 60
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting budgets")
-def get_budgets(
+async def get_budgets(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     use_v2_goals: bool = True,
@@ -386,6 +1036,8 @@ def get_budgets(
     """
     Get budget information from Monarch Money.
 
+    Large results are split into chunks; see ``get_continuation``.
+
     Args:
         start_date: Start date in YYYY-MM-DD format (default: last month)
         end_date: End date in YYYY-MM-DD format (default: next month)
@@ -406,19 +1058,25 @@ def get_budgets(
             filters["end_date"] = end_date
         return await client.get_budgets(use_v2_goals=use_v2_goals, **filters)
 
-    budgets = run_async(_get_budgets())
+    key = ("budgets", start_date, end_date, use_v2_goals)
+    budgets = response_cache.get(key)
+    if budgets is None:
+        budgets = await await_async(_get_budgets())
+        response_cache.set(key, budgets, ttl=_BUDGETS_TTL)
 
-    return json.dumps(budgets, indent=2, default=str)
+    return continuation.paginate(await offload.dumps(budgets, indent=2, default=str))
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting cashflow")
-def get_cashflow(
+async def get_cashflow(
     start_date: Optional[str] = None, end_date: Optional[str] = None
 ) -> str:
     """
     Get cashflow analysis from Monarch Money.
 
+    Large results are split into chunks; see ``get_continuation``.
+
     Args:
         start_date: Start date in YYYY-MM-DD format (requires end_date; defaults to current month)
         end_date: End date in YYYY-MM-DD format (requires start_date; defaults to current month)
@@ -440,14 +1098,14 @@ def get_cashflow(
 
         return await client.get_cashflow(**filters)
 
-    cashflow = run_async(_get_cashflow())
+    cashflow = await await_async(_get_cashflow())
 
-    return json.dumps(cashflow, indent=2, default=str)
+    return continuation.paginate(await offload.dumps(cashflow, indent=2, default=str))
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting account holdings")
-def get_account_holdings(account_id: str) -> str:
+async def get_account_holdings(account_id: str) -> str:
     """
     Get investment holdings for a specific account.
 
@@ -457,16 +1115,166 @@ def get_account_holdings(account_id: str) -> str:
 
     async def _get_holdings():
         client = await get_monarch_client()
-        return await client.get_account_holdings(account_id)
+        return await _fetch_account_holdings(client, account_id)
 
-    holdings = run_async(_get_holdings())
+    holdings = await await_async(_get_holdings())
 
     return json.dumps(holdings, indent=2, default=str)
 
 
+# Holdings are cached briefly per account; prices move during the day
+_HOLDINGS_TTL = 120
+# Maximum concurrent holdings requests when scanning a whole portfolio
+_HOLDINGS_CONCURRENCY = 4
+
+
+async def _fetch_account_holdings(client: MonarchMoney, account_id: str):
+    """Return holdings for one account, served from cache when fresh."""
+    key = ("account_holdings", account_id)
+    holdings = response_cache.get(key)
+    if holdings is None:
+        holdings = await client.get_account_holdings(account_id)
+        response_cache.set(key, holdings, ttl=_HOLDINGS_TTL)
+    return holdings
+
+
+@mcp.tool()
+@_handle_mcp_errors("getting portfolio holdings")
+async def get_portfolio_holdings(ctx: Context) -> str:
+    """
+    Get holdings across all investment accounts in a single call.
+
+    Investment accounts are discovered automatically and their holdings
+    are fetched concurrently.  Positions are merged by security (total
+    quantity, value, cost basis and a per-account breakdown), and
+    allocation is reported by asset class.  Progress is reported as each
+    account completes.
+    """
+
+    async def _get_portfolio_holdings():
+        client = await get_monarch_client()
+        accounts = await client.get_accounts()
+        investment_accounts = [
+            account for account in accounts.get("accounts", [])
+            if account.get("id") and portfolio.is_investment_account(account)
+        ]
+        semaphore = asyncio.Semaphore(_HOLDINGS_CONCURRENCY)
+        total = len(investment_accounts)
+        done = 0
+
+        async def _fetch(account):
+            nonlocal done
+            try:
+                async with semaphore:
+                    return await _fetch_account_holdings(client, account["id"])
+            finally:
+                done += 1
+                await ctx.report_progress(
+                    done, total, f"Fetched holdings for {done}/{total} accounts",
+                )
+
+        results = await asyncio.gather(
+            *(_fetch(account) for account in investment_accounts),
+            return_exceptions=True,
+        )
+        return list(zip(investment_accounts, results))
+
+    fetched = await await_async(_get_portfolio_holdings())
+
+    errors = []
+    holdings = []
+    for account, result in fetched:
+        if isinstance(result, Exception):
+            logger.error(
+                "Failed to get holdings for account %s: %s", account["id"], result,
+            )
+            errors.append({"account_id": account["id"], "error": str(result)})
+        else:
+            holdings.append((account, result))
+
+    result = await offload.run(portfolio.aggregate_holdings, holdings)
+    if errors:
+        result["errors"] = errors
+
+    return await offload.dumps(result, indent=2, default=str)
+
+
+# Transaction field each update_transaction argument writes
+_UPDATE_TRANSACTION_FIELDS = {
+    "category_id": "category",
+    "merchant_name": "merchant",
+    "goal_id": "goal",
+    "amount": "amount",
+    "date": "date",
+    "hide_from_reports": "hideFromReports",
+    "needs_review": "needsReview",
+    "notes": "notes",
+}
+
+
+def _resolve_references(
+    transaction: Dict[str, Any], fields: List[str],
+) -> Optional[Dict[str, Any]]:
+    """Name the category and tags a mutation returned as bare ids.
+
+    Names come from cached reference data only; returns None if any is
+    not cached, so the caller drops its copies instead of guessing.  A
+    category or tags the write did not change (not in *fields*) are left
+    as cached.
+    """
+    changes = dict(transaction)
+    for field in ("category", "tags"):
+        if field not in fields:
+            changes.pop(field, None)
+    category = changes.get("category")
+    if isinstance(category, dict) and "name" not in category:
+        known = (response_cache.get(("reference", resources.CATEGORIES_URI)) or {})
+        match = next(
+            (item for item in known.get("categories", []) if item.get("id") == category.get("id")),
+            None,
+        )
+        if match is None:
+            return None
+        changes["category"] = {**category, "name": match.get("name")}
+    if isinstance(changes.get("tags"), list):
+        known = {
+            tag.get("id"): tag
+            for tag in response_cache.get(("reference", resources.TAGS_URI)) or []
+        }
+        if any(tag.get("id") not in known for tag in changes["tags"]):
+            return None
+        changes["tags"] = [
+            {**tag, "name": known[tag["id"]].get("name"), "color": known[tag["id"]].get("color")}
+            for tag in changes["tags"]
+        ]
+    return changes
+
+
+async def _write_through(transaction_id: str, fields: List[str], mutation: str, write) -> Any:
+    """Run the *write* coroutine and apply its result to cached reads.
+
+    The transaction returned under *mutation* is patched into the cached
+    copies of *transaction_id*; if the write fails, they are dropped.
+    """
+    try:
+        result = await await_async(write)
+    except Exception:
+        transaction_cache.patch(transaction_id, None, fields)
+        raise
+    payload = (result.get(mutation) if isinstance(result, dict) else None) or {}
+    transaction = payload.get("transaction")
+    changes = None
+    if isinstance(transaction, dict) and not payload.get("errors"):
+        changes = _resolve_references(transaction, fields)
+    transaction_cache.patch(transaction_id, changes, fields)
+    return result
+
+
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("creating transaction")
-def create_transaction(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+@_invalidates_dependents
+@idempotency.idempotent
+async def create_transaction(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     account_id: str,
     amount: float,
     merchant_name: str,
@@ -474,6 +1282,7 @@ def create_transaction(  # pylint: disable=too-many-arguments,too-many-positiona
     date: str,
     notes: Optional[str] = None,
     update_balance: bool = False,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
 ) -> str:
     """
     Create a new transaction in Monarch Money.
@@ -486,6 +1295,8 @@ def create_transaction(  # pylint: disable=too-many-arguments,too-many-positiona
         date: Transaction date in YYYY-MM-DD format
         notes: Optional transaction notes
         update_balance: Whether to update the account balance (default: False)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _create_transaction():
@@ -500,144 +1311,539 @@ def create_transaction(  # pylint: disable=too-many-arguments,too-many-positiona
             update_balance=update_balance,
         )
 
-    result = run_async(_create_transaction())
+    try:
+        result = await await_async(_create_transaction())
+    finally:
+        if update_balance:
+            _invalidate_tags(invalidation.BALANCE_UPDATE_DEPENDENCIES)
+            _account_history_store.invalidate(account_id)
+
+    return json.dumps(result, indent=2, default=str)
+
+
+@mcp.tool(enabled=_WRITE_ENABLED)
+@_handle_mcp_errors("updating transaction")
+@_invalidates_dependents
+@idempotency.idempotent
+async def update_transaction(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    transaction_id: str,
+    category_id: Optional[str] = None,
+    merchant_name: Optional[str] = None,
+    goal_id: Optional[str] = None,
+    amount: Optional[float] = None,
+    date: Optional[str] = None,
+    hide_from_reports: Optional[bool] = None,
+    needs_review: Optional[bool] = None,
+    notes: Optional[str] = None,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
+    """
+    Update an existing transaction in Monarch Money.
+
+    Args:
+        transaction_id: The ID of the transaction to update
+        category_id: New category ID
+        merchant_name: New merchant name
+        goal_id: Goal ID to associate with the transaction
+        amount: New transaction amount
+        date: New transaction date in YYYY-MM-DD format
+        hide_from_reports: Whether to hide the transaction from reports
+        needs_review: Whether the transaction needs review
+        notes: Transaction notes
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
+    """
+
+    update_data = {"transaction_id": transaction_id}
+
+    if category_id is not None:
+        update_data["category_id"] = category_id
+    if merchant_name is not None:
+        update_data["merchant_name"] = merchant_name
+    if goal_id is not None:
+        update_data["goal_id"] = goal_id
+    if amount is not None:
+        update_data["amount"] = amount
+    if date is not None:
+        update_data["date"] = date
+    if hide_from_reports is not None:
+        update_data["hide_from_reports"] = hide_from_reports
+    if needs_review is not None:
+        update_data["needs_review"] = needs_review
+    if notes is not None:
+        update_data["notes"] = notes
+
+    async def _update_transaction():
+        client = await get_monarch_client()
+        return await client.update_transaction(**update_data)
+
+    fields = [_UPDATE_TRANSACTION_FIELDS[arg] for arg in update_data if arg != "transaction_id"]
+    # A new amount or date moves the account's balance history
+    moves_history = amount is not None or date is not None
+    account_id = transaction_cache.account_id(transaction_id) if moves_history else None
+    try:
+        result = await _write_through(
+            transaction_id, fields, "updateTransaction", _update_transaction(),
+        )
+    finally:
+        if moves_history:
+            _forget_account_history(account_id)
+
+    return json.dumps(result, indent=2, default=str)
+
+
+@mcp.tool(enabled=_WRITE_ENABLED)
+@_handle_mcp_errors("deleting transaction")
+@_invalidates_dependents
+@idempotency.idempotent
+async def delete_transaction(
+    transaction_id: str,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
+    """
+    Delete a transaction from Monarch Money.
+
+    Args:
+        transaction_id: The ID of the transaction to delete
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
+    """
+
+    async def _delete_transaction():
+        client = await get_monarch_client()
+        return await client.delete_transaction(transaction_id)
+
+    account_id = transaction_cache.account_id(transaction_id)
+    try:
+        await await_async(_delete_transaction())
+    finally:
+        _forget_account_history(account_id)
+    transaction_cache.forget(transaction_id)
+
+    return json.dumps({"deleted": True, "transaction_id": transaction_id}, indent=2)
+
+
+# Maximum concurrent attachment uploads
+_ATTACHMENT_CONCURRENCY = 4
+
+
+@mcp.tool(enabled=_WRITE_ENABLED)
+@_handle_mcp_errors("uploading attachments")
+@_invalidates_dependents
+@idempotency.idempotent
+async def upload_attachments(  # pylint: disable=too-many-locals
+    ctx: Context, items: List[Dict[str, str]], background: bool = False,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
+    """
+    Attach local files (receipts, PDFs, images) to transactions.
+
+    Files are read from disk in chunks as they are sent, so large files
+    are never loaded whole, and several uploads run at once.  Each item
+    succeeds or fails on its own; results are returned in input order.
+    With background, returns a ``job_id`` at once (see ``get_job_status``).
+
+    Args:
+        items: List of {"transaction_id": "...", "path": "receipt.pdf"}; each
+            path is relative to or inside MONARCH_MCP_IMPORT_DIR (default
+            ~/monarch-mcp-imports), and paths outside it are rejected
+        background: Run as a background job (default: False)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
+    """
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    pending = []
+    import_root = paths.import_dir()
+    for index, item in enumerate(items):
+        transaction_id = (item or {}).get("transaction_id")
+        path = (item or {}).get("path") or ""
+        results[index] = {"transaction_id": transaction_id, "path": path}
+        if not transaction_id or not path:
+            results[index]["error"] = "Each item needs transaction_id and path."
+            continue
+        try:
+            path = results[index]["path"] = paths.confine(path, import_root)
+        except ValueError as exc:
+            results[index]["error"] = str(exc)
+            continue
+        if not os.path.isfile(path):
+            results[index]["error"] = f"File not found: {path}"
+        else:
+            pending.append(index)
+
+    total = len(pending)
+    done = 0
+    semaphore = asyncio.Semaphore(_ATTACHMENT_CONCURRENCY)
+
+    async def _upload_one(client, index, report_progress):
+        nonlocal done
+        result = results[index]
+        try:
+            async with semaphore:
+                # aiohttp streams file objects in chunks from a worker thread
+                with open(result["path"], "rb") as fh:
+                    result["bytes"] = os.fstat(fh.fileno()).st_size
+                    result["attachment"] = await client.upload_attachment(
+                        result["transaction_id"], fh, os.path.basename(result["path"]),
+                    )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if is_auth_error(exc):
+                raise
+            logger.error("Failed to attach %s: %s", result["path"], exc)
+            result["error"] = str(exc)
+        finally:
+            transaction_cache.patch(result["transaction_id"], None, ["attachments"])
+            done += 1
+            await report_progress(done, total, f"Uploaded {done}/{total} attachments")
+
+    async def _upload_attachments(report_progress):
+        if pending:
+            client = await get_monarch_client()
+            await asyncio.gather(
+                *(_upload_one(client, index, report_progress) for index in pending)
+            )
+        failed = sum(1 for result in results if "error" in result)
+        return {"uploaded": len(results) - failed, "failed": failed, "results": results}
+
+    if background:
+        return _start_bulk_job("upload_attachments", _upload_attachments)
+    summary = await await_async(_upload_attachments(ctx.report_progress))
+
+    return json.dumps(summary, indent=2, default=str)
+
+
+# Repeat refresh requests for an account within this window are skipped,
+# so retry loops don't hammer Monarch and the linked institutions.
+_REFRESH_DEBOUNCE = 5 * 60
+
+
+async def _resolve_refresh_ids(
+    account_ids: Optional[List[str]], institution: Optional[str],
+) -> List[str]:
+    """Return the accounts to refresh, using the cached account list."""
+    if account_ids:
+        return list(dict.fromkeys(account_ids))
+    accounts = await _reference_data(resources.ACCOUNTS_URI)
+    if institution:
+        needle = institution.casefold()
+        accounts = [
+            account for account in accounts
+            if needle in (account.get("institution") or "").casefold()
+        ]
+    return [account["id"] for account in accounts if account.get("id")]
+
+
+def _split_debounced(account_ids: List[str], force: bool) -> Tuple[List[str], List[str]]:
+    """Split *account_ids* into (to request, refreshed within the window)."""
+    if force:
+        return list(account_ids), []
+    due, debounced = [], []
+    for account_id in account_ids:
+        if ("refresh_requested", account_id) in response_cache:
+            debounced.append(account_id)
+        else:
+            due.append(account_id)
+    return due, debounced
+
+
+def _record_refresh(account_ids: List[str]) -> None:
+    """Remember that a refresh was just requested for *account_ids*."""
+    for account_id in account_ids:
+        response_cache.set(("refresh_requested", account_id), True, ttl=_REFRESH_DEBOUNCE)
+
+
+@mcp.tool()
+@_handle_mcp_errors("refreshing accounts")
+async def refresh_accounts(
+    ctx: Context,
+    account_ids: Optional[List[str]] = None,
+    institution: Optional[str] = None,
+    force: bool = False,
+) -> str:
+    """
+    Request account data refresh from financial institutions.
+
+    Accounts refreshed in the last 5 minutes are skipped (listed under
+    ``debounced``) unless ``force`` is set.
+
+    Args:
+        account_ids: Accounts to refresh (default: all accounts)
+        institution: Only refresh accounts whose institution name contains this text
+        force: Refresh even accounts that were refreshed recently
+    """
+    if account_ids and institution:
+        return json.dumps(
+            {"error": "Pass account_ids or institution, not both."}, indent=2,
+        )
+
+    async def _refresh_accounts():
+        await ctx.report_progress(0, 2, "Listing accounts")
+        ids = await _resolve_refresh_ids(account_ids, institution)
+        if not ids:
+            return {"error": "No accounts found to refresh."}
+        due, debounced = _split_debounced(ids, force)
+        result = None
+        if due:
+            await ctx.report_progress(1, 2, f"Requesting refresh of {len(due)} accounts")
+            client = await get_monarch_client()
+            result = await client.request_accounts_refresh(due)
+            _record_refresh(due)
+        await ctx.report_progress(2, 2, f"Refresh requested for {len(due)} accounts")
+        return {"requested": due, "debounced": debounced, "result": result}
+
+    result = await await_async(_refresh_accounts())
+
+    return json.dumps(result, indent=2, default=str)
+
+
+# Adaptive polling for refresh jobs: start fast, back off while nothing
+# changes, and drop back to the fastest rate whenever an account finishes.
+_REFRESH_POLL_MIN = 2.0
+_REFRESH_POLL_MAX = 30.0
+_REFRESH_POLL_BACKOFF = 1.5
+_REFRESH_TIMEOUT = 300
+
+# Same per-account sync status query the library's is_accounts_refresh_complete
+# uses; that method only returns one bool for all accounts.
+_REFRESH_STATUS_QUERY = documents.define(
+    "ForceRefreshAccountsQuery",
+    """
+    query ForceRefreshAccountsQuery {
+        accounts {
+            id
+            hasSyncInProgress
+            __typename
+        }
+    }
+    """
+)
+
+
+def _invalidate_account_data(account_ids: List[str]) -> None:
+    """Drop cached balances, holdings and transaction-derived results."""
+    for account_id in account_ids:
+        _account_history_store.invalidate(account_id)
+        response_cache.invalidate(("account_holdings", account_id))
+    _invalidate_tags(invalidation.WRITE_DEPENDENCIES["start_accounts_refresh"])
+
+
+async def _poll_refresh(client: MonarchMoney, job: jobs.Job, timeout: float):
+    """Poll per-account sync status until every account is done or *timeout*."""
+    accounts = job.progress["accounts"]
+    deadline = asyncio.get_running_loop().time() + timeout
+    delay = _REFRESH_POLL_MIN
+    while True:
+        await asyncio.sleep(delay)
+        with scheduler.use(scheduler.BACKGROUND):
+            response = await documents.execute(client, _REFRESH_STATUS_QUERY)
+        syncing = {
+            account["id"]: account.get("hasSyncInProgress", False)
+            for account in response.get("accounts", [])
+        }
+        newly_done = 0
+        for account in accounts:
+            # An account missing from the response has not been seen to finish
+            if account["status"] == "syncing" and not syncing.get(account["id"], True):
+                account["status"] = "done"
+                newly_done += 1
+        job.progress["done"] = sum(1 for a in accounts if a["status"] == "done")
+        job.touch()
+
+        if job.progress["done"] == len(accounts):
+            break
+        if asyncio.get_running_loop().time() + delay > deadline:
+            job.status = "timed_out"
+            break
+        delay = _REFRESH_POLL_MIN if newly_done else min(
+            delay * _REFRESH_POLL_BACKOFF, _REFRESH_POLL_MAX,
+        )
 
-    return json.dumps(result, indent=2, default=str)
+    finished = [a["id"] for a in accounts if a["status"] == "done"]
+    if finished:
+        _invalidate_account_data(finished)
+    return {"refreshed": len(finished), "pending": len(accounts) - len(finished)}
 
 
-@mcp.tool(enabled=_WRITE_ENABLED)
-@_handle_mcp_errors("updating transaction")
-def update_transaction(  # pylint: disable=too-many-arguments,too-many-positional-arguments
-    transaction_id: str,
-    category_id: Optional[str] = None,
-    merchant_name: Optional[str] = None,
-    goal_id: Optional[str] = None,
-    amount: Optional[float] = None,
-    date: Optional[str] = None,
-    hide_from_reports: Optional[bool] = None,
-    needs_review: Optional[bool] = None,
-    notes: Optional[str] = None,
+@mcp.tool()
+@_handle_mcp_errors("starting account refresh")
+async def start_accounts_refresh(
+    account_ids: Optional[List[str]] = None,
+    institution: Optional[str] = None,
+    timeout_seconds: float = _REFRESH_TIMEOUT,
 ) -> str:
     """
-    Update an existing transaction in Monarch Money.
+    Refresh accounts and track completion in the background.
+
+    Returns a ``job_id`` immediately; call ``get_refresh_status`` with it to
+    see per-account progress.  When accounts finish syncing, cached
+    balances and transaction-derived results for them are discarded.
+    Accounts refreshed in the last 5 minutes are tracked but not
+    requested again.
 
     Args:
-        transaction_id: The ID of the transaction to update
-        category_id: New category ID
-        merchant_name: New merchant name
-        goal_id: Goal ID to associate with the transaction
-        amount: New transaction amount
-        date: New transaction date in YYYY-MM-DD format
-        hide_from_reports: Whether to hide the transaction from reports
-        needs_review: Whether the transaction needs review
-        notes: Transaction notes
+        account_ids: Accounts to refresh (default: all accounts)
+        institution: Only refresh accounts whose institution name contains this text
+        timeout_seconds: Stop waiting after this many seconds (default: 300)
     """
+    if timeout_seconds <= 0:
+        return json.dumps({"error": "timeout_seconds must be positive."}, indent=2)
+    if account_ids and institution:
+        return json.dumps(
+            {"error": "Pass account_ids or institution, not both."}, indent=2,
+        )
 
-    async def _update_transaction():
+    async def _start_refresh():
         client = await get_monarch_client()
+        ids = await _resolve_refresh_ids(account_ids, institution)
+        names = {
+            account["id"]: account.get("name")
+            for account in await _reference_data(resources.ACCOUNTS_URI)
+        }
+        due, _debounced = _split_debounced(ids, force=False)
+        if due:
+            await client.request_accounts_refresh(due)
+            _record_refresh(due)
+        return client, ids, names
+
+    client, ids, names = await await_async(_start_refresh())
+    if not ids:
+        return json.dumps({"error": "No accounts found to refresh."}, indent=2)
+
+    async def _wait(job):
+        job.progress = {
+            "total": len(ids),
+            "done": 0,
+            "accounts": [
+                {"id": account_id, "name": names.get(account_id), "status": "syncing"}
+                for account_id in ids
+            ],
+        }
+        return await await_async(_poll_refresh(client, job, timeout_seconds))
 
-        update_data = {"transaction_id": transaction_id}
+    job = jobs.job_registry.start("account_refresh", _wait)
 
-        if category_id is not None:
-            update_data["category_id"] = category_id
-        if merchant_name is not None:
-            update_data["merchant_name"] = merchant_name
-        if goal_id is not None:
-            update_data["goal_id"] = goal_id
-        if amount is not None:
-            update_data["amount"] = amount
-        if date is not None:
-            update_data["date"] = date
-        if hide_from_reports is not None:
-            update_data["hide_from_reports"] = hide_from_reports
-        if needs_review is not None:
-            update_data["needs_review"] = needs_review
-        if notes is not None:
-            update_data["notes"] = notes
+    return json.dumps(
+        {"job_id": job.id, "status": job.status, "account_ids": ids}, indent=2,
+    )
 
-        return await client.update_transaction(**update_data)
 
-    result = run_async(_update_transaction())
+@mcp.tool()
+def get_refresh_status(job_id: str) -> str:
+    """
+    Get the progress of a refresh started with ``start_accounts_refresh``.
+
+    Status is ``running``, ``completed``, ``timed_out`` or ``failed``;
+    ``progress.accounts`` lists each account as ``syncing`` or ``done``.
 
-    return json.dumps(result, indent=2, default=str)
+    Args:
+        job_id: The job id returned by start_accounts_refresh
+    """
+    job = jobs.job_registry.get(job_id)
+    if job is None or job.kind != "account_refresh":
+        return json.dumps({"error": f"Unknown refresh job: {job_id}"}, indent=2)
+    return json.dumps(job.to_dict(), indent=2, default=str)
 
 
-@mcp.tool(enabled=_WRITE_ENABLED)
-@_handle_mcp_errors("deleting transaction")
-def delete_transaction(transaction_id: str) -> str:
+@mcp.tool()
+def get_job_status(job_id: str) -> str:
     """
-    Delete a transaction from Monarch Money.
+    Get the status and progress of a background job.
+
+    Status is ``queued``, ``running``, ``completed``, ``failed`` or
+    ``cancelled`` (refresh jobs may also end ``timed_out``).  Once the job
+    has finished, call ``get_job_result`` for its result.
 
     Args:
-        transaction_id: The ID of the transaction to delete
+        job_id: The job id returned by the tool that started the job
     """
+    job = jobs.job_registry.get(job_id)
+    if job is None:
+        return json.dumps({"error": f"Unknown job: {job_id}"}, indent=2)
+    status = job.to_dict()
+    del status["result"]
+    return json.dumps(status, indent=2, default=str)
 
-    async def _delete_transaction():
-        client = await get_monarch_client()
-        return await client.delete_transaction(transaction_id)
 
-    run_async(_delete_transaction())
+@mcp.tool()
+def get_job_result(job_id: str) -> str:
+    """
+    Get the result of a finished background job.
 
-    return json.dumps({"deleted": True, "transaction_id": transaction_id}, indent=2)
+    Args:
+        job_id: The job id returned by the tool that started the job
+    """
+    job = jobs.job_registry.get(job_id)
+    if job is None:
+        return json.dumps({"error": f"Unknown job: {job_id}"}, indent=2)
+    if not job.done:
+        return json.dumps(
+            {"error": f"Job {job_id} is still {job.status}; check get_job_status."},
+            indent=2,
+        )
+    if job.status in (jobs.FAILED, jobs.CANCELLED):
+        return json.dumps(
+            {"job_id": job.id, "status": job.status, "error": job.error}, indent=2,
+        )
+    return continuation.paginate(json.dumps(
+        {"job_id": job.id, "status": job.status, "result": job.result},
+        indent=2,
+        default=str,
+    ))
 
 
 @mcp.tool()
-@_handle_mcp_errors("refreshing accounts")
-def refresh_accounts() -> str:
-    """Request account data refresh from financial institutions."""
-
-    async def _refresh_accounts():
-        client = await get_monarch_client()
-        accounts = await client.get_accounts()
-        account_ids = [
-            account["id"]
-            for account in accounts.get("accounts", [])
-            if account.get("id")
-        ]
-        if not account_ids:
-            return {"error": "No accounts found to refresh."}
-        return await client.request_accounts_refresh(account_ids)
+def cancel_job(job_id: str) -> str:
+    """
+    Cancel a queued or running background job.
 
-    result = run_async(_refresh_accounts())
+    A cancelled export removes its partly written files; attachments
+    uploaded before the cancel stay attached.
 
-    return json.dumps(result, indent=2, default=str)
+    Args:
+        job_id: The job id returned by the tool that started the job
+    """
+    job = jobs.job_registry.cancel(job_id)
+    if job is None:
+        return json.dumps({"error": f"Unknown job: {job_id}"}, indent=2)
+    return json.dumps({"job_id": job.id, "status": job.status}, indent=2)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting transaction tags")
-def get_transaction_tags() -> str:
-    """Get all transaction tags from Monarch Money."""
+async def get_transaction_tags() -> str:
+    """Get all transaction tags from Monarch Money.
+
+    Also published as the cached ``monarch://tags`` resource.
+    """
 
     async def _get_transaction_tags():
         client = await get_monarch_client()
         return await client.get_transaction_tags()
 
-    tags = run_async(_get_transaction_tags())
+    tags = await await_async(_get_transaction_tags())
 
-    # Format tags for display
-    tag_list = []
-    for tag in tags.get("householdTransactionTags", []):
-        tag_info = {
-            "id": tag.get("id"),
-            "name": tag.get("name"),
-            "color": tag.get("color"),
-            "order": tag.get("order"),
-            "transactionCount": tag.get("transactionCount"),
-        }
-        tag_list.append(tag_info)
+    tag_list = _format_tags(tags)
+    _publish_reference(resources.TAGS_URI, tag_list)
 
     return json.dumps(tag_list, indent=2, default=str)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("creating transaction tag")
-def create_transaction_tag(name: str, color: str) -> str:
+@_invalidates_dependents
+@idempotency.idempotent
+async def create_transaction_tag(
+    name: str, color: str,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
     """
     Create a new transaction tag in Monarch Money.
 
     Args:
         name: Tag name (required)
         color: Hex RGB color including # (required, e.g., "#19D2A5")
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
     # Validate color format
     if not re.match(r"^#[0-9A-Fa-f]{6}$", color):
@@ -656,53 +1862,67 @@ def create_transaction_tag(name: str, color: str) -> str:
         client = await get_monarch_client()
         return await client.create_transaction_tag(name, color)
 
-    result = run_async(_create_transaction_tag())
+    result = await await_async(_create_transaction_tag())
 
     return json.dumps(result, indent=2, default=str)
 
 
+# The library has no delete-tag method
+_DELETE_TAG_MUTATION = documents.define(
+    "Common_DeleteTransactionTag",
+    """
+    mutation Common_DeleteTransactionTag($tagId: ID!) {
+        deleteTransactionTag(tagId: $tagId) {
+            __typename
+        }
+    }
+    """
+)
+
+
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("deleting transaction tag")
-def delete_transaction_tag(tag_id: str) -> str:
+@_invalidates_dependents
+@idempotency.idempotent
+async def delete_transaction_tag(
+    tag_id: str,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
     """
     Delete a transaction tag from Monarch Money.
 
     Args:
         tag_id: The ID of the tag to delete
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _delete_transaction_tag():
         client = await get_monarch_client()
-        mutation = gql(
-            """
-            mutation Common_DeleteTransactionTag($tagId: ID!) {
-                deleteTransactionTag(tagId: $tagId) {
-                    __typename
-                }
-            }
-            """
-        )
-        variables = {"tagId": tag_id}
-        return await client.gql_call(
-            operation="Common_DeleteTransactionTag",
-            graphql_query=mutation,
-            variables=variables,
-        )
+        return await documents.execute(client, _DELETE_TAG_MUTATION, {"tagId": tag_id})
 
-    run_async(_delete_transaction_tag())
+    await await_async(_delete_transaction_tag())
 
     return json.dumps({"deleted": True, "tag_id": tag_id}, indent=2)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("setting transaction tags")
-def set_transaction_tags(transaction_id: str, tag_ids: List[str]) -> str:
+@_invalidates_dependents
+@idempotency.idempotent
+async def set_transaction_tags(
+    transaction_id: str,
+    tag_ids: List[str],
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
     """
     Set tags on a transaction (replaces existing tags).
 
     Args:
         transaction_id: Transaction UUID (required)
         tag_ids: List of tag IDs to apply (required, empty list removes all tags)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
 
     Note: This overwrites existing tags. To remove all tags, pass an empty list.
     """
@@ -711,7 +1931,9 @@ def set_transaction_tags(transaction_id: str, tag_ids: List[str]) -> str:
         client = await get_monarch_client()
         return await client.set_transaction_tags(transaction_id, tag_ids)
 
-    result = run_async(_set_transaction_tags())
+    result = await _write_through(
+        transaction_id, ["tags"], "setTransactionTags", _set_transaction_tags(),
+    )
 
     return json.dumps(result, indent=2, default=str)
 
@@ -721,35 +1943,43 @@ def set_transaction_tags(transaction_id: str, tag_ids: List[str]) -> str:
 
 @mcp.tool()
 @_handle_mcp_errors("getting transaction categories")
-def get_transaction_categories() -> str:
-    """Get all transaction categories from Monarch Money."""
+async def get_transaction_categories() -> str:
+    """Get all transaction categories from Monarch Money.
+
+    Also published as the cached ``monarch://categories`` resource.
+    """
 
     async def _get_transaction_categories():
         client = await get_monarch_client()
         return await client.get_transaction_categories()
 
-    categories = run_async(_get_transaction_categories())
+    categories = await await_async(_get_transaction_categories())
+    _publish_reference(resources.CATEGORIES_URI, categories)
 
     return json.dumps(categories, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting transaction category groups")
-def get_transaction_category_groups() -> str:
-    """Get all transaction category groups from Monarch Money."""
+async def get_transaction_category_groups() -> str:
+    """Get all transaction category groups from Monarch Money.
+
+    Also published as the cached ``monarch://category-groups`` resource.
+    """
 
     async def _get_transaction_category_groups():
         client = await get_monarch_client()
         return await client.get_transaction_category_groups()
 
-    groups = run_async(_get_transaction_category_groups())
+    groups = await await_async(_get_transaction_category_groups())
+    _publish_reference(resources.CATEGORY_GROUPS_URI, groups)
 
     return json.dumps(groups, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting transaction details")
-def get_transaction_details(
+async def get_transaction_details(
     transaction_id: str,
     redirect_posted: bool = True,
 ) -> str:
@@ -767,20 +1997,26 @@ def get_transaction_details(
             transaction_id, redirect_posted=redirect_posted,
         )
 
-    details = run_async(_get_transaction_details())
+    key = transaction_cache.details_key(transaction_id, redirect_posted)
+    details = response_cache.get(key)
+    if details is None:
+        details = await await_async(_get_transaction_details())
+        response_cache.set(key, details, ttl=transaction_cache.TRANSACTION_TTL)
 
     return json.dumps(details, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting recurring transactions")
-def get_recurring_transactions(
+async def get_recurring_transactions(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
 ) -> str:
     """
     Get recurring transactions from Monarch Money.
 
+    Large results are split into chunks; see ``get_continuation``.
+
     Args:
         start_date: Start date in YYYY-MM-DD format (requires end_date)
         end_date: End date in YYYY-MM-DD format (requires start_date)
@@ -800,56 +2036,56 @@ def get_recurring_transactions(
             filters["end_date"] = end_date
         return await client.get_recurring_transactions(**filters)
 
-    result = run_async(_get_recurring_transactions())
+    result = await await_async(_get_recurring_transactions())
 
-    return json.dumps(result, indent=2, default=str)
+    return continuation.paginate(json.dumps(result, indent=2, default=str))
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting transactions summary")
-def get_transactions_summary() -> str:
+async def get_transactions_summary() -> str:
     """Get aggregate transaction summary (count, sum, avg, max, income, expenses)."""
 
     async def _get_transactions_summary():
         client = await get_monarch_client()
         return await client.get_transactions_summary()
 
-    summary = run_async(_get_transactions_summary())
+    summary = await await_async(_get_transactions_summary())
 
     return json.dumps(summary, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting subscription details")
-def get_subscription_details() -> str:
+async def get_subscription_details() -> str:
     """Get Monarch Money subscription status and details."""
 
     async def _get_subscription_details():
         client = await get_monarch_client()
         return await client.get_subscription_details()
 
-    details = run_async(_get_subscription_details())
+    details = await await_async(_get_subscription_details())
 
     return json.dumps(details, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting institutions")
-def get_institutions() -> str:
+async def get_institutions() -> str:
     """Get all connected financial institutions and their connection status."""
 
     async def _get_institutions():
         client = await get_monarch_client()
         return await client.get_institutions()
 
-    institutions = run_async(_get_institutions())
+    institutions = await await_async(_get_institutions())
 
     return json.dumps(institutions, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting cashflow summary")
-def get_cashflow_summary(
+async def get_cashflow_summary(
     limit: int = 100,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
@@ -877,7 +2113,7 @@ def get_cashflow_summary(
             filters["end_date"] = end_date
         return await client.get_cashflow_summary(limit=limit, **filters)
 
-    summary = run_async(_get_cashflow_summary())
+    summary = await await_async(_get_cashflow_summary())
 
     return json.dumps(summary, indent=2, default=str)
 
@@ -887,13 +2123,16 @@ def get_cashflow_summary(
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("setting budget amount")
-def set_budget_amount(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+@_invalidates_dependents
+@idempotency.idempotent
+async def set_budget_amount(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     amount: float,
     category_id: Optional[str] = None,
     category_group_id: Optional[str] = None,
     timeframe: str = "month",
     start_date: Optional[str] = None,
     apply_to_future: bool = False,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
 ) -> str:
     """
     Set or update a budget amount for a category or category group.
@@ -905,6 +2144,8 @@ def set_budget_amount(  # pylint: disable=too-many-arguments,too-many-positional
         timeframe: Budget timeframe - "month" or "week" (default: "month")
         start_date: Budget start date in YYYY-MM-DD format
         apply_to_future: Whether to apply this amount to future periods (default: False)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
     if (category_id is None) == (category_group_id is None):
         return json.dumps(
@@ -927,14 +2168,14 @@ def set_budget_amount(  # pylint: disable=too-many-arguments,too-many-positional
             kwargs["start_date"] = start_date
         return await client.set_budget_amount(**kwargs)
 
-    result = run_async(_set_budget_amount())
+    result = await await_async(_set_budget_amount())
 
     return json.dumps(result, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting transaction splits")
-def get_transaction_splits(transaction_id: str) -> str:
+async def get_transaction_splits(transaction_id: str) -> str:
     """
     Get split information for a transaction.
 
@@ -946,16 +2187,23 @@ def get_transaction_splits(transaction_id: str) -> str:
         client = await get_monarch_client()
         return await client.get_transaction_splits(transaction_id)
 
-    splits = run_async(_get_transaction_splits())
+    key = transaction_cache.splits_key(transaction_id)
+    splits = response_cache.get(key)
+    if splits is None:
+        splits = await await_async(_get_transaction_splits())
+        response_cache.set(key, splits, ttl=transaction_cache.TRANSACTION_TTL)
 
     return json.dumps(splits, indent=2, default=str)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("updating transaction splits")
-def update_transaction_splits(
+@_invalidates_dependents
+@idempotency.idempotent
+async def update_transaction_splits(
     transaction_id: str,
     split_data: List[Dict[str, Any]],
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
 ) -> str:
     """
     Create, modify, or delete splits for a transaction.
@@ -965,26 +2213,34 @@ def update_transaction_splits(
         split_data: List of split objects, each with keys: merchantName, amount, categoryId.
             Sum of split amounts must equal the original transaction amount.
             Pass an empty list to remove all splits.
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _update_transaction_splits():
         client = await get_monarch_client()
         return await client.update_transaction_splits(transaction_id, split_data)
 
-    result = run_async(_update_transaction_splits())
+    result = await _write_through(
+        transaction_id, ["splitTransactions"], "updateTransactionSplit",
+        _update_transaction_splits(),
+    )
 
     return json.dumps(result, indent=2, default=str)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("creating transaction category")
-def create_transaction_category(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+@_invalidates_dependents
+@idempotency.idempotent
+async def create_transaction_category(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     group_id: str,
     name: str,
     icon: str = "\u2753",
     rollover_enabled: bool = False,
     rollover_type: str = "monthly",
     rollover_start_month: Optional[str] = None,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
 ) -> str:
     """
     Create a new transaction category in Monarch Money.
@@ -996,6 +2252,8 @@ def create_transaction_category(  # pylint: disable=too-many-arguments,too-many-
         rollover_enabled: Whether budget rollover is enabled (default: False)
         rollover_type: Rollover type - "monthly" (default: "monthly")
         rollover_start_month: Rollover start in YYYY-MM-DD (default: 1st of month)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _create_transaction_category():
@@ -1013,26 +2271,33 @@ def create_transaction_category(  # pylint: disable=too-many-arguments,too-many-
             )
         return await client.create_transaction_category(**kwargs)
 
-    result = run_async(_create_transaction_category())
+    result = await await_async(_create_transaction_category())
 
     return json.dumps(result, indent=2, default=str)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("deleting transaction category")
-def delete_transaction_category(category_id: str) -> str:
+@_invalidates_dependents
+@idempotency.idempotent
+async def delete_transaction_category(
+    category_id: str,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
     """
     Delete a transaction category from Monarch Money.
 
     Args:
         category_id: The ID of the category to delete
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _delete_transaction_category():
         client = await get_monarch_client()
         return await client.delete_transaction_category(category_id)
 
-    result = run_async(_delete_transaction_category())
+    result = await await_async(_delete_transaction_category())
 
     return json.dumps(
         {"deleted": True, "category_id": category_id, "result": result},
@@ -1043,12 +2308,15 @@ def delete_transaction_category(category_id: str) -> str:
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("creating manual account")
-def create_manual_account(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+@_invalidates_dependents
+@idempotency.idempotent
+async def create_manual_account(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     account_name: str,
     account_type: str,
     account_sub_type: str,
     is_in_net_worth: bool,
     account_balance: float = 0,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
 ) -> str:
     """
     Create a new manual account in Monarch Money.
@@ -1059,6 +2327,8 @@ def create_manual_account(  # pylint: disable=too-many-arguments,too-many-positi
         account_sub_type: Account sub-type
         is_in_net_worth: Whether to include in net worth calculation
         account_balance: Starting balance (default: 0)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _create_manual_account():
@@ -1071,14 +2341,16 @@ def create_manual_account(  # pylint: disable=too-many-arguments,too-many-positi
             account_balance=account_balance,
         )
 
-    result = run_async(_create_manual_account())
+    result = await await_async(_create_manual_account())
 
     return json.dumps(result, indent=2, default=str)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("updating account")
-def update_account(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+@_invalidates_dependents
+@idempotency.idempotent
+async def update_account(  # pylint: disable=too-many-arguments,too-many-positional-arguments
     account_id: str,
     account_name: Optional[str] = None,
     account_balance: Optional[float] = None,
@@ -1087,6 +2359,7 @@ def update_account(  # pylint: disable=too-many-arguments,too-many-positional-ar
     include_in_net_worth: Optional[bool] = None,
     hide_from_summary_list: Optional[bool] = None,
     hide_transactions_from_reports: Optional[bool] = None,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
 ) -> str:
     """
     Update an existing account in Monarch Money.
@@ -1100,6 +2373,8 @@ def update_account(  # pylint: disable=too-many-arguments,too-many-positional-ar
         include_in_net_worth: Whether to include in net worth
         hide_from_summary_list: Whether to hide from summary list
         hide_transactions_from_reports: Whether to hide transactions from reports
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _update_account():
@@ -1121,7 +2396,8 @@ def update_account(  # pylint: disable=too-many-arguments,too-many-positional-ar
             update_data["hide_transactions_from_reports"] = hide_transactions_from_reports
         return await client.update_account(**update_data)
 
-    result = run_async(_update_account())
+    result = await await_async(_update_account())
+    _account_history_store.invalidate(account_id)
 
     return json.dumps(result, indent=2, default=str)
 
@@ -1129,50 +2405,221 @@ def update_account(  # pylint: disable=too-many-arguments,too-many-positional-ar
 # ── Phase 4: Analytics & history tools ────────────────────────────────
 
 
+# Cached daily series live for a day; the still-moving tail (today) is
+# refetched once it is older than _SERIES_TAIL_TTL.
+_SERIES_TTL = 24 * 60 * 60
+_SERIES_TAIL_TTL = 5 * 60
+# Monarch's default window for get_recent_account_balances
+_RECENT_BALANCES_DAYS = 31
+
+
+# Per-account balance history persisted across restarts; fetched again in
+# full once a week so upstream corrections to past days are picked up
+_ACCOUNT_HISTORY_MAX_AGE = 7 * 24 * 60 * 60
+_account_history_store = timeseries.SeriesFileStore(
+    "account_history", max_age=_ACCOUNT_HISTORY_MAX_AGE,
+)
+
+
+def _forget_account_history(account_id: Optional[str]) -> None:
+    """Drop the stored history of *account_id*, or of every account if unknown."""
+    if account_id:
+        _account_history_store.invalidate(account_id)
+    else:
+        _account_history_store.clear()
+
+
+async def _cached_daily_series(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    key, start_date, end_date, fetch, default_start=None, store=response_cache,
+):
+    """Serve a daily series from cache, fetching only the days it is missing.
+
+    ``fetch(start_date, end_date)`` must return a coroutine producing a list
+    of date-keyed points.  On a cold cache it is called with the caller's
+    own arguments; afterwards only the days past the last settled day are
+    requested and merged into the cached series.  *store* is the in-memory
+    response cache by default, or a :class:`timeseries.SeriesFileStore`.
+    """
+    today = datetime.now().date()
+    start = timeseries.parse_date(start_date) or default_start
+    end = min(timeseries.parse_date(end_date) or today, today)
+    settled = min(end, today - timedelta(days=1))
+
+    # A file store reads and writes disk, so keep it off the event loop
+    on_disk = isinstance(store, timeseries.SeriesFileStore)
+    entry = await asyncio.to_thread(store.get, key) if on_disk else store.get(key)
+    plan = timeseries.tail_range(entry, start, end, _SERIES_TAIL_TTL)
+    if plan is not None:
+        fetch_start, is_tail = plan
+        if is_tail:
+            fresh = await await_async(fetch(fetch_start.isoformat(), end_date))
+            entry = timeseries.SeriesEntry(
+                start=entry.start,
+                stable_through=max(entry.stable_through, settled),
+                fetched_through=max(entry.fetched_through, end),
+                points=timeseries.merge_points(entry.points, fresh),
+                created_at=entry.created_at,
+            )
+        else:
+            fresh = await await_async(fetch(start_date, end_date))
+            entry = timeseries.SeriesEntry(
+                start=start,
+                stable_through=settled,
+                fetched_through=end,
+                points=timeseries.merge_points([], fresh),
+            )
+        if on_disk:
+            await asyncio.to_thread(store.set, key, entry, ttl=_SERIES_TTL)
+        else:
+            store.set(key, entry, ttl=_SERIES_TTL)
+
+    return timeseries.slice_points(entry.points, start, end)
+
+
+def _validate_max_points(max_points: Optional[int]) -> Optional[str]:
+    """Return an error JSON string if *max_points* is out of range."""
+    if max_points is not None and max_points < 3:
+        return json.dumps({"error": "max_points must be at least 3."}, indent=2)
+    return None
+
+
+async def _fetch_recent_balance_points(client, start_date, default_start):
+    """Fetch recent balances for all accounts as one pivoted point per day."""
+    kwargs = {}
+    if start_date is not None:
+        kwargs["start_date"] = start_date
+    balances = await client.get_recent_account_balances(**kwargs)
+    return timeseries.pivot_recent_balances(
+        balances.get("accounts", []),
+        timeseries.parse_date(start_date) or default_start,
+    )
+
+
 @mcp.tool()
 @_handle_mcp_errors("getting account history")
-def get_account_history(account_id: str) -> str:
+async def get_account_history(
+    account_id: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> str:
     """
     Get historical balance snapshots for an account.
 
+    History is cached on disk per account.  Later calls fetch only the days
+    since the last cached date, and date ranges are sliced locally.
+    Large results are split into chunks; see ``get_continuation``.
+
     Args:
         account_id: The ID of the account
+        start_date: Only return snapshots on or after this date, YYYY-MM-DD (optional)
+        end_date: Only return snapshots on or before this date, YYYY-MM-DD (optional)
     """
+    for value in (start_date, end_date):
+        if value is not None and timeseries.parse_date(value) is None:
+            return json.dumps(
+                {"error": "Dates must be in YYYY-MM-DD format."}, indent=2,
+            )
 
-    async def _get_account_history():
+    async def _get_account_history(fetch_start, _fetch_end):
         client = await get_monarch_client()
-        return await client.get_account_history(account_id)
+        if fetch_start is None:
+            return await client.get_account_history(account_id)
+        # Tail since the last cached day, taken from the all-accounts daily
+        # balances query — the full history query has no date filter.
+        points = await _fetch_recent_balance_points(client, fetch_start, None)
+        return [
+            {
+                "date": point["date"],
+                "signedBalance": point["balance"],
+                "accountId": account_id,
+            }
+            for point in timeseries.account_series(points).get(account_id, [])
+        ]
 
-    history = run_async(_get_account_history())
+    points = await _cached_daily_series(
+        account_id, None, None, _get_account_history,
+        store=_account_history_store,
+    )
+    account_name = points[0].get("accountName") if points else None
+    history = [
+        {**point, "accountName": point.get("accountName") or account_name}
+        for point in timeseries.slice_points(
+            points,
+            timeseries.parse_date(start_date),
+            timeseries.parse_date(end_date),
+        )
+    ]
 
-    return json.dumps(history, indent=2, default=str)
+    return continuation.paginate(json.dumps(history, indent=2, default=str))
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting recent account balances")
-def get_recent_account_balances(start_date: Optional[str] = None) -> str:
+async def get_recent_account_balances(
+    start_date: Optional[str] = None,
+    max_points: Optional[int] = None,
+) -> str:
     """
     Get daily balance for all accounts from a start date.
 
+    Balances are cached and only days new since the last call are fetched.
+
     Args:
-        start_date: Start date in YYYY-MM-DD format (optional)
+        start_date: Start date in YYYY-MM-DD format (optional, default: 31 days ago)
+        max_points: Downsample each account to at most this many points,
+            preserving peaks and troughs (optional, minimum 3). When set,
+            balances are returned as date/balance pairs.
     """
+    error = _validate_max_points(max_points)
+    if error:
+        return error
+
+    today = datetime.now().date()
+    default_start = today - timedelta(days=_RECENT_BALANCES_DAYS)
+    first_day = timeseries.parse_date(start_date) or default_start
 
-    async def _get_recent_account_balances():
+    async def _get_recent_account_balances(fetch_start, _fetch_end):
         client = await get_monarch_client()
-        kwargs = {}
-        if start_date is not None:
-            kwargs["start_date"] = start_date
-        return await client.get_recent_account_balances(**kwargs)
+        return await _fetch_recent_balance_points(client, fetch_start, default_start)
+
+    points = await _cached_daily_series(
+        ("recent_account_balances",),
+        start_date,
+        None,
+        _get_recent_account_balances,
+        default_start=default_start,
+    )
+    series = timeseries.account_series(points)
 
-    balances = run_async(_get_recent_account_balances())
+    if max_points is not None:
+        accounts = [
+            {
+                "id": account_id,
+                "recentBalances": timeseries.downsample(
+                    account_points, max_points, "balance",
+                ),
+            }
+            for account_id, account_points in series.items()
+        ]
+    else:
+        accounts = [
+            {
+                "id": account_id,
+                "recentBalances": [p["balance"] for p in account_points],
+            }
+            for account_id, account_points in series.items()
+        ]
 
-    return json.dumps(balances, indent=2, default=str)
+    return json.dumps(
+        {"startDate": first_day.isoformat(), "accounts": accounts},
+        indent=2,
+        default=str,
+    )
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting account snapshots by type")
-def get_account_snapshots_by_type(start_date: str, timeframe: str) -> str:
+async def get_account_snapshots_by_type(start_date: str, timeframe: str) -> str:
     """
     Get net value snapshots grouped by account type.
 
@@ -1190,86 +2637,110 @@ def get_account_snapshots_by_type(start_date: str, timeframe: str) -> str:
         client = await get_monarch_client()
         return await client.get_account_snapshots_by_type(start_date, timeframe)
 
-    snapshots = run_async(_get_account_snapshots_by_type())
+    snapshots = await await_async(_get_account_snapshots_by_type())
 
     return json.dumps(snapshots, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting aggregate snapshots")
-def get_aggregate_snapshots(
+async def get_aggregate_snapshots(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     account_type: Optional[str] = None,
+    max_points: Optional[int] = None,
 ) -> str:
     """
     Get daily aggregate net value of all accounts.
 
+    Snapshots are cached and only days new since the last call are fetched.
+
     Args:
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
         account_type: Filter by account type (optional)
+        max_points: Downsample to at most this many points, preserving
+            peaks and troughs (optional, minimum 3)
     """
+    error = _validate_max_points(max_points)
+    if error:
+        return error
 
-    async def _get_aggregate_snapshots():
+    async def _get_aggregate_snapshots(fetch_start, fetch_end):
         client = await get_monarch_client()
         kwargs = {}
-        if start_date is not None:
-            kwargs["start_date"] = start_date
-        if end_date is not None:
-            kwargs["end_date"] = end_date
+        if fetch_start is not None:
+            kwargs["start_date"] = fetch_start
+        if fetch_end is not None:
+            kwargs["end_date"] = fetch_end
         if account_type is not None:
             kwargs["account_type"] = account_type
-        return await client.get_aggregate_snapshots(**kwargs)
-
-    snapshots = run_async(_get_aggregate_snapshots())
+        snapshots = await client.get_aggregate_snapshots(**kwargs)
+        return snapshots.get("aggregateSnapshots") or []
+
+    points = await _cached_daily_series(
+        ("aggregate_snapshots", account_type),
+        start_date,
+        end_date,
+        _get_aggregate_snapshots,
+    )
+    if max_points is not None:
+        points = timeseries.downsample(points, max_points, "balance")
 
-    return json.dumps(snapshots, indent=2, default=str)
+    return json.dumps({"aggregateSnapshots": points}, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting account type options")
-def get_account_type_options() -> str:
+async def get_account_type_options() -> str:
     """Get available account types and sub-types for creating manual accounts."""
 
     async def _get_account_type_options():
         client = await get_monarch_client()
         return await client.get_account_type_options()
 
-    options = run_async(_get_account_type_options())
+    options = await await_async(_get_account_type_options())
 
     return json.dumps(options, indent=2, default=str)
 
 
 @mcp.tool()
 @_handle_mcp_errors("getting credit history")
-def get_credit_history() -> str:
+async def get_credit_history() -> str:
     """Get credit score history and related details."""
 
     async def _get_credit_history():
         client = await get_monarch_client()
         return await client.get_credit_history()
 
-    history = run_async(_get_credit_history())
+    history = await await_async(_get_credit_history())
 
     return json.dumps(history, indent=2, default=str)
 
 
 @mcp.tool(enabled=_WRITE_ENABLED)
 @_handle_mcp_errors("deleting account")
-def delete_account(account_id: str) -> str:
+@_invalidates_dependents
+@idempotency.idempotent
+async def delete_account(
+    account_id: str,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
     """
     Delete an account from Monarch Money. This action is irreversible.
 
     Args:
         account_id: The ID of the account to delete
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
     """
 
     async def _delete_account():
         client = await get_monarch_client()
         return await client.delete_account(account_id)
 
-    result = run_async(_delete_account())
+    result = await await_async(_delete_account())
+    _account_history_store.invalidate(account_id)
 
     return json.dumps(
         {"deleted": True, "account_id": account_id, "result": result},
@@ -1278,6 +2749,263 @@ def delete_account(account_id: str) -> str:
     )
 
 
+# Rows per balance-history upload, and how long to wait for Monarch to
+# process each one
+_BALANCE_UPLOAD_CHUNK = 1000
+_BALANCE_UPLOAD_TIMEOUT = 300
+
+
+@mcp.tool(enabled=_WRITE_ENABLED)
+@_handle_mcp_errors("uploading account balance history")
+@_invalidates_dependents
+@idempotency.idempotent
+async def upload_account_balance_history(  # pylint: disable=too-many-return-statements
+    ctx: Context,
+    account_id: str,
+    csv_path: str,
+    chunk_size: int = _BALANCE_UPLOAD_CHUNK,
+    idempotency_key: Optional[str] = None,  # pylint: disable=unused-argument
+) -> str:
+    """
+    Upload daily balance history for an account from a local CSV file.
+
+    The CSV needs a header row with ``Date`` (YYYY-MM-DD) and ``Amount``
+    (or ``Balance``) columns, plus an optional ``Account Name``.  The whole
+    file is validated before anything is uploaded; rows are then sent in
+    chunks, waiting for Monarch to process each one.
+
+    Args:
+        account_id: The ID of the (manual) account to apply the history to
+        csv_path: Path to the CSV file, relative to or inside
+            MONARCH_MCP_IMPORT_DIR (default ~/monarch-mcp-imports); paths
+            outside it are rejected
+        chunk_size: Rows per upload request (default: 1000)
+        idempotency_key: Optional key; a repeat call with the same key returns
+            the first call's result instead of writing again
+    """
+    if chunk_size <= 0:
+        return json.dumps({"error": "chunk_size must be positive."}, indent=2)
+    try:
+        path = paths.confine(csv_path, paths.import_dir())
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}, indent=2)
+    if not os.path.isfile(path):
+        return json.dumps({"error": f"File not found: {csv_path}"}, indent=2)
+
+    try:
+        total, errors = await asyncio.to_thread(balance_upload.validate, path)
+    except (ValueError, UnicodeDecodeError) as exc:
+        return json.dumps({"error": f"Could not read CSV: {exc}"}, indent=2)
+    if errors:
+        return json.dumps(
+            {"error": "CSV contains invalid rows; nothing was uploaded.", "invalid_rows": errors},
+            indent=2,
+        )
+    if not total:
+        return json.dumps({"error": "CSV contains no balance rows."}, indent=2)
+
+    async def _upload():
+        client = await get_monarch_client()
+        uploaded = 0
+        chunks = 0
+        await ctx.report_progress(0, total, f"Uploading {total} balances")
+        for chunk in balance_upload.iter_chunks(path, chunk_size):
+            # The library polls with asyncio.sleep, so waiting for Monarch
+            # to parse each chunk does not hold a thread.
+            completed = await client.upload_account_balance_history(
+                account_id, chunk, timeout=_BALANCE_UPLOAD_TIMEOUT,
+            )
+            if not completed:
+                return {
+                    "completed": False,
+                    "error": f"Timed out waiting for Monarch to process chunk {chunks + 1}.",
+                    "uploaded_rows": uploaded,
+                    "chunks": chunks,
+                }
+            uploaded += len(chunk)
+            chunks += 1
+            await ctx.report_progress(uploaded, total, f"Uploaded {uploaded}/{total} balances")
+        return {"completed": True, "uploaded_rows": uploaded, "chunks": chunks}
+
+    try:
+        result = await await_async(_upload())
+    finally:
+        _account_history_store.invalidate(account_id)
+
+    return json.dumps({"account_id": account_id, "rows": total, **result}, indent=2)
+
+
+# ── Phase 5: Planning tools ───────────────────────────────────────────
+
+# Run-rates come from settled history, so they are reused for longer
+_RUN_RATE_TTL = 6 * 60 * 60
+_FORECAST_TTL = 24 * 60 * 60
+
+
+@mcp.tool()
+@_handle_mcp_errors("forecasting cashflow")
+async def forecast_cashflow(
+    horizon_days: int = 90,
+    lookback_days: int = 90,
+    include_daily: bool = False,
+) -> str:
+    """
+    Project day-by-day balances per account for bill-pay planning.
+
+    Combines current balances, upcoming recurring transactions and the
+    average daily spend per category over the lookback window (from
+    non-recurring transactions).  Reports projected balances at 30/60/90
+    days and the lowest projected balance per account.
+
+    Args:
+        horizon_days: Number of days to project, 1-365 (default: 90)
+        lookback_days: Days of history used for category run-rates, 0-365
+            (default: 90; 0 disables run-rates)
+        include_daily: Include the full day-by-day balance series (default: False)
+    """
+    if not 1 <= horizon_days <= 365:
+        return json.dumps({"error": "horizon_days must be between 1 and 365."}, indent=2)
+    if not 0 <= lookback_days <= 365:
+        return json.dumps({"error": "lookback_days must be between 0 and 365."}, indent=2)
+
+    today = datetime.now().date()
+    run_rate_key = ("forecast_run_rates", today.isoformat(), lookback_days)
+
+    async def _get_forecast_inputs():
+        client = await get_monarch_client()
+        accounts, recurring = await asyncio.gather(
+            client.get_accounts(),
+            client.get_recurring_transactions(
+                start_date=today.isoformat(),
+                end_date=(today + timedelta(days=horizon_days)).isoformat(),
+            ),
+        )
+        run_rates = response_cache.get(run_rate_key)
+        if run_rates is None:
+            run_rates = {}
+            if lookback_days:
+                history = []
+                async for page in _iter_transaction_pages(
+                    client,
+                    start_date=(today - timedelta(days=lookback_days)).isoformat(),
+                    end_date=(today - timedelta(days=1)).isoformat(),
+                    is_recurring=False,
+                ):
+                    history.extend(page)
+                run_rates = await offload.run(
+                    forecast.category_run_rates, history, lookback_days,
+                )
+            response_cache.set(run_rate_key, run_rates, ttl=_RUN_RATE_TTL)
+        return accounts, recurring, run_rates
+
+    accounts, recurring, run_rates = await await_async(_get_forecast_inputs())
+
+    balances = forecast.current_balances(accounts.get("accounts", []))
+    schedule = forecast.scheduled_items(
+        recurring.get("recurringTransactionItems", []), today, horizon_days,
+    )
+    key = (
+        "forecast_cashflow",
+        fingerprint(today, horizon_days, include_daily, balances, schedule, run_rates),
+    )
+    result = response_cache.get(key)
+    if result is None:
+        result = await offload.run(
+            forecast.project_balances,
+            balances, schedule, run_rates, today, horizon_days,
+            include_daily=include_daily,
+        )
+        response_cache.set(key, result, ttl=_FORECAST_TTL)
+
+    return await offload.dumps(result, indent=2, default=str)
+
+
+@mcp.tool()
+def get_continuation(continuation_token: str) -> str:
+    """
+    Get the next chunk of a result that was too large for one response.
+
+    Tools whose output exceeds the response size limit return a ``chunk``
+    of the JSON text and a ``continuation_token``.  Call this with the
+    token until it comes back null, concatenate every ``chunk`` in order,
+    then parse the whole as JSON.
+
+    Args:
+        continuation_token: Token from the previous chunk
+    """
+    try:
+        return continuation.resume(continuation_token)
+    except KeyError:
+        return json.dumps(
+            {"error": "Continuation token has expired; call the original tool again."},
+            indent=2,
+        )
+    except ValueError as exc:
+        return json.dumps({"error": str(exc)}, indent=2)
+
+
+@mcp.tool()
+def get_server_metrics() -> str:
+    """
+    Get server health metrics.
+
+    ``event_loop_lag`` shows how late the server loop wakes up (stalls are
+    wake-ups at least 100 ms late); ``offload`` counts CPU-heavy steps run
+    in worker processes versus inline; ``scheduler`` shows, per priority
+    class, the upstream slots in use, calls waiting and time spent waiting;
+    ``graphql`` counts calls and errors per custom GraphQL operation.
+    """
+    return json.dumps(
+        {
+            "event_loop_lag": offload.loop_lag.snapshot(),
+            "offload": offload.stats(),
+            "scheduler": scheduler.scheduler.stats(),
+            "graphql": documents.stats(),
+        },
+        indent=2,
+    )
+
+
+# ── Resources ─────────────────────────────────────────────────────────
+
+
+async def _read_reference(uri: str) -> str:
+    """Serve cached reference data."""
+    data = await await_async(_reference_data(uri))
+    return json.dumps(data, indent=2, default=str)
+
+
+@mcp.resource(resources.ACCOUNTS_URI, name="accounts", mime_type="application/json")
+async def accounts_resource() -> str:
+    """All financial accounts (id, name, type, balance, institution, status)."""
+    return await _read_reference(resources.ACCOUNTS_URI)
+
+
+@mcp.resource(resources.CATEGORIES_URI, name="categories", mime_type="application/json")
+async def categories_resource() -> str:
+    """All transaction categories."""
+    return await _read_reference(resources.CATEGORIES_URI)
+
+
+@mcp.resource(
+    resources.CATEGORY_GROUPS_URI, name="category-groups", mime_type="application/json",
+)
+async def category_groups_resource() -> str:
+    """All transaction category groups."""
+    return await _read_reference(resources.CATEGORY_GROUPS_URI)
+
+
+@mcp.resource(resources.TAGS_URI, name="tags", mime_type="application/json")
+async def tags_resource() -> str:
+    """All transaction tags."""
+    return await _read_reference(resources.TAGS_URI)
+
+
+# FastMCP has no public hook for resources/subscribe, so the handlers go
+# on the SDK server it wraps
+resources.serve_subscriptions(mcp._mcp_server)  # pylint: disable=protected-access
+
+
 def main():
     """Main entry point for the server."""
     mode = "read-write" if _WRITE_ENABLED else "read-only"
@@ -1287,7 +3015,15 @@ def main():
     trigger_auth_flow()
 
     try:
-        mcp.run()
+        if _PARSED_ARGS.transport == "http":
+            # One process serves every session, sharing the client and caches
+            logger.info(
+                "Serving MCP over HTTP on http://%s:%d/mcp",
+                _PARSED_ARGS.host, _PARSED_ARGS.port,
+            )
+            mcp.run(transport="http", host=_PARSED_ARGS.host, port=_PARSED_ARGS.port)
+        else:
+            mcp.run()
     except Exception as e:  # pylint: disable=broad-exception-caught
         logger.error("Failed to run server: %s", e)
         raise
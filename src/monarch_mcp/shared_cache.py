@@ -0,0 +1,287 @@
+"""
+Cross-process cache stores for Monarch Money MCP Server.
+
+By default every server process keeps its own in-memory response cache.
+When several processes run side by side (one stdio server per client, or
+several HTTP workers), ``MONARCH_MCP_CACHE_BACKEND`` can point them at
+one shared store instead, so data fetched by one process is reused by
+the others:
+
+* ``memory`` (default): per-process, nothing shared.
+* ``sqlite`` or ``sqlite:///path/to/file``: a SQLite database in WAL mode,
+  by default ``response-cache.sqlite3`` in the cache directory.  Every
+  write runs in an immediate transaction, so SQLite's file lock
+  serialises writers across processes while readers keep reading the
+  last committed state.
+* ``redis://host:port/db``: any server speaking the Redis protocol
+  (Redis, Valkey, or a local stand-in).  Each operation is one atomic
+  command; entries expire on the server.  Needs ``redis``
+  (``pip install 'monarch-mcp[redis]'``), imported on first use.
+
+Stores map string keys to JSON.  Values JSON has no type for — tuples,
+dates, dicts with non-string keys and classes registered with
+:func:`register_type` such as ``SeriesEntry`` — are written as tagged
+objects.  Decoding only ever builds those known types, so whoever can
+write to the store can at worst plant wrong cached data, never run code
+in the server.  Values of any other type are not cached.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keys in shared Redis servers are namespaced under this prefix
+REDIS_KEY_PREFIX = "monarch-mcp:"
+
+# Expired SQLite rows are purged once every this many writes
+_PURGE_EVERY = 200
+
+# Key marking a tagged (non-JSON) value in encoded entries
+_TAG = "__mcp_type__"
+
+# Registered value types: tag -> (class, to JSON-able, from decoded)
+_types: Dict[str, Tuple[type, Callable[[Any], Any], Callable[[Any], Any]]] = {}
+
+
+# ── Encoding ──────────────────────────────────────────────────────────
+
+
+def register_type(
+    tag: str, cls: type, to_json: Callable[[Any], Any], from_json: Callable[[Any], Any],
+) -> None:
+    """Let instances of *cls* be cached, encoded by *to_json* under *tag*.
+
+    *to_json* may return any value this module can encode; *from_json*
+    receives it decoded and rebuilds the instance.
+    """
+    _types[tag] = (cls, to_json, from_json)
+
+
+def _encode(value: Any) -> Any:  # pylint: disable=too-many-return-statements
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if _TAG not in value and all(isinstance(key, str) for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {_TAG: "dict", "items": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {_TAG: "tuple", "items": [_encode(item) for item in value]}
+    if isinstance(value, datetime):
+        return {_TAG: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {_TAG: "date", "value": value.isoformat()}
+    for tag, (cls, to_json, _) in _types.items():
+        if type(value) is cls:  # pylint: disable=unidiomatic-typecheck
+            return {_TAG: tag, "value": _encode(to_json(value))}
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    tag = obj.get(_TAG)
+    if tag is None:
+        return obj
+    if tag == "dict":
+        return dict(obj["items"])
+    if tag == "tuple":
+        return tuple(obj["items"])
+    if tag == "datetime":
+        return datetime.fromisoformat(obj["value"])
+    if tag == "date":
+        return date.fromisoformat(obj["value"])
+    if tag in _types:
+        return _types[tag][2](obj["value"])
+    raise ValueError(f"Unknown cached value type {tag!r}")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode *value* for a store; raise TypeError for types it cannot hold."""
+    return json.dumps(_encode(value), separators=(",", ":")).encode("utf-8")
+
+
+def loads(raw: bytes) -> Any:
+    """Decode bytes written by :func:`dumps`."""
+    return json.loads(raw, object_hook=_decode_object)
+
+
+class SQLiteStore:
+    """Shared store backed by a SQLite database in WAL mode."""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0) -> None:
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        existed = os.path.exists(path)
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False,
+        )
+        if not existed:
+            os.chmod(path, 0o600)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @contextlib.contextmanager
+    def _immediate(self):
+        """Run the body in an immediate transaction, holding the write lock."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _write(self, sql: str, params: tuple) -> int:
+        with self._immediate() as conn:
+            return conn.execute(sql, params).rowcount
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for *key*, or None if absent or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store *value* under *key* for *ttl* seconds."""
+        self._write(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            self._write("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Add one to the counter under *key* (0 if absent) and return it.
+
+        The read and the write share one immediate transaction, so
+        concurrent increments from any process are never lost.
+        """
+        now = time.time()
+        with self._immediate() as conn:
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now),
+            ).fetchone()
+            value = (int(row[0]) if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, str(value).encode("ascii"), now + ttl),
+            )
+        return value
+
+    def delete(self, key: str) -> None:
+        """Remove *key* if present."""
+        self._write("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every key starting with *prefix*; return how many."""
+        return self._write(
+            "DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix),
+        )
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._write("DELETE FROM entries", ())
+
+
+def _redis_module():
+    """Import redis, raising a readable error if it is not installed."""
+    try:
+        import redis  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise RuntimeError(
+            "The Redis cache backend requires redis. "
+            "Install it with: pip install 'monarch-mcp[redis]'"
+        ) from exc
+    return redis
+
+
+def _glob_escape(text: str) -> str:
+    return "".join("\\" + ch if ch in "*?[]\\" else ch for ch in text)
+
+
+class RedisStore:
+    """Shared store on a Redis-protocol server."""
+
+    def __init__(self, url: Optional[str] = None, client: Any = None) -> None:
+        self._redis = client if client is not None else _redis_module().Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for *key*, or None if absent or expired."""
+        return self._redis.get(REDIS_KEY_PREFIX + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store *value* under *key* for *ttl* seconds."""
+        self._redis.set(REDIS_KEY_PREFIX + key, value, px=max(1, int(ttl * 1000)))
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Add one to the counter under *key* (0 if absent) and return it.
+
+        ``INCR`` and the expiry are sent as one ``MULTI`` transaction.
+        """
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.incr(REDIS_KEY_PREFIX + key)
+        pipe.pexpire(REDIS_KEY_PREFIX + key, max(1, int(ttl * 1000)))
+        value, _ = pipe.execute()
+        return int(value)
+
+    def delete(self, key: str) -> None:
+        """Remove *key* if present."""
+        self._redis.delete(REDIS_KEY_PREFIX + key)
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every key starting with *prefix*; return how many."""
+        pattern = _glob_escape(REDIS_KEY_PREFIX + prefix) + "*"
+        removed = 0
+        batch = []
+        for key in self._redis.scan_iter(match=pattern, count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                removed += self._redis.delete(*batch)
+                batch = []
+        if batch:
+            removed += self._redis.delete(*batch)
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry this server stored."""
+        self.delete_prefix("")
+
+
+def open_store(spec: str, default_sqlite_path: str):
+    """Open the store described by *spec*; None means in-memory.
+
+    *spec* is ``memory``, ``sqlite``, ``sqlite:///path`` or a ``redis://``
+    (``rediss://``, ``unix://``) URL.
+    """
+    spec = (spec or "memory").strip()
+    if spec == "memory":
+        return None
+    if spec == "sqlite":
+        return SQLiteStore(default_sqlite_path)
+    if spec.startswith("sqlite:///"):
+        return SQLiteStore(spec[len("sqlite:///"):] or default_sqlite_path)
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(spec)
+    raise ValueError(
+        f"Unknown cache backend {spec!r}; use memory, sqlite, sqlite:///path "
+        "or a redis:// URL."
+    )
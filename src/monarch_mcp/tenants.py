@@ -0,0 +1,251 @@
+"""
+Tenant scoping for Monarch Money MCP Server.
+
+One server process can serve several Monarch logins ("tenants", e.g. one
+per household).  Each tenant has its own keyring token, shared client,
+caches and request budget.  The tenant for a request is held in a context
+variable, set by :class:`TenantMiddleware` from the ``X-Monarch-Tenant``
+HTTP header or from the tenant the MCP session chose with
+``select_tenant``.  Requests without either use the default tenant, which
+is the single login the server has always used.
+
+Tenants other than the default must be listed (comma-separated) in
+``MONARCH_MCP_TENANTS`` and logged in with ``login_setup.py --tenant``.
+Each is bound to an access token in ``MONARCH_MCP_TENANT_TOKENS``
+(comma-separated ``tenant=token`` pairs); a caller selects a tenant only
+by presenting its token, as an ``Authorization: Bearer`` header or as
+``select_tenant``'s ``access_token``.  A tenant without a token cannot be
+selected.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import hmac
+import os
+import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterator, Optional
+
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import Middleware
+from mcp.shared.exceptions import McpError
+from mcp.types import INVALID_PARAMS, ErrorData
+
+from monarch_mcp.secure_session import SecureMonarchSession, secure_session
+
+DEFAULT_TENANT = "default"
+
+# HTTP header that selects the tenant for a request
+TENANT_HEADER = "x-monarch-tenant"
+
+_TENANT_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_current: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "monarch_tenant", default=DEFAULT_TENANT,
+)
+
+
+def current() -> str:
+    """Return the tenant id of the request being served."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def use(tenant_id: str) -> Iterator[None]:
+    """Serve the enclosed block as *tenant_id*."""
+    token = _current.set(tenant_id)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def configured() -> FrozenSet[str]:
+    """Return the tenant ids this server accepts."""
+    raw = os.getenv("MONARCH_MCP_TENANTS", "")
+    extra = {name.strip() for name in raw.split(",") if name.strip()}
+    return frozenset({DEFAULT_TENANT} | {name for name in extra if _TENANT_ID.match(name)})
+
+
+def validate(tenant_id: str) -> str:
+    """Return *tenant_id* if it is configured; raise ValueError otherwise."""
+    if not _TENANT_ID.match(tenant_id):
+        raise ValueError(
+            f"Invalid tenant id {tenant_id!r}: use 1-64 letters, digits, '_' or '-'."
+        )
+    if tenant_id not in configured():
+        raise ValueError(
+            f"Unknown tenant {tenant_id!r}. Configured tenants: "
+            f"{', '.join(sorted(configured()))}"
+        )
+    return tenant_id
+
+
+def access_tokens() -> Dict[str, str]:
+    """Return the access token of each tenant in ``MONARCH_MCP_TENANT_TOKENS``."""
+    tokens = {}
+    for pair in os.getenv("MONARCH_MCP_TENANT_TOKENS", "").split(","):
+        name, _, token = pair.partition("=")
+        if name.strip() and token.strip():
+            tokens[name.strip()] = token.strip()
+    return tokens
+
+
+def authorize(tenant_id: str, token: Optional[str]) -> str:
+    """Return *tenant_id* if *token* is its access token; raise ValueError otherwise.
+
+    The default tenant needs no token.
+    """
+    validate(tenant_id)
+    if tenant_id == DEFAULT_TENANT:
+        return tenant_id
+    expected = access_tokens().get(tenant_id)
+    if not expected:
+        raise ValueError(
+            f"Tenant {tenant_id!r} has no access token; set one in MONARCH_MCP_TENANT_TOKENS."
+        )
+    if not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise ValueError(f"Missing or wrong access token for tenant {tenant_id!r}.")
+    return tenant_id
+
+
+def request_token() -> Optional[str]:
+    """Return the bearer token of the HTTP request being served, if any."""
+    scheme, _, token = (get_http_headers() or {}).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return token.strip() or None
+
+
+# ── Request budgets ─────────────────────────────────────────────────────
+
+
+def _rate_limit() -> float:
+    """Per-tenant budget in upstream requests per minute (0 = unlimited)."""
+    try:
+        return max(0.0, float(os.getenv("MONARCH_MCP_TENANT_RATE_LIMIT", "0")))
+    except ValueError:
+        return 0.0
+
+
+class RequestBudget:
+    """Token bucket refilled at *per_minute*, allowing a minute's burst.
+
+    Each upstream request takes one token (see ``scheduler.UpstreamClient``)
+    and a caller that overdraws the bucket reserves its turn and sleeps on
+    the serving loop until it is due, so a throttled tenant never holds up
+    the others.  The bucket is guarded by a lock so it may be shared with
+    other threads.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = per_minute
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one request from the bucket; return seconds to wait for it."""
+        if self.per_minute <= 0:
+            return 0.0
+        rate = self.per_minute / 60.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.per_minute, self._tokens + (now - self._updated) * rate,
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / rate)
+
+    async def acquire(self) -> None:
+        """Wait until the budget allows one more upstream request."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+# ── Tenant registry ─────────────────────────────────────────────────────
+
+
+@dataclass
+class Tenant:
+    """Per-tenant session (token + shared client) and request budget."""
+
+    id: str
+    session: SecureMonarchSession
+    budget: RequestBudget = field(default_factory=lambda: RequestBudget(_rate_limit()))
+
+
+_tenants: Dict[str, Tenant] = {}
+_tenants_lock = threading.Lock()
+
+
+def get(tenant_id: Optional[str] = None) -> Tenant:
+    """Return the :class:`Tenant` for *tenant_id* (default: the current one)."""
+    tenant_id = tenant_id or current()
+    with _tenants_lock:
+        tenant = _tenants.get(tenant_id)
+        if tenant is None:
+            session = (
+                secure_session if tenant_id == DEFAULT_TENANT
+                else SecureMonarchSession(tenant_id)
+            )
+            tenant = _tenants[tenant_id] = Tenant(tenant_id, session)
+        return tenant
+
+
+def reset() -> None:
+    """Forget every tenant's client, budget and session selection."""
+    with _tenants_lock:
+        tenants = list(_tenants.values())
+        _tenants.clear()
+    for tenant in tenants:
+        tenant.session.forget_client()
+    with _selection_lock:
+        _selected.clear()
+
+
+# ── Session selection ───────────────────────────────────────────────────
+
+_selected: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_selection_lock = threading.Lock()
+
+
+def select(session, tenant_id: str, token: Optional[str]) -> None:
+    """Serve later requests on MCP *session* as *tenant_id*, given its access *token*."""
+    tenant_id = authorize(tenant_id, token)
+    with _selection_lock:
+        _selected[session] = tenant_id
+
+
+def for_session(session) -> str:
+    """Return the tenant chosen by MCP *session* (default if none)."""
+    with _selection_lock:
+        return _selected.get(session, DEFAULT_TENANT)
+
+
+class TenantMiddleware(Middleware):
+    """Run each MCP request as the tenant its header or session selects."""
+
+    async def on_request(self, context, call_next):
+        ctx = context.fastmcp_context
+        # No session yet while the connection is being initialized
+        session = ctx.session if ctx is not None and ctx.request_context else None
+        header = (get_http_headers() or {}).get(TENANT_HEADER)
+        if header:
+            try:
+                tenant_id = authorize(header.strip(), request_token())
+            except ValueError as exc:
+                raise McpError(ErrorData(code=INVALID_PARAMS, message=str(exc))) from exc
+            if session is not None:
+                with _selection_lock:
+                    _selected[session] = tenant_id
+        else:
+            tenant_id = for_session(session) if session is not None else DEFAULT_TENANT
+        with use(tenant_id):
+            return await call_next(context)
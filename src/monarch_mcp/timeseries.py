@@ -0,0 +1,271 @@
+"""
+Daily time-series helpers for Monarch Money MCP Server.
+
+Balance and net-worth series are returned by Monarch one point per day.
+Past days never change, so a series fetched once can be kept and
+extended with only the days that are new since the last fetch.  Long
+series can also be downsampled before serialisation with
+Largest-Triangle-Three-Buckets (LTTB), which keeps peaks and troughs
+that uniform sampling would drop.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from monarch_mcp import shared_cache
+from monarch_mcp.cache import cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Points are dicts with an ISO ``"date"`` key plus arbitrary values
+Point = Dict[str, Any]
+
+
+@dataclass
+class SeriesEntry:
+    """A cached daily series and the date range it is known to cover.
+
+    ``start`` is None when the series was fetched from the beginning of
+    history.  ``stable_through`` is the last day that had fully settled
+    when it was fetched; ``fetched_through`` may include today, whose
+    value can still move.  ``fetched_at`` is when the tail was last
+    fetched and ``created_at`` when the whole series was.
+    """
+
+    start: Optional[date]
+    stable_through: date
+    fetched_through: date
+    points: List[Point] = field(default_factory=list)
+    fetched_at: float = field(default_factory=time.time)
+    created_at: float = field(default_factory=time.time)
+
+    def covers_start(self, start: Optional[date]) -> bool:
+        """Return True if the series reaches back to *start*."""
+        if self.start is None:
+            return True
+        return start is not None and start >= self.start
+
+
+# Series entries can be held in the cross-process response cache
+shared_cache.register_type(
+    "series_entry", SeriesEntry, asdict, lambda fields: SeriesEntry(**fields),
+)
+
+
+class SeriesFileStore:
+    """Persist :class:`SeriesEntry` objects as one JSON file per key.
+
+    Files live under ``cache_dir(namespace)`` and are written atomically
+    with owner-only permissions, since they hold account balances.
+    Past days rarely change, so entries stay until invalidated or, when
+    *max_age* is set, until the whole series is older than *max_age*
+    seconds; a later correction upstream is then picked up on the next
+    full fetch.  ``get``/``set`` mirror :class:`TTLCache` so either can
+    back a cached series.
+    """
+
+    def __init__(self, namespace: str, max_age: Optional[float] = None) -> None:
+        self._namespace = namespace
+        self._max_age = max_age
+
+    def _path(self, key: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", str(key))
+        return os.path.join(cache_dir(self._namespace), f"{safe}.json")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Load the entry stored under *key*, or *default* if missing or unreadable."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                raw = json.load(fh)
+            entry = SeriesEntry(
+                start=parse_date(raw["start"]),
+                stable_through=date.fromisoformat(raw["stable_through"]),
+                fetched_through=date.fromisoformat(raw["fetched_through"]),
+                points=raw["points"],
+                fetched_at=raw["fetched_at"],
+                created_at=raw.get("created_at", raw["fetched_at"]),
+            )
+        except FileNotFoundError:
+            return default
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring unreadable series cache %s: %s", path, exc)
+            return default
+        if self._max_age is not None and time.time() - entry.created_at >= self._max_age:
+            return default
+        return entry
+
+    def set(self, key: str, entry: SeriesEntry, ttl: Optional[float] = None) -> None:  # pylint: disable=unused-argument
+        """Write *entry* under *key*, replacing any previous file atomically."""
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        raw = asdict(entry)
+        for name in ("start", "stable_through", "fetched_through"):
+            raw[name] = raw[name].isoformat() if raw[name] is not None else None
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(raw, fh, default=str, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def invalidate(self, key: str) -> None:
+        """Delete the file stored under *key*, if any."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Delete every file in this store."""
+        directory = cache_dir(self._namespace)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".json"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(directory, name))
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Parse the date portion of an ISO string, returning None on failure."""
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def tail_range(
+    entry: Optional[SeriesEntry],
+    start: Optional[date],
+    end: date,
+    tail_ttl: float,
+) -> Optional[Tuple[Optional[date], bool]]:
+    """Decide what, if anything, must be fetched to serve ``start``..``end``.
+
+    Returns None when the cached *entry* already answers the request.
+    Otherwise returns ``(fetch_start, is_tail)``: for a tail fetch only the
+    days after ``stable_through`` are requested; for a full fetch
+    ``fetch_start`` is the caller's *start*.
+    """
+    if entry is None or not entry.covers_start(start):
+        return start, False
+    if end <= entry.stable_through:
+        return None
+    fresh = time.time() - entry.fetched_at < tail_ttl
+    if end <= entry.fetched_through and fresh:
+        return None
+    return entry.stable_through + timedelta(days=1), True
+
+
+def merge_points(cached: Iterable[Point], fresh: Iterable[Point]) -> List[Point]:
+    """Merge two date-keyed point lists; points in *fresh* win on overlap."""
+    by_date = {point["date"]: point for point in cached}
+    by_date.update((point["date"], point) for point in fresh)
+    return [by_date[key] for key in sorted(by_date)]
+
+
+def slice_points(
+    points: Iterable[Point],
+    start: Optional[date],
+    end: Optional[date],
+) -> List[Point]:
+    """Return points whose date lies within ``start``..``end`` (inclusive)."""
+    result = []
+    for point in points:
+        day = parse_date(point.get("date"))
+        if day is None:
+            continue
+        if start is not None and day < start:
+            continue
+        if end is not None and day > end:
+            continue
+        result.append(point)
+    return result
+
+
+def downsample(  # pylint: disable=too-many-locals
+    points: List[Point], max_points: int, value_key: str,
+) -> List[Point]:
+    """Reduce *points* to at most *max_points* using LTTB.
+
+    The first and last points are always kept.  Points whose value is
+    missing are dropped first, since they cannot be placed on the curve.
+    """
+    points = [p for p in points if p.get(value_key) is not None]
+    count = len(points)
+    if count <= max_points:
+        return points
+    if max_points <= 2:
+        return [points[0], points[-1]][:max_points]
+
+    xs = [parse_date(p["date"]).toordinal() for p in points]
+    ys = [float(p[value_key]) for p in points]
+
+    sampled = [points[0]]
+    bucket_size = (count - 2) / (max_points - 2)
+    anchor = 0
+    for bucket in range(max_points - 2):
+        lo = int(bucket * bucket_size) + 1
+        hi = int((bucket + 1) * bucket_size) + 1
+        next_hi = min(int((bucket + 2) * bucket_size) + 1, count)
+        span = next_hi - hi
+        avg_x = sum(xs[hi:next_hi]) / span
+        avg_y = sum(ys[hi:next_hi]) / span
+
+        best, best_area = lo, -1.0
+        for idx in range(lo, hi):
+            area = abs(
+                (xs[anchor] - avg_x) * (ys[idx] - ys[anchor])
+                - (xs[anchor] - xs[idx]) * (avg_y - ys[anchor])
+            )
+            if area > best_area:
+                best, best_area = idx, area
+        sampled.append(points[best])
+        anchor = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def pivot_recent_balances(accounts: Iterable[Dict[str, Any]], first_day: date) -> List[Point]:
+    """Turn per-account ``recentBalances`` lists into one point per day.
+
+    Each point is ``{"date": ..., "balances": {account_id: balance}}``;
+    list index 0 of every account corresponds to *first_day*.
+    """
+    by_date: Dict[str, Point] = {}
+    for account in accounts:
+        account_id = account.get("id")
+        if not account_id:
+            continue
+        for offset, balance in enumerate(account.get("recentBalances") or []):
+            day = (first_day + timedelta(days=offset)).isoformat()
+            point = by_date.setdefault(day, {"date": day, "balances": {}})
+            point["balances"][account_id] = balance
+    return [by_date[key] for key in sorted(by_date)]
+
+
+def account_series(points: Iterable[Point]) -> Dict[str, List[Point]]:
+    """Split pivoted balance points into ``{account_id: [{"date", "balance"}]}``."""
+    series: Dict[str, List[Point]] = {}
+    for point in points:
+        for account_id, balance in point["balances"].items():
+            series.setdefault(account_id, []).append(
+                {"date": point["date"], "balance": balance}
+            )
+    return series
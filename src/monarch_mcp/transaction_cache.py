@@ -0,0 +1,148 @@
+"""
+Write-through cache of transaction reads for Monarch Money MCP Server.
+
+``get_transactions`` pages, ``get_transaction_details`` and
+``get_transaction_splits`` results are cached briefly in the response
+cache.  Pages hold only transaction ids; each transaction record is
+cached once.  When a write to a transaction succeeds, the mutation
+response is patched into that record (and its cached details and
+splits), so every cached view shows the change at once without another
+upstream call.
+
+A write can also change which transactions a filtered page should hold
+(a new category, new tags, a new date).  Each page is keyed on a
+generation number for every transaction field its filters depend on,
+plus ``date``, which orders every page.  A write bumps the generations
+of the fields it changed, so only the pages that could now be wrong are
+fetched again.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from monarch_mcp.cache import response_cache
+
+# Cached transaction reads are served for this long
+TRANSACTION_TTL = 2 * 60
+
+# Generations outlive every page keyed on them
+_GENERATION_TTL = 24 * 60 * 60
+
+# Transaction fields each get_transactions filter depends on
+FILTER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "category_ids": ("category",),
+    "tag_ids": ("tags",),
+    "search": ("merchant", "notes", "category", "tags"),
+    "has_attachments": ("attachments",),
+    "has_notes": ("notes",),
+    "hidden_from_reports": ("hideFromReports",),
+    "is_split": ("splitTransactions",),
+}
+
+
+def _generation(field: str) -> int:
+    return response_cache.get(("transaction_generation", field), 0)
+
+
+def _bump(fields: Iterable[str]) -> None:
+    # An atomic increment, so concurrent writes in other processes each count
+    for field in set(fields):
+        response_cache.incr(("transaction_generation", field), ttl=_GENERATION_TTL)
+
+
+def page_key(filters: Dict[str, Any], *request: Any) -> Tuple:
+    """Return the cache key of a page fetched with *filters* and *request* args."""
+    fields = {"date"}
+    for name in filters:
+        fields.update(FILTER_FIELDS.get(name, ()))
+    generations = tuple((field, _generation(field)) for field in sorted(fields))
+    return ("transaction_page", generations, *request)
+
+
+def get_page(key: Tuple) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """Return the cached ``(records, cursor)`` for page *key*, or None."""
+    page = response_cache.get(key)
+    if page is None:
+        return None
+    ids, cursor = page
+    records = []
+    for txn_id in ids:
+        record = response_cache.get(("transaction", txn_id))
+        if record is None:
+            return None
+        records.append(record)
+    return records, cursor
+
+
+def store_page(key: Tuple, records: List[Dict[str, Any]], cursor: Optional[str]) -> None:
+    """Cache a fetched page and each of its transaction records."""
+    for record in records:
+        response_cache.set(("transaction", record.get("id")), record, ttl=TRANSACTION_TTL)
+    response_cache.set(key, ([record.get("id") for record in records], cursor), ttl=TRANSACTION_TTL)
+
+
+def details_key(txn_id: str, redirect_posted: bool) -> Tuple:
+    """Cache key of a ``get_transaction_details`` result."""
+    return ("transaction_details", txn_id, redirect_posted)
+
+
+def splits_key(txn_id: str) -> Tuple:
+    """Cache key of a ``get_transaction_splits`` result."""
+    return ("transaction_splits", txn_id)
+
+
+def _merge(record: Dict[str, Any], changes: Dict[str, Any]) -> None:
+    """Copy *changes* into *record*, keeping the fields *record* was read with."""
+    for name, value in changes.items():
+        if name not in record:
+            continue
+        old = record[name]
+        if isinstance(value, dict) and isinstance(old, dict) and old.get("id") == value.get("id"):
+            # Same object: keep fields (such as a name) the mutation did not return
+            record[name] = {**old, **value}
+        else:
+            record[name] = value
+
+
+def _patch_entry(key: Tuple, changes: Optional[Dict[str, Any]], nested: Optional[str]) -> None:
+    value = response_cache.get(key)
+    if value is None:
+        return
+    target = value.get(nested) if nested else value
+    if changes is None or not isinstance(target, dict):
+        response_cache.invalidate(key)
+        return
+    _merge(target, changes)
+    response_cache.set(key, value, ttl=TRANSACTION_TTL)
+
+
+def patch(txn_id: str, changes: Optional[Dict[str, Any]], fields: Iterable[str]) -> None:
+    """Apply a successful write to transaction *txn_id*.
+
+    *changes* are the transaction fields from the mutation response; None
+    means the outcome is unknown and the cached copies are dropped
+    instead.  *fields* are the fields the write may have changed; pages
+    whose filters depend on them are refetched.
+    """
+    _bump(fields)
+    _patch_entry(("transaction", txn_id), changes, None)
+    for redirect_posted in (True, False):
+        _patch_entry(details_key(txn_id, redirect_posted), changes, "getTransaction")
+    _patch_entry(splits_key(txn_id), changes, "getTransaction")
+
+
+def account_id(txn_id: str) -> Optional[str]:
+    """Return the account id of transaction *txn_id* from any cached read, or None."""
+    records = [response_cache.get(("transaction", txn_id))]
+    for redirect_posted in (True, False):
+        details = response_cache.get(details_key(txn_id, redirect_posted)) or {}
+        records.append(details.get("getTransaction"))
+    for record in records:
+        account = record.get("account") if isinstance(record, dict) else None
+        if isinstance(account, dict) and account.get("id"):
+            return account["id"]
+    return None
+
+
+def forget(txn_id: str) -> None:
+    """Drop the cached copies of transaction *txn_id*."""
+    patch(txn_id, None, ())
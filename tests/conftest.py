@@ -24,6 +24,9 @@ from unittest.mock import patch, AsyncMock  # pylint: disable=unused-import
 import pytest
 from fastmcp import Client
 
+from monarch_mcp import tenants
+from monarch_mcp.cache import response_cache
+from monarch_mcp.secure_session import secure_session
 from monarch_mcp.server import mcp
 
 WRITE_TOOL_NAMES = frozenset({
@@ -32,6 +35,7 @@ WRITE_TOOL_NAMES = frozenset({
     "set_budget_amount", "update_transaction_splits",
     "create_transaction_category", "delete_transaction_category",
     "create_manual_account", "update_account", "delete_account",
+    "upload_account_balance_history", "upload_attachments",
 })
 
 
@@ -50,12 +54,22 @@ def mock_monarch_client():
 
 
 @pytest.fixture(autouse=True)
-def _isolate(mock_monarch_client, monkeypatch):  # pylint: disable=redefined-outer-name,unused-argument
+def _isolate(mock_monarch_client, monkeypatch, tmp_path):  # pylint: disable=redefined-outer-name,unused-argument
     """Autouse: every test gets mock client, no browser auth, no env leaks."""
     monkeypatch.delenv("MONARCH_EMAIL", raising=False)
     monkeypatch.delenv("MONARCH_PASSWORD", raising=False)
+    monkeypatch.setenv("MONARCH_MCP_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("MONARCH_MCP_EXPORT_DIR", str(tmp_path))
+    monkeypatch.setenv("MONARCH_MCP_IMPORT_DIR", str(tmp_path))
+    monkeypatch.delenv("MONARCH_MCP_TENANTS", raising=False)
+    monkeypatch.delenv("MONARCH_MCP_TENANT_RATE_LIMIT", raising=False)
+    response_cache.clear()
+    secure_session.forget_client()
+    tenants.reset()
     with patch("monarch_mcp.server.trigger_auth_flow"):
         yield
+    secure_session.forget_client()
+    tenants.reset()
 
 
 @pytest.fixture
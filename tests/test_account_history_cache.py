@@ -0,0 +1,205 @@
+"""Tests for the on-disk, incrementally extended get_account_history cache."""
+# pylint: disable=missing-function-docstring
+
+import json
+import os
+from datetime import date, timedelta
+
+from monarch_mcp.cache import cache_dir, response_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+TODAY = date.today()
+
+
+def _day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+def _history(first, last):
+    return [
+        {
+            "date": _day(i),
+            "signedBalance": 1000.0 + i,
+            "accountId": "acc-1",
+            "accountName": "Checking",
+        }
+        for i in range(first, last + 1)
+    ]
+
+
+async def _call(client, **args):
+    args.setdefault("account_id", "acc-1")
+    return json.loads(
+        (await client.call_tool("get_account_history", args)).content[0].text
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+async def test_history_written_to_disk(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+
+    await _call(mcp_client)
+
+    path = os.path.join(cache_dir("account_history"), "acc-1.json")
+    with open(path, encoding="utf-8") as fh:
+        stored = json.load(fh)
+    assert len(stored["points"]) == 4
+    assert stored["stable_through"] == _day(-1)
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+
+
+async def test_history_second_call_is_local(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+
+    first = await _call(mcp_client)
+    second = await _call(mcp_client)
+
+    assert first == second
+    mock_monarch_client.get_account_history.assert_called_once_with("acc-1")
+    mock_monarch_client.get_recent_account_balances.assert_not_called()
+
+
+async def test_history_fetches_only_tail(mcp_client, mock_monarch_client, monkeypatch):
+    monkeypatch.setattr("monarch_mcp.server._SERIES_TAIL_TTL", 0)
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+
+    mock_monarch_client.get_recent_account_balances.return_value = {
+        "accounts": [
+            {"id": "acc-1", "recentBalances": [2000.0]},
+            {"id": "acc-2", "recentBalances": [5.0]},
+        ]
+    }
+    result = await _call(mcp_client)
+
+    mock_monarch_client.get_account_history.assert_called_once()
+    mock_monarch_client.get_recent_account_balances.assert_called_once_with(
+        start_date=_day(0),
+    )
+    assert len(result) == 4
+    assert result[-1] == {
+        "date": _day(0),
+        "signedBalance": 2000.0,
+        "accountId": "acc-1",
+        "accountName": "Checking",
+    }
+
+
+async def test_history_date_slicing(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_account_history.return_value = _history(-10, 0)
+
+    result = await _call(mcp_client, start_date=_day(-5), end_date=_day(-3))
+
+    assert [p["date"] for p in result] == [_day(-5), _day(-4), _day(-3)]
+
+
+async def test_history_survives_memory_cache_clear(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+
+    response_cache.clear()
+    await _call(mcp_client)
+
+    mock_monarch_client.get_account_history.assert_called_once()
+
+
+async def test_history_corrupt_file_refetches(mcp_client, mock_monarch_client):
+    directory = cache_dir("account_history")
+    os.makedirs(directory)
+    with open(os.path.join(directory, "acc-1.json"), "w", encoding="utf-8") as fh:
+        fh.write("{not json")
+    mock_monarch_client.get_account_history.return_value = _history(-1, 0)
+
+    result = await _call(mcp_client)
+
+    assert len(result) == 2
+    mock_monarch_client.get_account_history.assert_called_once()
+
+
+async def test_history_invalid_date(mcp_client):
+    result = await _call(mcp_client, start_date="01/02/2025")
+    assert "error" in result
+
+
+async def test_history_refetched_in_full_after_max_age(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+    path = os.path.join(cache_dir("account_history"), "acc-1.json")
+    with open(path, encoding="utf-8") as fh:
+        stored = json.load(fh)
+    stored["created_at"] -= 8 * 24 * 60 * 60
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(stored, fh)
+
+    await _call(mcp_client)
+
+    assert mock_monarch_client.get_account_history.call_count == 2
+
+
+async def test_history_tail_fetch_keeps_created_at(mcp_client, mock_monarch_client, monkeypatch):
+    monkeypatch.setattr("monarch_mcp.server._SERIES_TAIL_TTL", 0)
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+    path = os.path.join(cache_dir("account_history"), "acc-1.json")
+    with open(path, encoding="utf-8") as fh:
+        created_at = json.load(fh)["created_at"]
+
+    mock_monarch_client.get_recent_account_balances.return_value = {
+        "accounts": [{"id": "acc-1", "recentBalances": [2000.0]}]
+    }
+    await _call(mcp_client)
+
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh)["created_at"] == created_at
+
+
+async def test_history_dropped_when_transaction_amount_changes(
+    mcp_client, mcp_write_client, mock_monarch_client,
+):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+    await _call(mcp_client, account_id="acc-2")
+    response_cache.set(("transaction", "txn-1"), {"id": "txn-1", "account": {"id": "acc-1"}})
+    mock_monarch_client.update_transaction.return_value = {"updateTransaction": {}}
+
+    await mcp_write_client.call_tool(
+        "update_transaction", {"transaction_id": "txn-1", "amount": -5.0},
+    )
+
+    directory = cache_dir("account_history")
+    assert sorted(os.listdir(directory)) == ["acc-2.json"]
+
+
+async def test_history_kept_when_transaction_notes_change(
+    mcp_client, mcp_write_client, mock_monarch_client,
+):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+    mock_monarch_client.update_transaction.return_value = {"updateTransaction": {}}
+
+    await mcp_write_client.call_tool(
+        "update_transaction", {"transaction_id": "txn-1", "notes": "lunch"},
+    )
+
+    assert os.listdir(cache_dir("account_history")) == ["acc-1.json"]
+
+
+async def test_history_cleared_when_deleted_transaction_account_unknown(
+    mcp_client, mcp_write_client, mock_monarch_client,
+):
+    mock_monarch_client.get_account_history.return_value = _history(-3, 0)
+    await _call(mcp_client)
+    await _call(mcp_client, account_id="acc-2")
+    mock_monarch_client.delete_transaction.return_value = True
+
+    await mcp_write_client.call_tool("delete_transaction", {"transaction_id": "txn-9"})
+
+    assert not os.listdir(cache_dir("account_history"))
@@ -191,12 +191,10 @@ async def test_delete_account_error(mcp_write_client, mock_monarch_client):
 
 
 async def test_account_history_happy(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_account_history.return_value = {
-        "accountHistory": [
-            {"date": "2025-01-01", "balance": 1000},
-            {"date": "2025-01-02", "balance": 1050},
-        ]
-    }
+    mock_monarch_client.get_account_history.return_value = [
+        {"date": "2025-01-01", "signedBalance": 1000, "accountId": "acc-1"},
+        {"date": "2025-01-02", "signedBalance": 1050, "accountId": "acc-1"},
+    ]
 
     result = json.loads(
         (await mcp_client.call_tool(
@@ -204,7 +202,7 @@ async def test_account_history_happy(mcp_client, mock_monarch_client):
         )).content[0].text
     )
 
-    assert len(result["accountHistory"]) == 2
+    assert len(result) == 2
     mock_monarch_client.get_account_history.assert_called_once_with("acc-1")
 
 
@@ -32,7 +32,7 @@ SAMPLE_HOLDING = {
 
 
 async def test_get_accounts_happy_path(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_accounts.return_value = {"accounts": [SAMPLE_ACCOUNT]}
+    mock_monarch_client.gql_call.return_value = {"accounts": [SAMPLE_ACCOUNT]}
 
     result = json.loads((await mcp_client.call_tool("get_accounts")).content[0].text)
 
@@ -81,15 +81,87 @@ async def test_get_account_holdings_invalid_id(mcp_client, mock_monarch_client):
 
 
 async def test_refresh_accounts(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_accounts.return_value = {
+    mock_monarch_client.gql_call.return_value = {
         "accounts": [{"id": "acc-1"}, {"id": "acc-2"}]
     }
     mock_monarch_client.request_accounts_refresh.return_value = {"success": True}
 
     result = json.loads((await mcp_client.call_tool("refresh_accounts")).content[0].text)
 
-    assert result["success"] is True
-    mock_monarch_client.get_accounts.assert_called_once()
+    assert result == {
+        "requested": ["acc-1", "acc-2"], "debounced": [], "result": {"success": True},
+    }
+    mock_monarch_client.gql_call.assert_called_once()
     mock_monarch_client.request_accounts_refresh.assert_called_once_with(
         ["acc-1", "acc-2"]
     )
+
+
+async def test_refresh_accounts_by_id_skips_account_list(mcp_client, mock_monarch_client):
+    mock_monarch_client.request_accounts_refresh.return_value = True
+
+    result = json.loads((await mcp_client.call_tool(
+        "refresh_accounts", {"account_ids": ["acc-2", "acc-2"]},
+    )).content[0].text)
+
+    assert result["requested"] == ["acc-2"]
+    mock_monarch_client.gql_call.assert_not_called()
+    mock_monarch_client.request_accounts_refresh.assert_called_once_with(["acc-2"])
+
+
+async def test_refresh_accounts_by_institution(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"accounts": [
+        {"id": "acc-1", "institution": {"name": "Chase"}},
+        {"id": "acc-2", "institution": {"name": "Ally Bank"}},
+        {"id": "acc-3"},
+    ]}
+    mock_monarch_client.request_accounts_refresh.return_value = True
+
+    await mcp_client.call_tool("get_accounts")
+    result = json.loads((await mcp_client.call_tool(
+        "refresh_accounts", {"institution": "ally"},
+    )).content[0].text)
+
+    assert result["requested"] == ["acc-2"]
+    # Ids were resolved from the cached account list
+    mock_monarch_client.gql_call.assert_called_once()
+    mock_monarch_client.request_accounts_refresh.assert_called_once_with(["acc-2"])
+
+
+async def test_refresh_accounts_debounces_repeats(mcp_client, mock_monarch_client):
+    mock_monarch_client.request_accounts_refresh.return_value = True
+
+    await mcp_client.call_tool("refresh_accounts", {"account_ids": ["acc-1"]})
+    repeat = json.loads((await mcp_client.call_tool(
+        "refresh_accounts", {"account_ids": ["acc-1", "acc-2"]},
+    )).content[0].text)
+    forced = json.loads((await mcp_client.call_tool(
+        "refresh_accounts", {"account_ids": ["acc-1"], "force": True},
+    )).content[0].text)
+
+    assert (repeat["requested"], repeat["debounced"]) == (["acc-2"], ["acc-1"])
+    assert forced["requested"] == ["acc-1"]
+    assert [c.args[0] for c in mock_monarch_client.request_accounts_refresh.call_args_list] == [
+        ["acc-1"], ["acc-2"], ["acc-1"],
+    ]
+
+
+async def test_refresh_accounts_all_debounced(mcp_client, mock_monarch_client):
+    mock_monarch_client.request_accounts_refresh.return_value = True
+    await mcp_client.call_tool("refresh_accounts", {"account_ids": ["acc-1"]})
+
+    result = json.loads((await mcp_client.call_tool(
+        "refresh_accounts", {"account_ids": ["acc-1"]},
+    )).content[0].text)
+
+    assert result == {"requested": [], "debounced": ["acc-1"], "result": None}
+    mock_monarch_client.request_accounts_refresh.assert_called_once()
+
+
+async def test_refresh_accounts_rejects_both_filters(mcp_client, mock_monarch_client):
+    result = json.loads((await mcp_client.call_tool(
+        "refresh_accounts", {"account_ids": ["acc-1"], "institution": "Chase"},
+    )).content[0].text)
+
+    assert "not both" in result["error"]
+    mock_monarch_client.request_accounts_refresh.assert_not_called()
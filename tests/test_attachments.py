@@ -0,0 +1,148 @@
+"""Tests for the upload_attachments tool."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+from gql.transport.exceptions import TransportServerError
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _upload(client, items):
+    result = await client.call_tool("upload_attachments", {"items": items})
+    text = result.content[0].text
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _files(tmp_path, count, size=64):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"receipt-{i}.pdf"
+        path.write_bytes(bytes([i % 256]) * size)
+        paths.append(str(path))
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+async def test_uploads_file_objects(mcp_write_client, mock_monarch_client, tmp_path):
+    received = {}
+
+    async def _fake_upload(transaction_id, fh, filename):
+        received[transaction_id] = (fh.read(), filename)
+        return {"id": f"att-{transaction_id}"}
+
+    mock_monarch_client.upload_attachment.side_effect = _fake_upload
+    paths = _files(tmp_path, 2, size=1000)
+
+    result = await _upload(mcp_write_client, [
+        {"transaction_id": "t0", "path": paths[0]},
+        {"transaction_id": "t1", "path": paths[1]},
+    ])
+
+    assert result["uploaded"] == 2 and result["failed"] == 0
+    assert received["t0"] == (b"\x00" * 1000, "receipt-0.pdf")
+    assert received["t1"] == (b"\x01" * 1000, "receipt-1.pdf")
+    assert result["results"][1] == {
+        "transaction_id": "t1", "path": paths[1], "bytes": 1000,
+        "attachment": {"id": "att-t1"},
+    }
+
+
+async def test_per_item_failures(mcp_write_client, mock_monarch_client, tmp_path):
+    async def _fake_upload(transaction_id, _fh, _filename):
+        if transaction_id == "bad":
+            raise ValueError("upload rejected")
+        return {"id": "ok"}
+
+    mock_monarch_client.upload_attachment.side_effect = _fake_upload
+    paths = _files(tmp_path, 2)
+
+    result = await _upload(mcp_write_client, [
+        {"transaction_id": "good", "path": paths[0]},
+        {"transaction_id": "bad", "path": paths[1]},
+        {"transaction_id": "missing", "path": str(tmp_path / "nope.jpg")},
+        {"path": paths[0]},
+    ])
+
+    assert (result["uploaded"], result["failed"]) == (1, 3)
+    errors = [r.get("error") for r in result["results"]]
+    assert errors[0] is None
+    assert errors[1] == "upload rejected"
+    assert errors[2].startswith("File not found")
+    assert "transaction_id and path" in errors[3]
+    assert mock_monarch_client.upload_attachment.call_count == 2
+
+
+async def test_concurrency_is_limited(mcp_write_client, mock_monarch_client, tmp_path):
+    active = 0
+    peak = 0
+
+    async def _fake_upload(_transaction_id, _fh, _filename):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {}
+
+    mock_monarch_client.upload_attachment.side_effect = _fake_upload
+    paths = _files(tmp_path, 10)
+
+    result = await _upload(
+        mcp_write_client,
+        [{"transaction_id": f"t{i}", "path": p} for i, p in enumerate(paths)],
+    )
+
+    assert result["uploaded"] == 10
+    assert 1 < peak <= 4
+
+
+async def test_auth_error_aborts(mcp_write_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.upload_attachment.side_effect = TransportServerError(
+        "Unauthorized", code=401,
+    )
+    paths = _files(tmp_path, 1)
+
+    result = await _upload(mcp_write_client, [{"transaction_id": "t0", "path": paths[0]}])
+
+    assert "session has expired" in result
+
+
+async def test_empty_items(mcp_write_client, mock_monarch_client):
+    result = await _upload(mcp_write_client, [])
+
+    assert result == {"uploaded": 0, "failed": 0, "results": []}
+    mock_monarch_client.upload_attachment.assert_not_called()
+
+
+async def test_paths_outside_import_dir_are_rejected(
+    mcp_write_client, mock_monarch_client, tmp_path, monkeypatch,
+):
+    imports = tmp_path / "imports"
+    imports.mkdir()
+    monkeypatch.setenv("MONARCH_MCP_IMPORT_DIR", str(imports))
+    outside = _files(tmp_path, 1)[0]
+    inside = _files(imports, 1)[0]
+
+    result = await _upload(mcp_write_client, [
+        {"transaction_id": "t0", "path": "../receipt-0.pdf"},
+        {"transaction_id": "t1", "path": outside},
+        {"transaction_id": "t2", "path": "receipt-0.pdf"},
+    ])
+
+    assert (result["uploaded"], result["failed"]) == (1, 2)
+    for rejected in result["results"][:2]:
+        assert "outside the allowed directory" in rejected["error"]
+    assert result["results"][2]["path"] == inside
+    mock_monarch_client.upload_attachment.assert_called_once()
@@ -0,0 +1,181 @@
+"""Tests for upload_account_balance_history and CSV parsing."""
+# pylint: disable=missing-function-docstring
+
+import json
+from datetime import date, timedelta
+
+from monarch_mcp import balance_upload
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _write_csv(tmp_path, days, header="Date,Amount,Account Name", name="history.csv"):
+    path = tmp_path / name
+    start = date(2020, 1, 1)
+    lines = [header] + [
+        f"{start + timedelta(days=i)},{1000 + i}.50,Savings" for i in range(days)
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+async def _upload(client, **args):
+    events = []
+
+    async def _progress(progress, total, message):
+        events.append((progress, total, message))
+
+    result = await client.call_tool(
+        "upload_account_balance_history", args, progress_handler=_progress,
+    )
+    return json.loads(result.content[0].text), events
+
+
+# ---------------------------------------------------------------------------
+# Tool
+# ---------------------------------------------------------------------------
+
+
+async def test_uploads_in_chunks_with_progress(
+    mcp_write_client, mock_monarch_client, tmp_path,
+):
+    mock_monarch_client.upload_account_balance_history.return_value = True
+    path = _write_csv(tmp_path, 25)
+
+    result, events = await _upload(
+        mcp_write_client, account_id="acc-1", csv_path=path, chunk_size=10,
+    )
+
+    assert result == {
+        "account_id": "acc-1", "rows": 25, "completed": True,
+        "uploaded_rows": 25, "chunks": 3,
+    }
+    calls = mock_monarch_client.upload_account_balance_history.call_args_list
+    assert [len(c.args[1]) for c in calls] == [10, 10, 5]
+    first = calls[0].args[1][0]
+    assert (first.date.date(), first.amount, first.account_name) == (
+        date(2020, 1, 1), 1000.5, "Savings",
+    )
+    assert [(p, t) for p, t, _ in events] == [(0, 25), (10, 25), (20, 25), (25, 25)]
+
+
+async def test_invalid_rows_upload_nothing(mcp_write_client, mock_monarch_client, tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text(
+        "Date,Balance\n2024-01-01,10\n01/02/2024,11\n2024-01-03,abc\n2024-01-01,12\n",
+        encoding="utf-8",
+    )
+
+    result, _ = await _upload(mcp_write_client, account_id="acc-1", csv_path=str(path))
+
+    assert "nothing was uploaded" in result["error"]
+    assert [e["line"] for e in result["invalid_rows"]] == [3, 4, 5]
+    assert "duplicate date" in result["invalid_rows"][2]["error"]
+    mock_monarch_client.upload_account_balance_history.assert_not_called()
+
+
+async def test_missing_header_columns(mcp_write_client, tmp_path):
+    path = _write_csv(tmp_path, 2, header="When,How much,Who")
+
+    result, _ = await _upload(mcp_write_client, account_id="acc-1", csv_path=path)
+
+    assert "Date and Amount" in result["error"]
+
+
+async def test_missing_file(mcp_write_client, tmp_path):
+    result, _ = await _upload(
+        mcp_write_client, account_id="acc-1", csv_path=str(tmp_path / "nope.csv"),
+    )
+
+    assert "File not found" in result["error"]
+
+
+async def test_csv_outside_import_dir_is_rejected(
+    mcp_write_client, mock_monarch_client, tmp_path, monkeypatch,
+):
+    imports = tmp_path / "imports"
+    imports.mkdir()
+    monkeypatch.setenv("MONARCH_MCP_IMPORT_DIR", str(imports))
+    outside = _write_csv(tmp_path, 2)
+    (imports / "link.csv").symlink_to(outside)
+
+    for csv_path in (outside, "../history.csv", "link.csv"):
+        result, _ = await _upload(mcp_write_client, account_id="acc-1", csv_path=csv_path)
+
+        assert "outside the allowed directory" in result["error"]
+    mock_monarch_client.upload_account_balance_history.assert_not_called()
+
+
+async def test_relative_csv_path_is_read_from_import_dir(
+    mcp_write_client, mock_monarch_client, tmp_path,
+):
+    mock_monarch_client.upload_account_balance_history.return_value = True
+    _write_csv(tmp_path, 2)
+
+    result, _ = await _upload(mcp_write_client, account_id="acc-1", csv_path="history.csv")
+
+    assert result["uploaded_rows"] == 2
+
+
+async def test_empty_csv(mcp_write_client, tmp_path):
+    path = _write_csv(tmp_path, 0)
+
+    result, _ = await _upload(mcp_write_client, account_id="acc-1", csv_path=path)
+
+    assert "no balance rows" in result["error"]
+
+
+async def test_invalid_chunk_size(mcp_write_client, tmp_path):
+    path = _write_csv(tmp_path, 2)
+
+    result, _ = await _upload(
+        mcp_write_client, account_id="acc-1", csv_path=path, chunk_size=0,
+    )
+
+    assert "chunk_size" in result["error"]
+
+
+async def test_timeout_stops_after_chunk(mcp_write_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.upload_account_balance_history.side_effect = [True, False]
+    path = _write_csv(tmp_path, 30)
+
+    result, _ = await _upload(
+        mcp_write_client, account_id="acc-1", csv_path=path, chunk_size=10,
+    )
+
+    assert result["completed"] is False
+    assert result["uploaded_rows"] == 10
+    assert "chunk 2" in result["error"]
+    assert mock_monarch_client.upload_account_balance_history.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+def test_iter_chunks_streams_rows(tmp_path):
+    path = _write_csv(tmp_path, 7)
+
+    chunks = list(balance_upload.iter_chunks(path, 3))
+
+    assert [len(c) for c in chunks] == [3, 3, 1]
+    assert chunks[-1][0].amount == 1006.5
+
+
+def test_currency_formatting_and_blank_lines(tmp_path):
+    path = tmp_path / "fmt.csv"
+    path.write_text(
+        "\ufeffdate,balance\n2024-01-01,\"$1,234.56\"\n\n2024-01-02,-5\n",
+        encoding="utf-8",
+    )
+
+    count, errors = balance_upload.validate(str(path))
+    rows = next(balance_upload.iter_chunks(str(path), 10))
+
+    assert (count, errors) == (2, [])
+    assert [r.amount for r in rows] == [1234.56, -5.0]
+    assert rows[0].account_name is None
@@ -0,0 +1,248 @@
+"""Tests for the export_columnar tool (Parquet / Arrow IPC)."""
+# pylint: disable=missing-function-docstring
+
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc  # pylint: disable=wrong-import-position,unused-import
+import pyarrow.parquet as pq  # pylint: disable=wrong-import-position
+
+from monarch_mcp import columnar  # pylint: disable=wrong-import-position
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_txn(i, day):
+    return {
+        "id": f"txn-{i}",
+        "date": day,
+        "amount": -10.5,
+        "plaidName": "STORE",
+        "category": {"id": "cat-1", "name": "Shopping"},
+        "account": {"id": "acc-1", "displayName": "Checking"},
+        "merchant": {"name": "Store"},
+        "notes": None,
+        "pending": False,
+        "isRecurring": True,
+        "tags": [{"name": "Work"}, {"name": "Travel"}],
+    }
+
+
+TXNS = [
+    _make_txn(0, "2025-02-03"),
+    _make_txn(1, "2025-02-01"),
+    _make_txn(2, "2025-01-20"),
+]
+
+
+def _setup(mock_client, txns=TXNS):
+    mock_client.get_accounts.return_value = {
+        "accounts": [{
+            "id": "acc-1",
+            "displayName": "Checking",
+            "type": {"name": "depository"},
+            "currentBalance": 100,
+            "isAsset": True,
+        }]
+    }
+    mock_client.get_transactions.return_value = {"allTransactions": {"results": txns}}
+    mock_client.get_recent_account_balances.return_value = {
+        "accounts": [{"id": "acc-1", "recentBalances": [1.0, 2.0, 3.0]}]
+    }
+
+
+@pytest.fixture(name="out")
+def _out(tmp_path):
+    """Dataset directory inside the export directory."""
+    return tmp_path / "dataset"
+
+
+async def _export(client, **args):
+    return json.loads(
+        (await client.call_tool("export_columnar", args)).content[0].text
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+async def test_parquet_typed_columns(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+
+    result = await _export(mcp_client, output_dir=str(out))
+
+    assert result["rows"] == {"accounts": 1, "transactions": 3, "balances": 3}
+    table = pq.read_table(out / "transactions.parquet")
+    assert table.schema.field("date").type == pa.date32()
+    assert table.schema.field("amount").type == pa.float64()
+    assert table.schema.field("tags").type == pa.list_(pa.string())
+    row = table.to_pylist()[0]
+    assert row["date"] == date(2025, 2, 3)
+    assert row["tags"] == ["Work", "Travel"]
+    assert row["category"] == "Shopping"
+    metadata = pq.ParquetFile(out / "transactions.parquet").metadata
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+    accounts = pq.read_table(out / "accounts.parquet").to_pylist()
+    assert accounts[0]["balance"] == 100.0
+
+
+async def test_row_group_per_page(mcp_client, mock_monarch_client, out, monkeypatch):
+    monkeypatch.setattr("monarch_mcp.server._TRANSACTION_PAGE_SIZE", 2)
+    _setup(mock_monarch_client)
+
+    def _paged(limit, offset, start_date=None, end_date=None, **_filters):
+        rows = [t for t in TXNS if (start_date or "") <= t["date"] <= (end_date or "9999")]
+        return {"allTransactions": {"results": rows[offset:offset + limit]}}
+
+    mock_monarch_client.get_transactions.side_effect = _paged
+
+    await _export(mcp_client, output_dir=str(out))
+
+    assert pq.ParquetFile(out / "transactions.parquet").num_row_groups == 2
+
+
+async def test_arrow_ipc(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+
+    await _export(mcp_client, output_dir=str(out), file_format="arrow")
+
+    with pa.OSFile(str(out / "transactions.arrow"), "rb") as source:
+        table = pa.ipc.open_file(source).read_all()
+    assert table.num_rows == 3
+    assert table.schema.field("date").type == pa.date32()
+
+
+async def test_month_partitions(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+
+    result = await _export(
+        mcp_client,
+        output_dir=str(out),
+        start_date="2025-01-15",
+        end_date="2025-02-10",
+        partition_by_month=True,
+    )
+
+    mock_monarch_client.get_transactions.assert_called_once_with(
+        limit=500, offset=0, start_date="2025-01-01", end_date="2025-02-28",
+    )
+    feb = pq.read_table(out / "transactions" / "month=2025-02" / "data.parquet")
+    jan = pq.read_table(out / "transactions" / "month=2025-01" / "data.parquet")
+    assert feb.num_rows == 2
+    assert jan.num_rows == 1
+    partitions = {f["partition"] for f in result["files"] if f["table"] == "transactions"}
+    assert partitions == {"month=2025-01", "month=2025-02"}
+
+
+async def test_reexport_replaces_only_touched_partitions(
+    mcp_client, mock_monarch_client, out,
+):
+    _setup(mock_monarch_client)
+    args = {"output_dir": str(out), "start_date": "2025-01-01",
+            "end_date": "2025-02-28", "partition_by_month": True}
+    await _export(mcp_client, **args)
+
+    _setup(mock_monarch_client, txns=[_make_txn(9, "2025-02-05")])
+    await _export(mcp_client, **{**args, "start_date": "2025-02-01", "overwrite": True})
+
+    feb = pq.read_table(out / "transactions" / "month=2025-02" / "data.parquet")
+    jan = pq.read_table(out / "transactions" / "month=2025-01" / "data.parquet")
+    assert feb.column("id").to_pylist() == ["txn-9"]
+    assert jan.column("id").to_pylist() == ["txn-2"]
+
+
+async def test_reexport_removes_emptied_partitions(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+    args = {"output_dir": str(out), "start_date": "2025-01-01",
+            "end_date": "2025-02-28", "partition_by_month": True}
+    await _export(mcp_client, **args)
+
+    # January's only transaction was deleted upstream
+    _setup(mock_monarch_client, txns=TXNS[:2])
+    result = await _export(mcp_client, **{**args, "overwrite": True})
+
+    assert not (out / "transactions" / "month=2025-01").exists()
+    assert (out / "transactions" / "month=2025-02" / "data.parquet").exists()
+    assert {f["partition"] for f in result["files"] if f["table"] == "transactions"} == {
+        "month=2025-02",
+    }
+
+
+async def test_existing_dataset_needs_overwrite(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+    await _export(mcp_client, output_dir=str(out))
+    mock_monarch_client.get_accounts.reset_mock()
+
+    result = await _export(mcp_client, output_dir=str(out))
+
+    assert "overwrite" in result["error"]
+    mock_monarch_client.get_accounts.assert_not_called()
+
+
+async def test_output_dir_outside_export_dir(mcp_client, mock_monarch_client, tmp_path):
+    for output_dir in ("../dataset", str(tmp_path.parent / "dataset")):
+        result = await _export(mcp_client, output_dir=output_dir)
+
+        assert "outside the allowed directory" in result["error"]
+    mock_monarch_client.get_accounts.assert_not_called()
+
+
+async def test_balances_rows(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+
+    await _export(mcp_client, output_dir=str(out))
+
+    first = date.today() - timedelta(days=365)
+    rows = pq.read_table(out / "balances.parquet").to_pylist()
+    assert rows[0] == {"date": first, "account_id": "acc-1", "balance": 1.0}
+    mock_monarch_client.get_recent_account_balances.assert_called_once_with(
+        start_date=first.isoformat(),
+    )
+
+
+async def test_failure_leaves_no_partial_files(mcp_client, mock_monarch_client, out):
+    _setup(mock_monarch_client)
+    mock_monarch_client.get_recent_account_balances.side_effect = Exception("API down")
+
+    result = (await mcp_client.call_tool(
+        "export_columnar", {"output_dir": str(out)}
+    )).content[0].text
+
+    assert "Error exporting columnar dataset" in result
+    leftovers = [f for _, _, files in os.walk(out) for f in files]
+    assert leftovers == []
+
+
+async def test_invalid_format(mcp_client):
+    result = await _export(mcp_client, file_format="csv")
+    assert "error" in result
+
+
+async def test_missing_pyarrow(mcp_client, mock_monarch_client, out, monkeypatch):
+    _setup(mock_monarch_client)
+
+    def _missing():
+        raise RuntimeError("Columnar export requires pyarrow.")
+
+    monkeypatch.setattr("monarch_mcp.columnar._pyarrow", _missing)
+
+    result = (await mcp_client.call_tool(
+        "export_columnar", {"output_dir": str(out)}
+    )).content[0].text
+
+    assert "requires pyarrow" in result
+
+
+def test_month_partitions_span_year_end():
+    assert columnar.month_partitions(date(2024, 11, 15), date(2025, 2, 1)) == {
+        "month=2024-11", "month=2024-12", "month=2025-01", "month=2025-02",
+    }
@@ -0,0 +1,151 @@
+"""Tests for the response size budget and get_continuation."""
+# pylint: disable=missing-function-docstring
+
+import json
+
+import pytest
+
+from monarch_mcp import continuation
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _big_budget(n):
+    return {"budgetData": {"items": [{"id": f"b{i}", "note": f'say "{i}"'} for i in range(n)]}}
+
+
+async def _text(client, name, args=None):
+    return (await client.call_tool(name, args or {})).content[0].text
+
+
+async def _collect(client, first_text, limit):
+    """Follow continuation tokens; return (joined text, number of chunks)."""
+    envelope = json.loads(first_text)
+    chunks = [envelope["chunk"]]
+    while envelope["continuation_token"]:
+        text = await _text(
+            client, "get_continuation",
+            {"continuation_token": envelope["continuation_token"]},
+        )
+        assert len(text) <= limit
+        envelope = json.loads(text)
+        chunks.append(envelope["chunk"])
+    return "".join(chunks), len(chunks)
+
+
+# ---------------------------------------------------------------------------
+# Tool integration
+# ---------------------------------------------------------------------------
+
+
+async def test_small_result_is_returned_whole(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_budgets.return_value = _big_budget(3)
+
+    result = json.loads(await _text(mcp_client, "get_budgets"))
+
+    assert result == _big_budget(3)
+
+
+async def test_large_result_is_chunked(mcp_client, mock_monarch_client, monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_MAX_RESPONSE_CHARS", "2000")
+    mock_monarch_client.get_budgets.return_value = _big_budget(200)
+
+    first = await _text(mcp_client, "get_budgets")
+    assert len(first) <= 2000
+    joined, count = await _collect(mcp_client, first, 2000)
+
+    assert count > 1
+    assert joined == json.dumps(_big_budget(200), indent=2, default=str)
+
+
+@pytest.mark.parametrize("tool, method", [
+    ("get_cashflow", "get_cashflow"),
+    ("get_recurring_transactions", "get_recurring_transactions"),
+])
+async def test_other_tools_use_budget(
+    mcp_client, mock_monarch_client, monkeypatch, tool, method,
+):
+    monkeypatch.setenv("MONARCH_MCP_MAX_RESPONSE_CHARS", "1500")
+    payload = {"rows": [{"i": i, "label": "x" * 40} for i in range(100)]}
+    getattr(mock_monarch_client, method).return_value = payload
+
+    first = await _text(mcp_client, tool)
+    joined, _ = await _collect(mcp_client, first, 1500)
+
+    assert json.loads(joined) == payload
+
+
+async def test_account_history_uses_budget(mcp_client, mock_monarch_client, monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_MAX_RESPONSE_CHARS", "1500")
+    history = [
+        {"date": f"2024-01-{d:02d}", "signedBalance": float(d), "accountName": "Checking"}
+        for d in range(1, 29)
+    ]
+    mock_monarch_client.get_account_history.return_value = history
+
+    first = await _text(mcp_client, "get_account_history", {"account_id": "a1"})
+    joined, _ = await _collect(mcp_client, first, 1500)
+
+    assert [p["date"] for p in json.loads(joined)] == [p["date"] for p in history]
+
+
+async def test_zero_budget_disables_chunking(mcp_client, mock_monarch_client, monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_MAX_RESPONSE_CHARS", "0")
+    mock_monarch_client.get_budgets.return_value = _big_budget(500)
+
+    result = json.loads(await _text(mcp_client, "get_budgets"))
+
+    assert result == _big_budget(500)
+
+
+async def test_unknown_token_returns_error(mcp_client):
+    token = continuation._encode_token("missing", 10)  # pylint: disable=protected-access
+
+    result = json.loads(
+        await _text(mcp_client, "get_continuation", {"continuation_token": token})
+    )
+
+    assert "expired" in result["error"]
+
+
+async def test_malformed_token_returns_error(mcp_client):
+    result = json.loads(
+        await _text(mcp_client, "get_continuation", {"continuation_token": "!!!"})
+    )
+
+    assert "Malformed" in result["error"]
+
+
+# ---------------------------------------------------------------------------
+# Module
+# ---------------------------------------------------------------------------
+
+
+def test_token_can_be_redeemed_twice():
+    text = json.dumps(list(range(2000)))
+    token = json.loads(continuation.paginate(text, limit=2000))["continuation_token"]
+
+    assert continuation.resume(token, limit=2000) == continuation.resume(token, limit=2000)
+
+
+def test_escaped_chunks_fit_budget():
+    text = json.dumps(['"quoted"\\' * 20 for _ in range(200)])
+
+    first = continuation.paginate(text, limit=3000)
+    envelopes = [json.loads(first)]
+    while envelopes[-1]["continuation_token"]:
+        page = continuation.resume(envelopes[-1]["continuation_token"], limit=3000)
+        assert len(page) <= 3000
+        envelopes.append(json.loads(page))
+
+    assert len(first) <= 3000
+    assert "".join(e["chunk"] for e in envelopes) == text
+
+
+def test_invalid_env_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_MAX_RESPONSE_CHARS", "lots")
+
+    assert continuation.max_response_chars() == continuation.DEFAULT_MAX_RESPONSE_CHARS
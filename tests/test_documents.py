@@ -0,0 +1,114 @@
+"""Tests for the named GraphQL document registry."""
+# pylint: disable=missing-function-docstring
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from monarch_mcp import documents, queries
+
+_PING = """
+query MCP_TestPing {
+    me {
+        id
+    }
+}
+"""
+
+
+@pytest.fixture(autouse=True, name="registry")
+def _registry():
+    """Isolate each test's definitions and counters."""
+    # pylint: disable=protected-access
+    with patch.dict(documents._sources), patch.dict(documents._parsed):
+        documents.reset_stats()
+        yield
+    documents.reset_stats()
+
+
+# ---------------------------------------------------------------------------
+# Definitions
+# ---------------------------------------------------------------------------
+
+
+def test_define_is_lazy_and_get_parses_once():
+    name = documents.define("MCP_TestPing", _PING)
+
+    assert name == "MCP_TestPing"
+    assert name not in documents.stats()["parsed"]
+    with patch("monarch_mcp.documents.gql", wraps=documents.gql) as parse:
+        first = documents.get(name)
+        second = documents.get(name)
+
+    assert first is second
+    parse.assert_called_once()
+    assert name in documents.stats()["parsed"]
+
+
+def test_redefining_with_same_text_is_allowed():
+    documents.define("MCP_TestPing", _PING)
+
+    assert documents.define("MCP_TestPing", _PING) == "MCP_TestPing"
+
+
+def test_redefining_with_other_text_fails():
+    documents.define("MCP_TestPing", _PING)
+
+    with pytest.raises(ValueError, match="already defined"):
+        documents.define("MCP_TestPing", _PING.replace("id", "name"))
+
+
+def test_unknown_operation_fails():
+    with pytest.raises(KeyError, match="MCP_Missing"):
+        documents.get("MCP_Missing")
+
+
+def test_name_must_match_operation():
+    documents.define("MCP_Other", _PING)
+
+    with pytest.raises(ValueError, match="MCP_TestPing"):
+        documents.get("MCP_Other")
+
+
+# ---------------------------------------------------------------------------
+# Execution and metrics
+# ---------------------------------------------------------------------------
+
+
+async def test_execute_counts_calls_and_errors(mock_monarch_client):
+    documents.define("MCP_TestPing", _PING)
+    mock_monarch_client.gql_call.return_value = {"me": {"id": "u1"}}
+
+    assert await documents.execute(mock_monarch_client, "MCP_TestPing") == {"me": {"id": "u1"}}
+    mock_monarch_client.gql_call.side_effect = RuntimeError("upstream timeout")
+    with pytest.raises(RuntimeError):
+        await documents.execute(mock_monarch_client, "MCP_TestPing")
+
+    assert mock_monarch_client.gql_call.call_args.kwargs == {
+        "operation": "MCP_TestPing",
+        "graphql_query": documents.get("MCP_TestPing"),
+        "variables": {},
+    }
+    assert documents.stats()["operations"] == {"MCP_TestPing": {"calls": 2, "errors": 1}}
+
+
+async def test_delete_tag_uses_registered_mutation(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"deleteTransactionTag": {}}
+
+    await mcp_write_client.call_tool("delete_transaction_tag", {"tag_id": "g1"})
+    await mcp_write_client.call_tool("delete_transaction_tag", {"tag_id": "g2"})
+
+    first, second = mock_monarch_client.gql_call.call_args_list
+    assert first.kwargs["graphql_query"] is second.kwargs["graphql_query"]
+    assert first.kwargs["graphql_query"] is documents.get("Common_DeleteTransactionTag")
+
+
+async def test_server_metrics_report_operations(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"accounts": []}
+    await mcp_client.call_tool("get_accounts", {})
+
+    result = json.loads((await mcp_client.call_tool("get_server_metrics", {})).content[0].text)
+
+    assert result["graphql"]["operations"][queries.ACCOUNTS_QUERY] == {"calls": 1, "errors": 0}
+    assert queries.ACCOUNTS_QUERY in result["graphql"]["parsed"]
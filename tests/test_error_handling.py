@@ -1,4 +1,4 @@
-"""Exception handling tests for run_async, MCP tool decorator, and auth handlers."""
+"""Exception handling tests for await_async, MCP tool decorator, and auth handlers."""
 # pylint: disable=missing-function-docstring,protected-access
 
 from unittest.mock import patch, Mock
@@ -7,16 +7,16 @@ import pytest
 from gql.transport.exceptions import TransportServerError, TransportQueryError, TransportError
 from monarchmoney import LoginFailedException
 
-from monarch_mcp.server import run_async
+from monarch_mcp.server import await_async
 from monarch_mcp.auth_server import _AuthHandler, _AuthState
 
 
 # ===================================================================
-# run_async — narrowed exception handling
+# await_async — narrowed exception handling
 # ===================================================================
 
 
-def test_run_async_auth_401_triggers_recovery():
+async def test_await_async_auth_401_triggers_recovery():
     """TransportServerError 401 triggers token deletion and re-auth."""
     async def _failing():
         raise TransportServerError("Unauthorized", code=401)
@@ -26,13 +26,13 @@ def test_run_async_auth_401_triggers_recovery():
         patch("monarch_mcp.server.trigger_auth_flow") as mock_auth,
     ):
         with pytest.raises(RuntimeError, match="session has expired"):
-            run_async(_failing())
+            await await_async(_failing())
 
         mock_session.delete_token.assert_called_once()
         mock_auth.assert_called_once()
 
 
-def test_run_async_login_failed_triggers_recovery():
+async def test_await_async_login_failed_triggers_recovery():
     """LoginFailedException triggers token deletion and re-auth."""
     async def _failing():
         raise LoginFailedException()
@@ -42,13 +42,13 @@ def test_run_async_login_failed_triggers_recovery():
         patch("monarch_mcp.server.trigger_auth_flow") as mock_auth,
     ):
         with pytest.raises(RuntimeError, match="session has expired"):
-            run_async(_failing())
+            await await_async(_failing())
 
         mock_session.delete_token.assert_called_once()
         mock_auth.assert_called_once()
 
 
-def test_run_async_non_auth_500_propagates():
+async def test_await_async_non_auth_500_propagates():
     """Non-auth TransportServerError (500) propagates without recovery."""
     async def _failing():
         raise TransportServerError("Internal Server Error", code=500)
@@ -58,14 +58,14 @@ def test_run_async_non_auth_500_propagates():
         patch("monarch_mcp.server.trigger_auth_flow") as mock_auth,
     ):
         with pytest.raises(TransportServerError):
-            run_async(_failing())
+            await await_async(_failing())
 
         mock_session.delete_token.assert_not_called()
         mock_auth.assert_not_called()
 
 
-def test_run_async_generic_exception_propagates():
-    """Generic exceptions bypass run_async entirely — not caught."""
+async def test_await_async_generic_exception_propagates():
+    """Generic exceptions bypass await_async entirely — not caught."""
     async def _failing():
         raise ValueError("something went wrong")
 
@@ -74,14 +74,14 @@ def test_run_async_generic_exception_propagates():
         patch("monarch_mcp.server.trigger_auth_flow") as mock_auth,
     ):
         with pytest.raises(ValueError, match="something went wrong"):
-            run_async(_failing())
+            await await_async(_failing())
 
         mock_session.delete_token.assert_not_called()
         mock_auth.assert_not_called()
 
 
-def test_run_async_transport_query_error_propagates():
-    """TransportQueryError is not caught by run_async."""
+async def test_await_async_transport_query_error_propagates():
+    """TransportQueryError is not caught by await_async."""
     async def _failing():
         raise TransportQueryError("Invalid query")
 
@@ -90,7 +90,7 @@ def test_run_async_transport_query_error_propagates():
         patch("monarch_mcp.server.trigger_auth_flow") as mock_auth,
     ):
         with pytest.raises(TransportQueryError):
-            run_async(_failing())
+            await await_async(_failing())
 
         mock_session.delete_token.assert_not_called()
         mock_auth.assert_not_called()
@@ -103,7 +103,7 @@ def test_run_async_transport_query_error_propagates():
 
 async def test_tool_runtime_error(mcp_client, mock_monarch_client):
     """RuntimeError (e.g., auth recovery) returns error string."""
-    mock_monarch_client.get_accounts.side_effect = RuntimeError("session expired")
+    mock_monarch_client.gql_call.side_effect = RuntimeError("session expired")
 
     result = (await mcp_client.call_tool("get_accounts")).content[0].text
 
@@ -113,7 +113,7 @@ async def test_tool_runtime_error(mcp_client, mock_monarch_client):
 
 async def test_tool_transport_server_error(mcp_client, mock_monarch_client):
     """TransportServerError includes HTTP status code in error."""
-    mock_monarch_client.get_accounts.side_effect = TransportServerError(
+    mock_monarch_client.gql_call.side_effect = TransportServerError(
         "Internal Server Error", code=500,
     )
 
@@ -125,7 +125,7 @@ async def test_tool_transport_server_error(mcp_client, mock_monarch_client):
 
 async def test_tool_transport_query_error(mcp_client, mock_monarch_client):
     """TransportQueryError returns query-specific error."""
-    mock_monarch_client.get_accounts.side_effect = TransportQueryError(
+    mock_monarch_client.gql_call.side_effect = TransportQueryError(
         "Validation error",
     )
 
@@ -137,7 +137,7 @@ async def test_tool_transport_query_error(mcp_client, mock_monarch_client):
 
 async def test_tool_transport_error(mcp_client, mock_monarch_client):
     """TransportError returns connection-specific error."""
-    mock_monarch_client.get_accounts.side_effect = TransportError(
+    mock_monarch_client.gql_call.side_effect = TransportError(
         "Connection refused",
     )
 
@@ -149,7 +149,7 @@ async def test_tool_transport_error(mcp_client, mock_monarch_client):
 
 async def test_tool_unexpected_error(mcp_client, mock_monarch_client):
     """Generic Exception returns catch-all error."""
-    mock_monarch_client.get_accounts.side_effect = ValueError("weird error")
+    mock_monarch_client.gql_call.side_effect = ValueError("weird error")
 
     result = (await mcp_client.call_tool("get_accounts")).content[0].text
 
@@ -0,0 +1,189 @@
+"""Tests for the export_transactions tool."""
+# pylint: disable=missing-function-docstring
+
+import csv
+import hashlib
+import json
+import os
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _make_txn(i):
+    return {
+        "id": f"txn-{i}",
+        "date": "2025-01-15",
+        "amount": -1.0 * (i + 1),
+        "plaidName": f"STORE #{i}",
+        "category": {"name": "Shopping"},
+        "account": {"displayName": "Checking"},
+        "merchant": {"name": f"Store {i}"},
+        "notes": None,
+        "pending": False,
+        "isRecurring": False,
+        "tags": [{"id": "t1", "name": "Work", "color": "#000000"}],
+    }
+
+
+def _paged(total):
+    """side_effect returning pages of a result set of *total* transactions."""
+    def _get_transactions(limit, offset, **_filters):
+        count = max(0, min(limit, total - offset))
+        return {"allTransactions": {"results": [_make_txn(offset + i) for i in range(count)]}}
+    return _get_transactions
+
+
+async def _export(client, **args):
+    return json.loads(
+        (await client.call_tool("export_transactions", args)).content[0].text
+    )
+
+
+def _sha256(path):
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+async def test_export_csv_pages_through_all(mcp_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.get_transactions.side_effect = _paged(1200)
+    path = str(tmp_path / "out.csv")
+
+    result = await _export(mcp_client, output_path=path)
+
+    assert result["rows"] == 1200
+    assert result["path"] == path
+    assert result["sha256"] == _sha256(path)
+    assert mock_monarch_client.get_transactions.call_count == 3
+    with open(path, encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert len(rows) == 1200
+    assert rows[0]["id"] == "txn-0"
+    assert rows[0]["tags"] == "Work"
+    assert rows[-1]["id"] == "txn-1199"
+
+
+async def test_export_ndjson(mcp_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.get_transactions.side_effect = _paged(3)
+    path = str(tmp_path / "out.ndjson")
+
+    result = await _export(mcp_client, output_path=path, file_format="ndjson")
+
+    with open(path, encoding="utf-8") as fh:
+        rows = [json.loads(line) for line in fh]
+    assert result["rows"] == 3
+    assert result["bytes"] == os.path.getsize(path)
+    assert rows[1]["id"] == "txn-1"
+    assert rows[1]["tags"][0]["name"] == "Work"
+
+
+async def test_export_passes_filters(mcp_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.get_transactions.side_effect = _paged(0)
+
+    await _export(
+        mcp_client,
+        output_path=str(tmp_path / "out.csv"),
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+        account_ids=["acc-1"],
+    )
+
+    mock_monarch_client.get_transactions.assert_called_once_with(
+        limit=500,
+        offset=0,
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+        account_ids=["acc-1"],
+    )
+
+
+async def test_export_default_path(mcp_client, mock_monarch_client, tmp_path, monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_EXPORT_DIR", str(tmp_path / "exports"))
+    mock_monarch_client.get_transactions.side_effect = _paged(1)
+
+    result = await _export(mcp_client, file_format="ndjson")
+
+    assert result["path"].startswith(str(tmp_path / "exports"))
+    assert result["path"].endswith(".ndjson")
+    assert os.path.exists(result["path"])
+
+
+async def test_export_refuses_overwrite(mcp_client, tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("keep me")
+
+    result = await _export(mcp_client, output_path=str(path))
+
+    assert "already exists" in result["error"]
+    assert path.read_text() == "keep me"
+
+
+async def test_export_rejects_paths_outside_export_dir(
+    mcp_client, mock_monarch_client, tmp_path,
+):
+    outside = tmp_path.parent / "elsewhere.csv"
+
+    for output_path in ("../elsewhere.csv", str(outside)):
+        result = await _export(mcp_client, output_path=output_path)
+
+        assert "outside the allowed directory" in result["error"]
+    assert not outside.exists()
+    mock_monarch_client.get_transactions.assert_not_called()
+
+
+async def test_export_rejects_symlink_out_of_export_dir(mcp_client, tmp_path):
+    target = tmp_path.parent / f"{tmp_path.name}-target"
+    target.mkdir()
+    (tmp_path / "link").symlink_to(target)
+
+    result = await _export(mcp_client, output_path="link/out.csv")
+
+    assert "outside the allowed directory" in result["error"]
+
+
+async def test_export_relative_path_is_inside_export_dir(
+    mcp_client, mock_monarch_client, tmp_path,
+):
+    mock_monarch_client.get_transactions.side_effect = _paged(2)
+
+    result = await _export(mcp_client, output_path="nested/out.csv")
+
+    assert result["path"] == str(tmp_path / "nested" / "out.csv")
+    assert result["rows"] == 2
+
+
+async def test_export_failure_removes_partial(mcp_client, mock_monarch_client, tmp_path):
+    calls = {"n": 0}
+
+    def _fail_second_page(limit, offset, **_filters):
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise Exception("API down")
+        return {"allTransactions": {"results": [_make_txn(i) for i in range(limit)]}}
+
+    mock_monarch_client.get_transactions.side_effect = _fail_second_page
+    path = tmp_path / "out.csv"
+
+    result = (await mcp_client.call_tool(
+        "export_transactions", {"output_path": str(path)}
+    )).content[0].text
+
+    assert "Error exporting transactions" in result
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_export_invalid_format(mcp_client):
+    result = await _export(mcp_client, file_format="xlsx")
+    assert "error" in result
+
+
+async def test_export_only_start_date(mcp_client):
+    result = await _export(mcp_client, start_date="2025-01-01")
+    assert "error" in result
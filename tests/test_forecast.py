@@ -0,0 +1,203 @@
+"""Tests for the forecast_cashflow tool and forecast helpers."""
+# pylint: disable=missing-function-docstring
+
+import json
+from datetime import date, timedelta
+
+from monarch_mcp import forecast
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+TODAY = date.today()
+
+
+def _day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+ACCOUNTS = {
+    "accounts": [
+        {"id": "acc-1", "displayName": "Checking", "currentBalance": 1000.0},
+        {"id": "acc-2", "displayName": "Savings", "currentBalance": 5000.0},
+    ]
+}
+
+RECURRING = {
+    "recurringTransactionItems": [
+        {
+            "date": _day(5),
+            "isPast": False,
+            "amount": -200.0,
+            "account": {"id": "acc-1"},
+            "stream": {"amount": -200.0},
+        },
+        {
+            "date": _day(35),
+            "isPast": False,
+            "amount": None,
+            "account": {"id": "acc-1"},
+            "stream": {"amount": 1500.0},
+        },
+        {
+            "date": _day(-2),
+            "isPast": True,
+            "amount": -999.0,
+            "account": {"id": "acc-1"},
+        },
+    ]
+}
+
+
+def _history(amounts):
+    return {
+        "allTransactions": {
+            "results": [
+                {
+                    "id": f"txn-{i}",
+                    "amount": amount,
+                    "account": {"id": "acc-1"},
+                    "category": {"name": "Groceries"},
+                }
+                for i, amount in enumerate(amounts)
+            ]
+        }
+    }
+
+
+def _setup(mock_client, history_amounts=(-90.0,)):
+    mock_client.get_accounts.return_value = ACCOUNTS
+    mock_client.get_recurring_transactions.return_value = RECURRING
+    mock_client.get_transactions.return_value = _history(history_amounts)
+
+
+async def _call(client, **args):
+    return json.loads(
+        (await client.call_tool("forecast_cashflow", args)).content[0].text
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tool tests
+# ---------------------------------------------------------------------------
+
+
+async def test_forecast_projection(mcp_client, mock_monarch_client):
+    _setup(mock_monarch_client, history_amounts=(-60.0, -30.0))
+
+    result = await _call(mcp_client)
+
+    assert result["horizon_days"] == 90
+    assert len(result["accounts"]) == 1
+    acct = result["accounts"][0]
+    assert acct["id"] == "acc-1"
+    assert acct["daily_run_rate"] == -1.0
+    assert acct["run_rate_by_category"] == {"Groceries": -1.0}
+    # 1000 - 200 (day 5) - 30 days of run-rate
+    assert acct["projected_balance"]["30"] == 770.0
+    # + 1500 paycheck on day 35, - 60 days of run-rate
+    assert acct["projected_balance"]["60"] == 2240.0
+    assert acct["projected_balance"]["90"] == 2210.0
+    assert acct["lowest_balance"]["date"] == _day(34)
+    assert acct["scheduled_count"] == 2
+    assert result["total_projected_balance"]["90"] == 2210.0
+
+
+async def test_forecast_fetch_arguments(mcp_client, mock_monarch_client):
+    _setup(mock_monarch_client)
+
+    await _call(mcp_client, horizon_days=30, lookback_days=10)
+
+    mock_monarch_client.get_recurring_transactions.assert_called_once_with(
+        start_date=_day(0), end_date=_day(30),
+    )
+    mock_monarch_client.get_transactions.assert_called_once_with(
+        limit=500,
+        offset=0,
+        start_date=_day(-10),
+        end_date=_day(-1),
+        is_recurring=False,
+    )
+
+
+async def test_forecast_include_daily(mcp_client, mock_monarch_client):
+    _setup(mock_monarch_client)
+
+    result = await _call(mcp_client, horizon_days=10, include_daily=True)
+
+    daily = result["accounts"][0]["daily"]
+    assert len(daily) == 11
+    assert daily[0] == {"date": _day(0), "balance": 1000.0}
+    assert list(result["total_projected_balance"]) == ["10"]
+
+
+async def test_forecast_run_rates_cached(mcp_client, mock_monarch_client):
+    _setup(mock_monarch_client)
+
+    first = await _call(mcp_client)
+    second = await _call(mcp_client)
+
+    assert first == second
+    mock_monarch_client.get_transactions.assert_called_once()
+    assert mock_monarch_client.get_accounts.call_count == 2
+
+
+async def test_forecast_recomputes_when_inputs_change(mcp_client, mock_monarch_client):
+    _setup(mock_monarch_client)
+    first = await _call(mcp_client)
+
+    mock_monarch_client.get_accounts.return_value = {
+        "accounts": [{"id": "acc-1", "displayName": "Checking", "currentBalance": 0.0}]
+    }
+    second = await _call(mcp_client)
+
+    assert second["accounts"][0]["current_balance"] == 0.0
+    assert first["accounts"][0]["current_balance"] == 1000.0
+
+
+async def test_forecast_zero_lookback_skips_history(mcp_client, mock_monarch_client):
+    _setup(mock_monarch_client)
+
+    result = await _call(mcp_client, lookback_days=0)
+
+    mock_monarch_client.get_transactions.assert_not_called()
+    assert result["accounts"][0]["daily_run_rate"] == 0.0
+
+
+async def test_forecast_invalid_horizon(mcp_client):
+    result = await _call(mcp_client, horizon_days=0)
+    assert "error" in result
+
+
+async def test_forecast_invalid_lookback(mcp_client):
+    result = await _call(mcp_client, lookback_days=400)
+    assert "error" in result
+
+
+async def test_forecast_api_error(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.side_effect = Exception("API down")
+
+    result = (await mcp_client.call_tool("forecast_cashflow")).content[0].text
+
+    assert "Error forecasting cashflow" in result
+
+
+# ---------------------------------------------------------------------------
+# Helper tests
+# ---------------------------------------------------------------------------
+
+
+def test_scheduled_items_filters_window():
+    items = forecast.scheduled_items(
+        RECURRING["recurringTransactionItems"], TODAY, horizon_days=30,
+    )
+    assert items == [("acc-1", 5, -200.0)]
+
+
+def test_run_rates_uncategorized():
+    rates = forecast.category_run_rates(
+        [{"amount": -10.0, "account": {"id": "a"}, "category": None}], 10,
+    )
+    assert rates == {"a": {"Uncategorized": -1.0}}
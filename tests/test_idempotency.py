@@ -0,0 +1,163 @@
+"""Tests for idempotency keys on write tools."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+import pytest
+
+from monarch_mcp import idempotency, tenants
+from monarch_mcp.server import mcp
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+_TXN = {
+    "account_id": "a1", "amount": -12.5, "merchant_name": "Cafe",
+    "category_id": "c1", "date": "2025-01-15",
+}
+
+
+async def _call(client, tool, **args):
+    return json.loads((await client.call_tool(tool, args)).content[0].text)
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+
+async def test_every_write_tool_accepts_a_key():
+    # Write tools are the ones disabled in the default read-only mode
+    write_tools = [tool for tool in (await mcp.get_tools()).values() if not tool.enabled]
+
+    assert len(write_tools) == 15
+    for tool in write_tools:
+        assert "idempotency_key" in tool.parameters["properties"], tool.name
+
+
+async def test_repeat_returns_first_result(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.create_transaction.return_value = {"id": "txn-1"}
+
+    first = await _call(mcp_write_client, "create_transaction", **_TXN, idempotency_key="k1")
+    second = await _call(mcp_write_client, "create_transaction", **_TXN, idempotency_key="k1")
+
+    assert first == second == {"id": "txn-1"}
+    mock_monarch_client.create_transaction.assert_awaited_once()
+
+
+async def test_calls_without_key_are_not_deduplicated(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.create_transaction_tag.return_value = {"id": "tag-1"}
+
+    for _ in range(2):
+        await _call(mcp_write_client, "create_transaction_tag", name="Work", color="#19D2A5")
+
+    assert mock_monarch_client.create_transaction_tag.await_count == 2
+
+
+async def test_key_reused_with_other_arguments(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.create_transaction.return_value = {"id": "txn-1"}
+    await _call(mcp_write_client, "create_transaction", **_TXN, idempotency_key="k1")
+
+    result = json.loads((await mcp_write_client.call_tool(
+        "create_transaction", dict(_TXN, amount=-99.0, idempotency_key="k1"),
+    )).content[0].text)
+
+    assert "different arguments" in result["error"]
+    mock_monarch_client.create_transaction.assert_awaited_once()
+
+
+async def test_failed_write_can_be_retried(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.create_transaction.side_effect = [
+        RuntimeError("upstream timeout"), {"id": "txn-1"},
+    ]
+
+    failed = (await mcp_write_client.call_tool(
+        "create_transaction", dict(_TXN, idempotency_key="k1"),
+    )).content[0].text
+    retried = await _call(mcp_write_client, "create_transaction", **_TXN, idempotency_key="k1")
+
+    assert failed.startswith("Error creating transaction")
+    assert retried == {"id": "txn-1"}
+
+
+async def test_validation_errors_are_not_recorded(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.create_transaction_tag.return_value = {"id": "tag-1"}
+
+    bad = await _call(
+        mcp_write_client, "create_transaction_tag", name="Work", color="red",
+        idempotency_key="k2",
+    )
+    good = await _call(
+        mcp_write_client, "create_transaction_tag", name="Work", color="#19D2A5",
+        idempotency_key="k2",
+    )
+
+    assert "Invalid color" in bad["error"]
+    assert good == {"id": "tag-1"}
+
+
+async def test_concurrent_repeat_is_refused(mcp_write_client, mock_monarch_client, tmp_path):
+    release = asyncio.Event()
+
+    async def _slow_upload(*_args):
+        await release.wait()
+        return {"id": "att-1"}
+
+    receipt = tmp_path / "receipt.pdf"
+    receipt.write_bytes(b"%PDF")
+    mock_monarch_client.upload_attachment.side_effect = _slow_upload
+    args = {"items": [{"transaction_id": "t1", "path": str(receipt)}], "idempotency_key": "k3"}
+
+    first = asyncio.create_task(mcp_write_client.call_tool("upload_attachments", args))
+    await asyncio.sleep(0.05)
+    second = await _call(mcp_write_client, "upload_attachments", **args)
+    release.set()
+    await first
+
+    assert "still in progress" in second["error"]
+    mock_monarch_client.upload_attachment.assert_awaited_once()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+def test_results_survive_restart(tmp_path):
+    path = str(tmp_path / "idem.sqlite3")
+    store = idempotency.IdempotencyStore(path)
+    assert store.claim("k", "digest") == ("claimed", None)
+    store.record("k", '{"id": "txn-1"}')
+
+    assert idempotency.IdempotencyStore(path).claim("k", "digest") == ("done", '{"id": "txn-1"}')
+
+
+def test_abandoned_claim_expires(tmp_path, monkeypatch):
+    store = idempotency.IdempotencyStore(str(tmp_path / "idem.sqlite3"))
+    store.claim("k", "digest")
+
+    assert store.claim("k", "digest") == ("pending", None)
+    monkeypatch.setattr(idempotency, "PENDING_TIMEOUT", 0)
+    assert store.claim("k", "digest") == ("claimed", None)
+
+
+def test_keys_are_per_tenant():
+    default_store = idempotency.store()
+    with tenants.use("house-b"):
+        other_store = idempotency.store()
+
+    assert default_store is not other_store
+
+
+@pytest.mark.parametrize("result, is_error", [
+    ('{"id": "1"}', False),
+    ('{"error": "bad"}', True),
+    ("Error creating transaction: boom", True),
+    ("[]", False),
+])
+def test_error_results_detected(result, is_error):
+    assert idempotency._is_error(result) is is_error  # pylint: disable=protected-access
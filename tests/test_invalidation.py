@@ -0,0 +1,210 @@
+"""Tests for the write tool -> cached data dependency map."""
+# pylint: disable=missing-function-docstring
+
+import json
+
+import pytest
+
+from monarch_mcp import invalidation
+from monarch_mcp.cache import response_cache
+from monarch_mcp.server import mcp
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+# Arguments for one call of each write tool
+_CALLS = {
+    "create_transaction": {
+        "account_id": "a1", "amount": -12.5, "merchant_name": "Cafe",
+        "category_id": "c1", "date": "2025-01-15",
+    },
+    "update_transaction": {"transaction_id": "t1", "notes": "Lunch"},
+    "delete_transaction": {"transaction_id": "t1"},
+    "upload_attachments": {"items": []},
+    "create_transaction_tag": {"name": "Work", "color": "#19D2A5"},
+    "delete_transaction_tag": {"tag_id": "g1"},
+    "set_transaction_tags": {"transaction_id": "t1", "tag_ids": []},
+    "set_budget_amount": {"amount": 100.0, "category_id": "c1"},
+    "update_transaction_splits": {"transaction_id": "t1", "split_data": []},
+    "create_transaction_category": {"group_id": "grp1", "name": "Pets"},
+    "delete_transaction_category": {"category_id": "c1"},
+    "create_manual_account": {
+        "account_name": "Cash", "account_type": "depository",
+        "account_sub_type": "checking", "is_in_net_worth": True,
+    },
+    "update_account": {"account_id": "a1", "account_name": "Main"},
+    "delete_account": {"account_id": "a1"},
+    "upload_account_balance_history": {"account_id": "a1", "csv_path": "balances.csv"},
+}
+
+
+# Cached data each write tool must make stale, written out by hand (cache
+# key prefixes and resource URIs) rather than derived from the map.
+_PAGES = {"transaction_page"}
+_TRANSACTIONS = _PAGES | {"transaction", "transaction_details", "transaction_splits"}
+_FORECASTS = {"forecast_run_rates", "forecast_cashflow"}
+_BUDGETS = {"budgets"}
+_BALANCES = {"recent_account_balances"}
+_SNAPSHOTS = {"aggregate_snapshots"}
+_ACCOUNTS = {"monarch://accounts"}
+_TAGS = {"monarch://tags"}
+_CATEGORIES = {"monarch://categories", "monarch://category-groups"}
+
+_EXPECTED_STALE = {
+    "create_transaction": _PAGES | _FORECASTS | _BUDGETS | _ACCOUNTS,
+    "update_transaction": _FORECASTS | _BUDGETS,
+    "delete_transaction": _PAGES | _FORECASTS | _BUDGETS | _ACCOUNTS | _TAGS,
+    "upload_attachments": set(),
+    "create_transaction_tag": _TAGS,
+    "delete_transaction_tag": _TAGS | _TRANSACTIONS,
+    "set_transaction_tags": _TAGS,
+    "set_budget_amount": _BUDGETS,
+    "update_transaction_splits": _FORECASTS | _BUDGETS,
+    "create_transaction_category": _CATEGORIES | _BUDGETS,
+    "delete_transaction_category": _CATEGORIES | _TRANSACTIONS | _FORECASTS | _BUDGETS,
+    "create_manual_account": _ACCOUNTS | _BALANCES | _SNAPSHOTS,
+    "update_account": _ACCOUNTS | _TRANSACTIONS | _BALANCES | _SNAPSHOTS | _BUDGETS,
+    "delete_account": (
+        _ACCOUNTS | {"account_holdings"} | _TRANSACTIONS | _BALANCES | _SNAPSHOTS
+        | _FORECASTS | _BUDGETS | _TAGS
+    ),
+    "upload_account_balance_history": _ACCOUNTS | _BALANCES | _SNAPSHOTS,
+    "start_accounts_refresh": (
+        _ACCOUNTS | _TRANSACTIONS | _BALANCES | _SNAPSHOTS | _FORECASTS | _BUDGETS
+    ),
+}
+
+
+def _expected_keys(tool):
+    """The seeded cache keys *tool* must drop, from the hand-written table."""
+    return {
+        ("reference", name) if name.startswith("monarch://") else (name, "seeded")
+        for name in _EXPECTED_STALE[tool]
+    }
+
+
+def _seed():
+    """Cache one entry under every tag; return the keys by tag."""
+    keys = {}
+    for name, tag in invalidation.TAGS.items():
+        keys[name] = [(prefix, "seeded") for prefix in tag.prefixes]
+        keys[name] += [("reference", uri) for uri in tag.resources]
+        for key in keys[name]:
+            response_cache.set(key, {"cached": True})
+    return keys
+
+
+def _covered(tags):
+    prefixes, uris = invalidation.entries(tags)
+    return {(prefix, "seeded") for prefix in prefixes} | {("reference", uri) for uri in uris}
+
+
+# ---------------------------------------------------------------------------
+# Map
+# ---------------------------------------------------------------------------
+
+
+async def test_every_write_tool_declares_its_dependencies():
+    write_tools = {tool.name for tool in (await mcp.get_tools()).values() if not tool.enabled}
+
+    assert write_tools == set(_CALLS)
+    assert write_tools | {"start_accounts_refresh"} == set(invalidation.WRITE_DEPENDENCIES)
+
+
+def test_every_dependency_is_a_known_tag():
+    for tool, tags in invalidation.WRITE_DEPENDENCIES.items():
+        assert tags <= set(invalidation.TAGS), tool
+
+
+@pytest.mark.parametrize("tool", sorted(_EXPECTED_STALE))
+def test_map_matches_expected_stale_data(tool):
+    assert _covered(invalidation.WRITE_DEPENDENCIES[tool]) == _expected_keys(tool)
+
+
+def test_expected_table_covers_every_tool():
+    assert set(_EXPECTED_STALE) == set(invalidation.WRITE_DEPENDENCIES)
+
+
+def test_entries_merge_overlapping_tags():
+    prefixes, uris = invalidation.entries(["transactions", "transaction_pages", "accounts"])
+
+    assert prefixes.count("transaction_page") == 1
+    assert uris == ["monarch://accounts"]
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("tool", sorted(_CALLS))
+async def test_write_invalidates_exactly_its_dependents(
+    tool, mcp_write_client, mock_monarch_client, tmp_path,
+):
+    mock_monarch_client.delete_transaction_category.return_value = True
+    mock_monarch_client.delete_account.return_value = True
+    csv_path = tmp_path / "balances.csv"
+    csv_path.write_text("Date,Amount\n2025-01-01,100.00\n", encoding="utf-8")
+    args = dict(_CALLS[tool])
+    if tool == "upload_account_balance_history":
+        args["csv_path"] = str(csv_path)
+    keys = _seed()
+    stale = _expected_keys(tool)
+
+    result = (await mcp_write_client.call_tool(tool, args)).content[0].text
+
+    assert not result.startswith("Error "), result
+    assert "error" not in json.loads(result), result
+    for tag_keys in keys.values():
+        for key in tag_keys:
+            assert (key in response_cache) == (key not in stale), (tool, key)
+
+
+@pytest.mark.parametrize("update_balance", [False, True])
+async def test_balance_update_invalidates_balances(
+    update_balance, mcp_write_client, mock_monarch_client,
+):
+    mock_monarch_client.get_account_history.return_value = [
+        {"date": "2025-01-14", "signedBalance": 100.0},
+    ]
+    await mcp_write_client.call_tool("get_account_history", {"account_id": "a1"})
+    _seed()
+    stale = _expected_keys("create_transaction")
+    if update_balance:
+        stale |= {("recent_account_balances", "seeded"), ("aggregate_snapshots", "seeded")}
+
+    await mcp_write_client.call_tool(
+        "create_transaction", {**_CALLS["create_transaction"], "update_balance": update_balance},
+    )
+    await mcp_write_client.call_tool("get_account_history", {"account_id": "a1"})
+
+    for key in _covered(invalidation.TAGS):
+        assert (key in response_cache) == (key not in stale), key
+    assert mock_monarch_client.get_account_history.await_count == (2 if update_balance else 1)
+
+
+async def test_failed_write_still_invalidates(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.set_budget_amount.side_effect = RuntimeError("upstream timeout")
+    _seed()
+
+    result = (await mcp_write_client.call_tool(
+        "set_budget_amount", {"amount": 100.0, "category_id": "c1"},
+    )).content[0].text
+
+    assert result.startswith("Error ")
+    assert ("budgets", "seeded") not in response_cache
+    assert ("reference", "monarch://accounts") in response_cache
+
+
+async def test_budget_write_refetches_budgets(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.get_budgets.return_value = {"budgetData": {}}
+
+    await mcp_write_client.call_tool("get_budgets", {})
+    await mcp_write_client.call_tool("get_budgets", {})
+    await mcp_write_client.call_tool("set_budget_amount", {"amount": 50.0, "category_id": "c1"})
+    await mcp_write_client.call_tool("get_budgets", {})
+
+    assert mock_monarch_client.get_budgets.await_count == 2
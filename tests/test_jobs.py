@@ -0,0 +1,178 @@
+"""Tests for the background job framework and job tools."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+import pytest
+
+from monarch_mcp import jobs, shared_cache, tenants
+from monarch_mcp.jobs import JobRegistry
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True, name="clean_jobs")
+def _clean_jobs():
+    jobs.job_registry.clear()
+    yield
+    jobs.job_registry.clear()
+
+
+def _blocking(release, result="done"):
+    async def _work(_job):
+        await release.wait()
+        return result
+    return _work
+
+
+def _store_opener(path):
+    return lambda: shared_cache.SQLiteStore(str(path))
+
+
+async def _call(client, name, **args):
+    return json.loads((await client.call_tool(name, args)).content[0].text)
+
+
+def _txn_page(limit, offset, **_filters):
+    count = max(0, min(limit, 3 - offset))
+    return {"allTransactions": {"results": [
+        {"id": f"txn-{offset + i}", "date": "2025-01-15", "amount": -1.0}
+        for i in range(count)
+    ]}}
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+async def test_workers_bound_concurrent_jobs(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_JOB_WORKERS", "1")
+    registry = JobRegistry()
+    first_release, second_release = asyncio.Event(), asyncio.Event()
+
+    first = registry.start("demo", _blocking(first_release, "first"))
+    second = registry.start("demo", _blocking(second_release, "second"))
+    await asyncio.sleep(0)
+
+    assert (first.status, second.status) == (jobs.RUNNING, jobs.QUEUED)
+    first_release.set()
+    second_release.set()
+    await asyncio.wait_for(asyncio.gather(first.task, second.task), 5)
+    assert (first.result, second.result) == ("first", "second")
+    assert second.status == jobs.COMPLETED
+
+
+async def test_cancelled_queued_job_frees_its_place(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_JOB_WORKERS", "1")
+    registry = JobRegistry()
+    release = asyncio.Event()
+    running = registry.start("demo", _blocking(release))
+    queued = registry.start("demo", _blocking(release))
+    third = registry.start("demo", _blocking(release, "third"))
+
+    registry.cancel(queued.id)
+    release.set()
+    await asyncio.wait_for(asyncio.gather(running.task, third.task), 5)
+
+    assert queued.status == jobs.CANCELLED
+    assert third.result == "third"
+
+
+async def test_finished_jobs_expire():
+    registry = JobRegistry(ttl=0)
+    job = registry.start("demo", _blocking(asyncio.Event()))
+    job.task.cancel()
+    await asyncio.gather(job.task, return_exceptions=True)
+    job.updated_at -= 1
+
+    assert registry.get(job.id) is None
+
+
+async def test_finished_job_survives_restart(tmp_path):
+    registry = JobRegistry(open_store=_store_opener(tmp_path / "jobs.sqlite3"))
+    release = asyncio.Event()
+    release.set()
+    job = registry.start("demo", _blocking(release, {"rows": 3}))
+    await asyncio.wait_for(job.task, 5)
+
+    restarted = JobRegistry(open_store=_store_opener(tmp_path / "jobs.sqlite3"))
+    loaded = restarted.get(job.id)
+    with tenants.use("house-b"):
+        other_tenant = restarted.get(job.id)
+
+    assert (loaded.status, loaded.result) == (jobs.COMPLETED, {"rows": 3})
+    assert other_tenant is None
+
+
+async def test_interrupted_job_reported_failed_after_restart(tmp_path):
+    registry = JobRegistry(open_store=_store_opener(tmp_path / "jobs.sqlite3"))
+    job = registry.start("demo", _blocking(asyncio.Event()))
+
+    loaded = JobRegistry(open_store=_store_opener(tmp_path / "jobs.sqlite3")).get(job.id)
+    registry.clear()
+
+    assert loaded.status == jobs.FAILED
+    assert "stopped before the job finished" in loaded.error
+
+
+def test_job_store_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("MONARCH_MCP_JOB_STORE", "sqlite")
+
+    async def _run():
+        registry = JobRegistry(open_store=jobs.open_job_store)
+        await registry.start("demo", _blocking(asyncio.Event())).task
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(_run(), 0.05))
+    assert (tmp_path / "cache" / "jobs.sqlite3").exists()
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+
+async def test_background_export_runs_as_job(mcp_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.get_transactions.side_effect = _txn_page
+    path = tmp_path / "out.csv"
+
+    started = await _call(mcp_client, "export_transactions", output_path=str(path), background=True)
+    await asyncio.wait_for(jobs.job_registry.get(started["job_id"]).task, 5)
+    status = await _call(mcp_client, "get_job_status", job_id=started["job_id"])
+    result = await _call(mcp_client, "get_job_result", job_id=started["job_id"])
+
+    assert started["kind"] == "export_transactions"
+    assert status["status"] == "completed"
+    assert "result" not in status
+    assert result["result"]["rows"] == 3
+    assert path.exists()
+
+
+async def test_result_of_running_job(mcp_client):
+    job = jobs.job_registry.start("demo", _blocking(asyncio.Event()))
+
+    result = await _call(mcp_client, "get_job_result", job_id=job.id)
+
+    assert "still running" in result["error"]
+
+
+async def test_cancel_job_tool(mcp_client):
+    job = jobs.job_registry.start("demo", _blocking(asyncio.Event()))
+
+    cancelled = await _call(mcp_client, "cancel_job", job_id=job.id)
+    await asyncio.gather(job.task, return_exceptions=True)
+    result = await _call(mcp_client, "get_job_result", job_id=job.id)
+
+    assert cancelled == {"job_id": job.id, "status": "cancelled"}
+    assert result["error"] == "Job was cancelled."
+
+
+async def test_unknown_job(mcp_client):
+    for tool in ("get_job_status", "get_job_result", "cancel_job"):
+        result = await _call(mcp_client, tool, job_id="nope")
+        assert result == {"error": "Unknown job: nope"}
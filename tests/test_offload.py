@@ -0,0 +1,152 @@
+"""Tests for process-pool offload and loop-lag metrics."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from monarch_mcp import offload
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True, name="clean_offload")
+def _clean_offload():
+    offload.reset_stats()
+    offload.loop_lag.reset()
+    yield
+    offload.shutdown()
+
+
+@pytest.fixture(name="eager_offload")
+def _eager_offload(monkeypatch):
+    """Offload everything to a single worker process."""
+    monkeypatch.setenv("MONARCH_MCP_OFFLOAD_WORKERS", "1")
+    monkeypatch.setenv("MONARCH_MCP_OFFLOAD_MIN_CHARS", "1")
+
+
+def _big_budget(categories=200):
+    return {
+        "budgetData": {
+            "monthlyAmountsByCategory": [
+                {"category": {"id": f"c{i}"}, "monthlyAmounts": [{"month": "2025-01-01",
+                                                                  "plannedCashFlowAmount": i}]}
+                for i in range(categories)
+            ]
+        }
+    }
+
+
+# ---------------------------------------------------------------------------
+# Offload
+# ---------------------------------------------------------------------------
+
+
+async def test_small_work_runs_inline():
+    result = await offload.dumps({"a": 1}, indent=2)
+
+    assert result == json.dumps({"a": 1}, indent=2)
+    assert offload.stats()["inline"] == 1
+    assert offload.stats()["offloaded"] == 0
+
+
+async def test_large_work_runs_in_worker(eager_offload):  # pylint: disable=unused-argument
+    payload = _big_budget()
+
+    result = await offload.dumps(payload, indent=2, default=str)
+
+    assert result == json.dumps(payload, indent=2, default=str)
+    assert offload.stats()["offloaded"] == 1
+
+
+async def test_zero_workers_disables_offload(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_OFFLOAD_WORKERS", "0")
+    monkeypatch.setenv("MONARCH_MCP_OFFLOAD_MIN_CHARS", "1")
+
+    await offload.dumps(_big_budget())
+
+    assert offload.stats() | {} == {
+        "offloaded": 0, "inline": 1, "offload_seconds": 0.0, "workers": 0, "min_chars": 1,
+    }
+
+
+def test_estimate_stops_past_limit():
+    payload = [{"name": "x" * 100}] * 10_000
+
+    assert offload.estimate_chars({"k": "abc"}, 1_000) < 20
+    assert 1_000 < offload.estimate_chars(payload, 1_000) < 25_000
+    assert offload.estimate_chars(payload, 10**9) > 1_000_000
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+
+async def test_budgets_offloaded_match_inline(
+    eager_offload, mcp_client, mock_monarch_client,  # pylint: disable=unused-argument
+):
+    mock_monarch_client.get_budgets.return_value = _big_budget(20)
+
+    result = await mcp_client.call_tool("get_budgets", {})
+
+    assert json.loads(result.content[0].text) == _big_budget(20)
+    assert offload.stats()["offloaded"] == 1
+
+
+async def test_forecast_analytics_offloaded(
+    eager_offload, mcp_client, mock_monarch_client,  # pylint: disable=unused-argument
+):
+    mock_monarch_client.get_accounts.return_value = {"accounts": [
+        {"id": "a1", "displayName": "Checking", "currentBalance": 100.0,
+         "isAsset": True, "includeInNetWorth": True, "type": {"name": "depository"}},
+    ]}
+    mock_monarch_client.get_recurring_transactions.return_value = {
+        "recurringTransactionItems": [],
+    }
+    mock_monarch_client.get_transactions.return_value = {
+        "allTransactions": {"results": [], "totalCount": 0},
+    }
+
+    result = json.loads((await mcp_client.call_tool(
+        "forecast_cashflow", {"horizon_days": 30},
+    )).content[0].text)
+
+    assert "error" not in result
+    # run-rates, projection and serialization
+    assert offload.stats()["offloaded"] == 3
+
+
+async def test_server_metrics_tool(mcp_client):
+    offload.loop_lag.record(0.25)
+
+    result = json.loads((await mcp_client.call_tool("get_server_metrics", {})).content[0].text)
+
+    assert result["event_loop_lag"]["stalls"] == 1
+    assert result["event_loop_lag"]["max_ms"] == 250.0
+    assert set(result["offload"]) >= {"offloaded", "inline", "workers"}
+
+
+# ---------------------------------------------------------------------------
+# Loop lag
+# ---------------------------------------------------------------------------
+
+
+async def test_monitor_detects_blocked_loop():
+    monitor = offload.LoopLagMonitor(interval=0.01)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.15)  # block the loop as CPU-bound work on it would
+        await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["stalls"] >= 1
+    assert snapshot["max_ms"] >= 100
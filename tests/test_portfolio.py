@@ -0,0 +1,168 @@
+"""Tests for the get_portfolio_holdings tool."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+ACCOUNTS = {
+    "accounts": [
+        {"id": "acc-ira", "displayName": "IRA", "type": {"name": "brokerage"}},
+        {"id": "acc-401k", "displayName": "401k", "type": {"name": "brokerage"}},
+        {"id": "acc-hsa", "displayName": "HSA", "type": {"name": "depository"},
+         "holdingsCount": 1},
+        {"id": "acc-chk", "displayName": "Checking", "type": {"name": "depository"},
+         "holdingsCount": 0},
+    ]
+}
+
+
+def _node(security_id, ticker, quantity, value, type_display="ETF", basis=None):
+    return {
+        "node": {
+            "id": f"agg-{ticker}",
+            "quantity": quantity,
+            "totalValue": value,
+            "basis": basis,
+            "holdings": [{"ticker": ticker, "typeDisplay": type_display}],
+            "security": {
+                "id": security_id,
+                "ticker": ticker,
+                "name": f"{ticker} Fund",
+                "typeDisplay": type_display,
+            },
+        }
+    }
+
+
+def _holdings(*nodes):
+    return {"portfolio": {"aggregateHoldings": {"edges": list(nodes)}}}
+
+
+HOLDINGS = {
+    "acc-ira": _holdings(_node("sec-vti", "VTI", 10, 2500.0, basis=2000.0)),
+    "acc-401k": _holdings(
+        _node("sec-vti", "VTI", 4, 1000.0, basis=900.0),
+        _node("sec-bnd", "BND", 20, 1500.0, type_display="Bond"),
+    ),
+    "acc-hsa": _holdings(_node("sec-cash", "CASH", 1000, 1000.0, type_display="Cash")),
+}
+
+
+async def _call(client):
+    return json.loads(
+        (await client.call_tool("get_portfolio_holdings")).content[0].text
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+async def test_portfolio_aggregates_by_security(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = ACCOUNTS
+    mock_monarch_client.get_account_holdings.side_effect = HOLDINGS.get
+
+    result = await _call(mcp_client)
+
+    assert result["total_value"] == 6000.0
+    vti = result["positions"][0]
+    assert vti["ticker"] == "VTI"
+    assert vti["total_quantity"] == 14
+    assert vti["total_value"] == 3500.0
+    assert vti["total_basis"] == 2900.0
+    assert {a["account_id"] for a in vti["accounts"]} == {"acc-ira", "acc-401k"}
+    assert [a["id"] for a in result["accounts"]] == ["acc-ira", "acc-401k", "acc-hsa"]
+    assert "errors" not in result
+
+
+async def test_portfolio_allocation(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = ACCOUNTS
+    mock_monarch_client.get_account_holdings.side_effect = HOLDINGS.get
+
+    result = await _call(mcp_client)
+
+    allocation = {a["asset_class"]: a for a in result["allocation"]}
+    assert allocation["ETF"]["value"] == 3500.0
+    assert allocation["Bond"]["percent"] == 25.0
+    assert allocation["Cash"]["percent"] == round(100 / 6, 2)
+
+
+async def test_portfolio_skips_non_investment(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = ACCOUNTS
+    mock_monarch_client.get_account_holdings.side_effect = HOLDINGS.get
+
+    await _call(mcp_client)
+
+    called = {c.args[0] for c in mock_monarch_client.get_account_holdings.call_args_list}
+    assert called == {"acc-ira", "acc-401k", "acc-hsa"}
+
+
+async def test_portfolio_fetches_concurrently(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = ACCOUNTS
+    in_flight = {"now": 0, "peak": 0}
+
+    async def _slow_holdings(account_id):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return HOLDINGS[account_id]
+
+    mock_monarch_client.get_account_holdings.side_effect = _slow_holdings
+
+    await _call(mcp_client)
+
+    assert in_flight["peak"] == 3
+
+
+async def test_portfolio_holdings_cached(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = ACCOUNTS
+    mock_monarch_client.get_account_holdings.side_effect = HOLDINGS.get
+
+    await _call(mcp_client)
+    await _call(mcp_client)
+    await mcp_client.call_tool("get_account_holdings", {"account_id": "acc-ira"})
+
+    assert mock_monarch_client.get_account_holdings.call_count == 3
+
+
+async def test_portfolio_partial_failure(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = ACCOUNTS
+
+    def _holdings_or_fail(account_id):
+        if account_id == "acc-401k":
+            raise RuntimeError("institution unavailable")
+        return HOLDINGS[account_id]
+
+    mock_monarch_client.get_account_holdings.side_effect = _holdings_or_fail
+
+    result = await _call(mcp_client)
+
+    assert result["errors"] == [
+        {"account_id": "acc-401k", "error": "institution unavailable"}
+    ]
+    assert result["total_value"] == 3500.0
+
+
+async def test_portfolio_no_investment_accounts(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = {"accounts": []}
+
+    result = await _call(mcp_client)
+
+    assert result["total_value"] == 0
+    assert result["positions"] == []
+    assert result["allocation"] == []
+
+
+async def test_portfolio_accounts_error(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.side_effect = Exception("API down")
+
+    result = (await mcp_client.call_tool("get_portfolio_holdings")).content[0].text
+
+    assert "Error getting portfolio holdings" in result
@@ -0,0 +1,133 @@
+"""Tests for MCP progress notifications from long-running tools."""
+# pylint: disable=missing-function-docstring
+
+import json
+from unittest.mock import patch
+
+from gql.transport.exceptions import TransportServerError
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+async def _call_with_progress(client, name, args=None):
+    """Call *name* and return (parsed result, list of progress events)."""
+    events = []
+
+    async def _handler(progress, total, message):
+        events.append((progress, total, message))
+
+    result = await client.call_tool(name, args or {}, progress_handler=_handler)
+    text = result.content[0].text
+    try:
+        return json.loads(text), events
+    except json.JSONDecodeError:
+        return text, events
+
+
+def _paged(total, page_size=500):
+    def _get_transactions(limit, offset, **_filters):
+        count = max(0, min(limit, total - offset))
+        return {
+            "allTransactions": {
+                "totalCount": total,
+                "results": [
+                    {"id": f"txn-{offset + i}", "date": "2025-01-15", "amount": -1.0}
+                    for i in range(count)
+                ],
+            }
+        }
+    assert page_size == 500
+    return _get_transactions
+
+
+# ---------------------------------------------------------------------------
+# refresh_accounts
+# ---------------------------------------------------------------------------
+
+
+async def test_refresh_accounts_reports_steps(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {
+        "accounts": [{"id": "a1"}, {"id": "a2"}],
+    }
+    mock_monarch_client.request_accounts_refresh.return_value = True
+
+    result, events = await _call_with_progress(mcp_client, "refresh_accounts")
+
+    assert result["result"] is True
+    mock_monarch_client.request_accounts_refresh.assert_called_once_with(["a1", "a2"])
+    assert [(p, t) for p, t, _ in events] == [(0, 2), (1, 2), (2, 2)]
+    assert events[-1][2] == "Refresh requested for 2 accounts"
+
+
+async def test_refresh_accounts_no_accounts(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"accounts": []}
+
+    result, events = await _call_with_progress(mcp_client, "refresh_accounts")
+
+    assert "No accounts found" in result["error"]
+    mock_monarch_client.request_accounts_refresh.assert_not_called()
+    assert events == [(0, 2, "Listing accounts")]
+
+
+# ---------------------------------------------------------------------------
+# export_transactions
+# ---------------------------------------------------------------------------
+
+
+async def test_export_reports_rows_per_page(mcp_client, mock_monarch_client, tmp_path):
+    mock_monarch_client.get_transactions.side_effect = _paged(1200)
+
+    result, events = await _call_with_progress(
+        mcp_client, "export_transactions",
+        {"output_path": str(tmp_path / "out.ndjson"), "file_format": "ndjson"},
+    )
+
+    assert result["rows"] == 1200
+    assert [(p, t) for p, t, _ in events] == [(500, 1200), (1000, 1200), (1200, 1200)]
+    assert events[-1][2] == "Exported 1200 transactions"
+
+
+# ---------------------------------------------------------------------------
+# get_portfolio_holdings
+# ---------------------------------------------------------------------------
+
+
+async def test_portfolio_reports_each_account(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_accounts.return_value = {
+        "accounts": [
+            {"id": f"b{i}", "type": {"name": "brokerage"}} for i in range(3)
+        ],
+    }
+    mock_monarch_client.get_account_holdings.return_value = {}
+
+    _, events = await _call_with_progress(mcp_client, "get_portfolio_holdings")
+
+    assert [(p, t) for p, t, _ in events] == [(1, 3), (2, 3), (3, 3)]
+
+
+# ---------------------------------------------------------------------------
+# Error handling on the async tool path
+# ---------------------------------------------------------------------------
+
+
+async def test_async_tool_error_is_formatted(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.side_effect = ValueError("boom")
+
+    result, _ = await _call_with_progress(mcp_client, "refresh_accounts")
+
+    assert result == "Error refreshing accounts: boom"
+
+
+async def test_async_tool_auth_error_triggers_reauth(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.side_effect = TransportServerError(
+        "Unauthorized", code=401,
+    )
+
+    with patch("monarch_mcp.server.secure_session.delete_token") as mock_delete:
+        result, _ = await _call_with_progress(mcp_client, "refresh_accounts")
+
+    assert "session has expired" in result
+    mock_delete.assert_called_once()
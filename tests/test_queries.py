@@ -0,0 +1,119 @@
+"""Tests for the lean GraphQL queries."""
+# pylint: disable=missing-function-docstring
+
+import json
+
+import pytest
+from graphql import FieldNode, OperationDefinitionNode
+
+from monarch_mcp import documents, queries
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _fields(query, *path):
+    """Return the field names selected under *path* in *query*."""
+    request = documents.get(query)
+    # gql() returns a GraphQLRequest wrapping the DocumentNode in gql 4
+    document = getattr(request, "document", request)
+    [operation] = [
+        node for node in document.definitions if isinstance(node, OperationDefinitionNode)
+    ]
+    selection = operation.selection_set
+    for name in path:
+        [field] = [node for node in selection.selections if node.name.value == name]
+        selection = field.selection_set
+    return {node.name.value for node in selection.selections if isinstance(node, FieldNode)}
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+
+def test_transactions_query_selects_only_returned_fields():
+    fields = _fields(queries.TRANSACTIONS_QUERY, "allTransactions", "results")
+
+    assert fields == {
+        "id", "date", "amount", "plaidName", "notes", "pending", "isRecurring",
+        "category", "account", "merchant", "tags",
+    }
+    assert "attachments" not in fields
+
+
+def test_accounts_query_selects_only_returned_fields():
+    fields = _fields(queries.ACCOUNTS_QUERY, "accounts")
+
+    assert fields == {
+        "id", "displayName", "currentBalance", "deactivatedAt", "type", "institution",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Variables
+# ---------------------------------------------------------------------------
+
+
+def test_variables_match_library_defaults():
+    assert queries.transaction_variables(10) == {
+        "offset": 0, "limit": 10, "orderBy": "date",
+        "filters": {"search": "", "categories": [], "accounts": [], "tags": []},
+    }
+
+
+def test_variables_map_every_filter():
+    variables = queries.transaction_variables(
+        5, 10, start_date="2025-01-01", end_date="2025-01-31", search="coffee",
+        category_ids=["c1"], account_ids=["a1"], tag_ids=["g1"], has_attachments=True,
+        has_notes=False, hidden_from_reports=None, is_split=True, is_recurring=False,
+        synced_from_institution=True,
+    )
+
+    assert variables["filters"] == {
+        "search": "coffee", "categories": ["c1"], "accounts": ["a1"], "tags": ["g1"],
+        "hasAttachments": True, "hasNotes": False, "isSplit": True, "isRecurring": False,
+        "syncedFromInstitution": True, "startDate": "2025-01-01", "endDate": "2025-01-31",
+    }
+
+
+def test_variables_reject_unknown_filter():
+    with pytest.raises(TypeError, match="needs_review"):
+        queries.transaction_variables(5, needs_review=True)
+
+
+def test_variables_need_both_dates():
+    with pytest.raises(ValueError, match="start_date and end_date"):
+        queries.transaction_variables(5, start_date="2025-01-01")
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+
+async def test_get_accounts_uses_lean_query(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"accounts": []}
+
+    await mcp_client.call_tool("get_accounts", {})
+
+    mock_monarch_client.get_accounts.assert_not_called()
+    call = mock_monarch_client.gql_call.call_args.kwargs
+    assert call["operation"] == "MCP_GetAccountsLean"
+    assert call["graphql_query"] is documents.get(queries.ACCOUNTS_QUERY)
+
+
+async def test_get_transactions_uses_lean_query(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"allTransactions": {"results": []}}
+
+    result = json.loads(
+        (await mcp_client.call_tool("get_transactions", {"limit": 5})).content[0].text
+    )
+
+    assert result == {"transactions": [], "cursor": None}
+    mock_monarch_client.get_transactions.assert_not_called()
+    call = mock_monarch_client.gql_call.call_args.kwargs
+    assert call["operation"] == "MCP_GetTransactionsLean"
+    assert call["graphql_query"] is documents.get(queries.TRANSACTIONS_QUERY)
@@ -0,0 +1,208 @@
+"""Tests for background account refresh jobs."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+import pytest
+
+from monarch_mcp import jobs, server
+from monarch_mcp.cache import response_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True, name="fast_polling")
+def _fast_polling(monkeypatch):
+    monkeypatch.setattr(server, "_REFRESH_POLL_MIN", 0.001)
+    monkeypatch.setattr(server, "_REFRESH_POLL_MAX", 0.005)
+    jobs.job_registry.clear()
+    yield
+    jobs.job_registry.clear()
+
+
+def _accounts(*ids):
+    return {"accounts": [{"id": i, "displayName": f"Account {i}"} for i in ids]}
+
+
+def _status(**syncing):
+    return {
+        "accounts": [
+            {"id": account_id, "hasSyncInProgress": flag}
+            for account_id, flag in syncing.items()
+        ]
+    }
+
+
+def _serve(client, accounts, *statuses, error=None):
+    """Answer the account list query with *accounts* and status polls in turn.
+
+    The last status repeats; with *error*, every poll raises it instead.
+    """
+    polls = list(statuses)
+
+    async def _gql_call(operation, graphql_query, variables=None):  # pylint: disable=unused-argument
+        if operation == "MCP_GetAccountsLean":
+            return accounts
+        if error is not None:
+            raise error
+        return polls.pop(0) if len(polls) > 1 else polls[0]
+
+    client.gql_call.side_effect = _gql_call
+
+
+async def _call(client, name, **args):
+    return json.loads((await client.call_tool(name, args)).content[0].text)
+
+
+async def _finish(client, job_id):
+    await asyncio.wait_for(jobs.job_registry.get(job_id).task, timeout=5)
+    return await _call(client, "get_refresh_status", job_id=job_id)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+async def test_job_tracks_each_account(mcp_client, mock_monarch_client):
+    mock_monarch_client.request_accounts_refresh.return_value = True
+    _serve(
+        mock_monarch_client, _accounts("a1", "a2"),
+        _status(a1=True, a2=True),
+        _status(a1=False, a2=True),
+        _status(a1=False, a2=False),
+    )
+
+    started = await _call(mcp_client, "start_accounts_refresh")
+    status = await _finish(mcp_client, started["job_id"])
+
+    assert started["status"] == "running"
+    assert started["account_ids"] == ["a1", "a2"]
+    mock_monarch_client.request_accounts_refresh.assert_awaited_once_with(["a1", "a2"])
+    assert status["status"] == "completed"
+    assert status["result"] == {"refreshed": 2, "pending": 0}
+    assert status["progress"]["done"] == 2
+    assert [(a["id"], a["name"], a["status"]) for a in status["progress"]["accounts"]] == [
+        ("a1", "Account a1", "done"), ("a2", "Account a2", "done"),
+    ]
+    # One account list query, then three status polls
+    assert mock_monarch_client.gql_call.await_count == 4
+
+
+async def test_explicit_account_ids(mcp_client, mock_monarch_client):
+    _serve(mock_monarch_client, _accounts("a1", "a2"), _status(a1=True, a2=False))
+
+    started = await _call(mcp_client, "start_accounts_refresh", account_ids=["a2"])
+    status = await _finish(mcp_client, started["job_id"])
+
+    mock_monarch_client.request_accounts_refresh.assert_awaited_once_with(["a2"])
+    assert status["status"] == "completed"
+    assert status["progress"]["total"] == 1
+
+
+async def test_completion_invalidates_account_caches(mcp_client, mock_monarch_client):
+    _serve(mock_monarch_client, _accounts("a1", "a2"), _status(a1=False, a2=False))
+    response_cache.set(("account_holdings", "a1"), {"cached": True})
+    response_cache.set(("aggregate_snapshots", "2025-01-01", None, None), {"cached": True})
+    response_cache.set(("unrelated",), {"cached": True})
+
+    started = await _call(mcp_client, "start_accounts_refresh")
+    await _finish(mcp_client, started["job_id"])
+
+    assert ("account_holdings", "a1") not in response_cache
+    assert ("aggregate_snapshots", "2025-01-01", None, None) not in response_cache
+    assert ("unrelated",) in response_cache
+
+
+async def test_timeout_leaves_pending_accounts(mcp_client, mock_monarch_client):
+    _serve(mock_monarch_client, _accounts("a1", "a2"), _status(a1=False, a2=True))
+    response_cache.set(("account_holdings", "a2"), {"cached": True})
+
+    started = await _call(
+        mcp_client, "start_accounts_refresh", timeout_seconds=0.02,
+    )
+    status = await _finish(mcp_client, started["job_id"])
+
+    assert status["status"] == "timed_out"
+    assert status["result"] == {"refreshed": 1, "pending": 1}
+    assert [a["status"] for a in status["progress"]["accounts"]] == ["done", "syncing"]
+    assert ("account_holdings", "a2") in response_cache
+
+
+async def test_account_missing_from_status_stays_pending(mcp_client, mock_monarch_client):
+    _serve(
+        mock_monarch_client, _accounts("a1", "a2"),
+        _status(a1=False),
+        _status(a1=False, a2=False),
+    )
+
+    started = await _call(mcp_client, "start_accounts_refresh")
+    status = await _finish(mcp_client, started["job_id"])
+
+    assert status["status"] == "completed"
+    # One account list query; a2 only counts as done on the second poll
+    assert mock_monarch_client.gql_call.await_count == 3
+
+
+async def test_account_never_reported_times_out(mcp_client, mock_monarch_client):
+    _serve(mock_monarch_client, _accounts("a1", "a2"), _status(a1=False))
+    response_cache.set(("account_holdings", "a2"), {"cached": True})
+
+    started = await _call(
+        mcp_client, "start_accounts_refresh", timeout_seconds=0.02,
+    )
+    status = await _finish(mcp_client, started["job_id"])
+
+    assert status["status"] == "timed_out"
+    assert status["result"] == {"refreshed": 1, "pending": 1}
+    assert ("account_holdings", "a2") in response_cache
+
+
+async def test_polling_error_fails_job(mcp_client, mock_monarch_client):
+    _serve(mock_monarch_client, _accounts("a1"), error=RuntimeError("boom"))
+
+    started = await _call(mcp_client, "start_accounts_refresh")
+    status = await _finish(mcp_client, started["job_id"])
+
+    assert status["status"] == "failed"
+    assert status["error"] == "boom"
+
+
+async def test_no_accounts(mcp_client, mock_monarch_client):
+    _serve(mock_monarch_client, {"accounts": []})
+
+    result = await _call(mcp_client, "start_accounts_refresh")
+
+    assert result["error"] == "No accounts found to refresh."
+    mock_monarch_client.request_accounts_refresh.assert_not_called()
+
+
+async def test_invalid_timeout(mcp_client):
+    result = await _call(mcp_client, "start_accounts_refresh", timeout_seconds=0)
+
+    assert "timeout_seconds" in result["error"]
+
+
+async def test_unknown_job(mcp_client):
+    result = await _call(mcp_client, "get_refresh_status", job_id="nope")
+
+    assert result["error"] == "Unknown refresh job: nope"
+
+
+async def test_recently_refreshed_accounts_are_tracked_not_requested(
+    mcp_client, mock_monarch_client,
+):
+    _serve(mock_monarch_client, _accounts("a1", "a2"), _status(a1=False, a2=False))
+    await mcp_client.call_tool("refresh_accounts", {"account_ids": ["a1"]})
+
+    started = await _call(mcp_client, "start_accounts_refresh")
+    status = await _finish(mcp_client, started["job_id"])
+
+    assert [c.args[0] for c in mock_monarch_client.request_accounts_refresh.call_args_list] == [
+        ["a1"], ["a2"],
+    ]
+    assert status["progress"]["total"] == 2
@@ -0,0 +1,215 @@
+"""Tests for cached reference-data resources and update notifications."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+import pytest
+from fastmcp import Client
+from fastmcp.client.messages import MessageHandler
+
+from monarch_mcp import resources, server
+from monarch_mcp.server import mcp
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _Recorder(MessageHandler):
+    """Collect URIs from resources/updated notifications."""
+
+    def __init__(self):
+        self.updated = []
+
+    async def on_resource_updated(self, message):
+        self.updated.append(str(message.params.uri))
+
+
+@pytest.fixture(autouse=True)
+def _reset_subscriptions():
+    resources.subscribers.clear()
+    server._reference_digests.clear()  # pylint: disable=protected-access
+    yield
+    resources.subscribers.clear()
+
+
+@pytest.fixture(name="watcher")
+async def _watcher():
+    """A second client that records update notifications."""
+    recorder = _Recorder()
+    async with Client(mcp, message_handler=recorder) as client:
+        client.recorder = recorder
+        yield client
+
+
+async def _read(client, uri):
+    contents = await client.read_resource(uri)
+    return json.loads(contents[0].text)
+
+
+async def _wait_for(recorder, count=1):
+    for _ in range(100):
+        if len(recorder.updated) >= count:
+            return
+        await asyncio.sleep(0.01)
+
+
+# ---------------------------------------------------------------------------
+# Listing and reading
+# ---------------------------------------------------------------------------
+
+
+async def test_reference_resources_are_listed(mcp_client):
+    uris = {str(r.uri) for r in await mcp_client.list_resources()}
+    assert {
+        "monarch://accounts", "monarch://categories",
+        "monarch://category-groups", "monarch://tags",
+    } <= uris
+
+
+async def test_categories_resource_is_cached(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_transaction_categories.return_value = {
+        "categories": [{"id": "c1", "name": "Groceries"}],
+    }
+
+    first = await _read(mcp_client, "monarch://categories")
+    second = await _read(mcp_client, "monarch://categories")
+
+    assert first == second == {"categories": [{"id": "c1", "name": "Groceries"}]}
+    mock_monarch_client.get_transaction_categories.assert_called_once()
+
+
+async def test_accounts_resource_matches_tool_format(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {
+        "accounts": [{
+            "id": "a1", "displayName": "Checking", "type": {"name": "depository"},
+            "currentBalance": 10.0, "institution": {"name": "Bank"},
+        }],
+    }
+
+    resource = await _read(mcp_client, "monarch://accounts")
+    tool = json.loads(
+        (await mcp_client.call_tool("get_accounts", {})).content[0].text
+    )
+
+    assert resource == tool
+    assert resource[0]["name"] == "Checking"
+
+
+async def test_tool_call_warms_resource_cache(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_transaction_tags.return_value = {
+        "householdTransactionTags": [{"id": "t1", "name": "Work"}],
+    }
+
+    await mcp_client.call_tool("get_transaction_tags", {})
+    tags = await _read(mcp_client, "monarch://tags")
+
+    assert tags[0]["id"] == "t1"
+    mock_monarch_client.get_transaction_tags.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Update notifications
+# ---------------------------------------------------------------------------
+
+
+async def test_subscribe_capability_is_advertised(watcher):
+    assert watcher.initialize_result.capabilities.resources.subscribe is True
+
+
+async def test_reading_does_not_subscribe(watcher, mock_monarch_client):
+    mock_monarch_client.get_transaction_tags.return_value = {
+        "householdTransactionTags": [],
+    }
+
+    await _read(watcher, "monarch://tags")
+
+    assert resources.subscribers.count("monarch://tags") == 0
+
+
+async def test_write_tool_notifies_subscribers(
+    watcher, mcp_write_client, mock_monarch_client,
+):
+    mock_monarch_client.get_transaction_tags.return_value = {
+        "householdTransactionTags": [],
+    }
+    mock_monarch_client.create_transaction_tag.return_value = {"id": "t2"}
+    await _read(watcher, "monarch://tags")
+    await watcher.session.subscribe_resource("monarch://tags")
+
+    await mcp_write_client.call_tool(
+        "create_transaction_tag", {"name": "New", "color": "#19D2A5"},
+    )
+    await _wait_for(watcher.recorder)
+
+    assert watcher.recorder.updated == ["monarch://tags"]
+    # The write dropped the cached copy, so the next read refetches
+    await _read(watcher, "monarch://tags")
+    assert mock_monarch_client.get_transaction_tags.call_count == 2
+
+
+async def test_changed_refresh_notifies(watcher, mcp_client, mock_monarch_client):
+    mock_monarch_client.get_transaction_categories.return_value = {"categories": []}
+    await _read(watcher, "monarch://categories")
+    await watcher.session.subscribe_resource("monarch://categories")
+
+    # Same data again: no notification
+    await mcp_client.call_tool("get_transaction_categories", {})
+    mock_monarch_client.get_transaction_categories.return_value = {
+        "categories": [{"id": "c9"}],
+    }
+    await mcp_client.call_tool("get_transaction_categories", {})
+    await _wait_for(watcher.recorder)
+
+    assert watcher.recorder.updated == ["monarch://categories"]
+
+
+async def test_explicit_subscribe_and_unsubscribe(watcher, mcp_write_client):
+    await watcher.session.subscribe_resource("monarch://accounts")
+    assert resources.subscribers.count("monarch://accounts") == 1
+
+    await mcp_write_client.call_tool("delete_account", {"account_id": "a1"})
+    await _wait_for(watcher.recorder)
+    assert watcher.recorder.updated == ["monarch://accounts"]
+
+    await watcher.session.unsubscribe_resource("monarch://accounts")
+    assert resources.subscribers.count("monarch://accounts") == 0
+
+
+async def test_category_write_notifies_both_resources(watcher, mcp_write_client):
+    await watcher.session.subscribe_resource("monarch://categories")
+    await watcher.session.subscribe_resource("monarch://category-groups")
+
+    await mcp_write_client.call_tool(
+        "delete_transaction_category", {"category_id": "c1"},
+    )
+    await _wait_for(watcher.recorder, count=2)
+
+    assert sorted(watcher.recorder.updated) == [
+        "monarch://categories", "monarch://category-groups",
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+async def test_unreachable_subscriber_is_dropped():
+    registry = resources.ResourceSubscribers()
+
+    class _Session:  # pylint: disable=too-few-public-methods
+        async def send_resource_updated(self, uri):
+            raise RuntimeError(f"closed {uri}")
+
+    session = _Session()
+    registry.add("monarch://tags", session)
+    registry.notify(["monarch://tags"])
+    for _ in range(100):
+        if not registry.count("monarch://tags"):
+            break
+        await asyncio.sleep(0.01)
+
+    assert registry.count("monarch://tags") == 0
@@ -0,0 +1,213 @@
+"""Tests for priority scheduling of upstream work."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+
+import pytest
+from fastmcp import Client
+
+from monarch_mcp import jobs, scheduler
+from monarch_mcp.scheduler import BACKGROUND, BULK, INTERACTIVE, PriorityScheduler
+from monarch_mcp.server import mcp
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(name="two_slots")
+def _two_slots(monkeypatch):
+    """Two upstream slots, one reserved for interactive work."""
+    monkeypatch.setenv("MONARCH_MCP_UPSTREAM_CONCURRENCY", "2")
+    monkeypatch.setenv("MONARCH_MCP_INTERACTIVE_RESERVE", "1")
+
+
+async def _run(sched, order, label, priority, key=None):
+    async with sched.slot(priority, key):
+        order.append(label)
+        await asyncio.sleep(0)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+# ---------------------------------------------------------------------------
+# Admission
+# ---------------------------------------------------------------------------
+
+
+async def test_reserved_slot_keeps_interactive_responsive(two_slots):  # pylint: disable=unused-argument
+    sched = PriorityScheduler()
+    await sched.acquire(BULK)
+    bulk_waiting = asyncio.create_task(sched.acquire(BULK))
+    await _settle()
+
+    # The reserved slot admits interactive work at once, but no more bulk
+    await asyncio.wait_for(sched.acquire(INTERACTIVE), 1)
+    assert not bulk_waiting.done()
+    assert sched.stats()["classes"][BULK]["queued"] == 1
+
+    sched.release(INTERACTIVE)
+    sched.release(BULK)
+    await asyncio.wait_for(bulk_waiting, 1)
+
+
+async def test_classes_are_served_in_priority_order(two_slots):  # pylint: disable=unused-argument
+    sched = PriorityScheduler()
+    order = []
+    await sched.acquire(INTERACTIVE)
+    await sched.acquire(INTERACTIVE)
+    tasks = [
+        asyncio.create_task(_run(sched, order, "bulk", BULK)),
+        asyncio.create_task(_run(sched, order, "background", BACKGROUND)),
+        asyncio.create_task(_run(sched, order, "interactive", INTERACTIVE)),
+    ]
+    await _settle()
+
+    sched.release(INTERACTIVE)
+    sched.release(INTERACTIVE)
+    await asyncio.gather(*tasks)
+
+    assert order == ["interactive", "background", "bulk"]
+
+
+async def test_sessions_take_turns_within_a_class(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_UPSTREAM_CONCURRENCY", "1")
+    sched = PriorityScheduler()
+    order = []
+    await sched.acquire(INTERACTIVE)
+    tasks = [
+        asyncio.create_task(_run(sched, order, f"a{i}", INTERACTIVE, "session-a"))
+        for i in range(3)
+    ]
+    tasks.append(asyncio.create_task(_run(sched, order, "b0", INTERACTIVE, "session-b")))
+    await _settle()
+
+    sched.release(INTERACTIVE)
+    await asyncio.gather(*tasks)
+
+    assert order == ["a0", "b0", "a1", "a2"]
+
+
+async def test_cancelled_waiter_gives_up_its_place(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_UPSTREAM_CONCURRENCY", "1")
+    sched = PriorityScheduler()
+    await sched.acquire(INTERACTIVE)
+    waiting = asyncio.create_task(sched.acquire(BULK))
+    await _settle()
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    sched.release(INTERACTIVE)
+
+    classes = sched.stats()["classes"]
+    assert (classes[BULK]["queued"], classes[BULK]["active"]) == (0, 0)
+    assert classes[INTERACTIVE]["active"] == 0
+
+
+def test_unknown_class_is_rejected():
+    with pytest.raises(ValueError, match="Unknown priority class"):
+        asyncio.run(PriorityScheduler().acquire("urgent"))
+
+
+def test_reserve_always_leaves_a_slot(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_UPSTREAM_CONCURRENCY", "2")
+    monkeypatch.setenv("MONARCH_MCP_INTERACTIVE_RESERVE", "5")
+
+    assert scheduler.interactive_reserve() == 1
+
+
+# ---------------------------------------------------------------------------
+# Tool calls
+# ---------------------------------------------------------------------------
+
+
+async def test_interactive_call_passes_a_running_export(
+    two_slots, mock_monarch_client, tmp_path,  # pylint: disable=unused-argument
+):
+    release = asyncio.Event()
+
+    async def _slow_page(**_kwargs):
+        await release.wait()
+        return {"allTransactions": {"results": [], "totalCount": 0}}
+
+    mock_monarch_client.get_transactions.side_effect = _slow_page
+    mock_monarch_client.gql_call.return_value = {"accounts": [{"id": "a1"}]}
+    async with Client(mcp) as exporter, Client(mcp) as chat:
+        export = asyncio.create_task(exporter.call_tool(
+            "export_transactions", {"output_path": str(tmp_path / "t.csv")},
+        ))
+        await asyncio.sleep(0.05)
+        during = scheduler.scheduler.stats()["classes"]
+        accounts = await asyncio.wait_for(chat.call_tool("get_accounts", {}), 5)
+        release.set()
+        await export
+
+    assert during[BULK]["active"] == 1
+    assert json.loads(accounts.content[0].text)[0]["id"] == "a1"
+
+
+async def test_interactive_call_completes_while_bulk_is_saturated(
+    two_slots, mock_monarch_client, tmp_path,  # pylint: disable=unused-argument
+):
+    release = asyncio.Event()
+
+    async def _slow_page(**_kwargs):
+        await release.wait()
+        return {"allTransactions": {"results": [], "totalCount": 0}}
+
+    mock_monarch_client.get_transactions.side_effect = _slow_page
+    mock_monarch_client.gql_call.return_value = {"accounts": [{"id": "a1"}]}
+    async with Client(mcp) as exporter, Client(mcp) as chat:
+        started = [
+            json.loads((await exporter.call_tool("export_transactions", {
+                "output_path": str(tmp_path / f"t{i}.csv"), "background": True,
+            })).content[0].text)
+            for i in range(2)
+        ]
+        await _settle()
+        during = scheduler.scheduler.stats()["classes"]
+        accounts = await asyncio.wait_for(chat.call_tool("get_accounts", {}), 5)
+        release.set()
+        await asyncio.wait_for(asyncio.gather(
+            *(jobs.job_registry.get(job["job_id"]).task for job in started)
+        ), 5)
+
+    # One slot per page request in flight; the tool calls themselves hold none
+    assert (during[BULK]["active"], during[BULK]["queued"]) == (1, 1)
+    assert during[INTERACTIVE]["active"] == 0
+    assert json.loads(accounts.content[0].text)[0]["id"] == "a1"
+    assert scheduler.scheduler.stats()["classes"][BULK]["active"] == 0
+
+
+async def test_client_holds_a_slot_per_request(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_UPSTREAM_CONCURRENCY", "1")
+    release = asyncio.Event()
+
+    class _Client:  # pylint: disable=too-few-public-methods
+        async def get_accounts(self):
+            await release.wait()
+            return {"accounts": []}
+
+    client = scheduler.UpstreamClient(_Client())
+    with scheduler.use(BACKGROUND):
+        first = asyncio.create_task(client.get_accounts())
+        second = asyncio.create_task(client.get_accounts())
+        await _settle()
+    classes = scheduler.scheduler.stats()["classes"]
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert (classes[BACKGROUND]["active"], classes[BACKGROUND]["queued"]) == (1, 1)
+
+
+async def test_server_metrics_report_scheduler(mcp_client):
+    result = json.loads((await mcp_client.call_tool("get_server_metrics", {})).content[0].text)
+
+    assert set(result["scheduler"]["classes"]) == {INTERACTIVE, BACKGROUND, BULK}
+    assert result["scheduler"]["classes"][INTERACTIVE]["active"] == 0
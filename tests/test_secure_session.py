@@ -1,4 +1,4 @@
-"""SecureMonarchSession unit tests (17 tests).
+"""SecureMonarchSession unit tests (18 tests).
 
 Covers save/load/delete token, get_authenticated_client,
 save_authenticated_session, and _cleanup_old_session_files.
@@ -123,6 +123,28 @@ def test_get_client_success(session):
     mock_cls.assert_called_once_with(token="tok-abc")
 
 
+def test_get_client_is_shared_until_token_changes(session):
+    with (
+        patch("monarch_mcp.secure_session.keyring") as mock_kr,
+        patch("monarch_mcp.secure_session.MonarchMoney") as mock_cls,
+    ):
+        mock_kr.get_password.return_value = "tok-abc"
+        mock_cls.side_effect = [MagicMock(), MagicMock(), MagicMock()]
+
+        first = session.get_authenticated_client()
+        again = session.get_authenticated_client()
+        session.save_token("tok-new")
+        after_save = session.get_authenticated_client()
+        session.delete_token()
+        after_delete = session.get_authenticated_client()
+
+    assert first is again
+    assert after_save is not first
+    assert after_delete is not after_save
+    assert mock_cls.call_count == 3
+    assert mock_kr.get_password.call_count == 3
+
+
 def test_get_client_no_token(session):
     with patch("monarch_mcp.secure_session.keyring") as mock_kr:
         mock_kr.get_password.return_value = None
@@ -1,20 +1,23 @@
-"""Server edge-case unit tests (12 tests).
+"""Server edge-case unit tests (15 tests).
 
 Covers get_monarch_client env-credential path, check_auth_status/
 debug_session_loading branches, update_transaction goal_id,
-refresh_accounts empty, and main().
+refresh_accounts empty, main(), the HTTP transport and concurrent sessions.
 """
 # pylint: disable=missing-function-docstring
 
+import argparse
+import asyncio
 import json
 from unittest.mock import patch, AsyncMock
 
 import pytest
+from fastmcp import Client
 
 from monarch_mcp.server import (
+    mcp,
     get_monarch_client,
     main,
-    run_async,
 )
 
 
@@ -23,7 +26,7 @@ from monarch_mcp.server import (
 # ===================================================================
 
 
-def test_get_client_env_credentials(monkeypatch):
+async def test_get_client_env_credentials(monkeypatch):
     """When keyring has no token, env credentials trigger login + save."""
     monkeypatch.setenv("MONARCH_EMAIL", "user@test.com")
     monkeypatch.setenv("MONARCH_PASSWORD", "secret123")
@@ -37,14 +40,14 @@ def test_get_client_env_credentials(monkeypatch):
     ):
         mock_ss.get_authenticated_client.return_value = None
 
-        result = run_async(get_monarch_client())
+        result = await get_monarch_client()
 
-    assert result is mock_client
+    assert result.client is mock_client
     mock_client.login.assert_awaited_once_with("user@test.com", "secret123")
     mock_ss.save_authenticated_session.assert_called_once_with(mock_client)
 
 
-def test_get_client_env_login_failure(monkeypatch):
+async def test_get_client_env_login_failure(monkeypatch):
     """When env login fails, exception propagates."""
     monkeypatch.setenv("MONARCH_EMAIL", "user@test.com")
     monkeypatch.setenv("MONARCH_PASSWORD", "wrong")
@@ -59,10 +62,10 @@ def test_get_client_env_login_failure(monkeypatch):
         mock_ss.get_authenticated_client.return_value = None
 
         with pytest.raises(RuntimeError, match="bad credentials"):
-            run_async(get_monarch_client())
+            await get_monarch_client()
 
 
-def test_get_client_no_credentials(mock_monarch_client, monkeypatch):
+async def test_get_client_no_credentials(mock_monarch_client, monkeypatch):  # pylint: disable=unused-argument
     """When no keyring token and no env vars, trigger_auth_flow + RuntimeError."""
     with patch("monarch_mcp.secure_session.keyring") as mock_kr:
         mock_kr.get_password.return_value = None
@@ -74,7 +77,7 @@ def test_get_client_no_credentials(mock_monarch_client, monkeypatch):
             patch("monarch_mcp.server.trigger_auth_flow") as mock_auth,
             pytest.raises(RuntimeError, match="Authentication needed"),
         ):
-            run_async(get_monarch_client())
+            await get_monarch_client()
 
         mock_auth.assert_called_once()
 
@@ -153,7 +156,7 @@ async def test_update_transaction_goal_id(mcp_write_client, mock_monarch_client)
 
 
 async def test_refresh_accounts_empty(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_accounts.return_value = {"accounts": []}
+    mock_monarch_client.gql_call.return_value = {"accounts": []}
 
     result = json.loads(
         (await mcp_client.call_tool("refresh_accounts")).content[0].text
@@ -187,3 +190,62 @@ def test_main_exception():
         mock_mcp.run.side_effect = OSError("bind failed")
         with pytest.raises(OSError, match="bind failed"):
             main()
+
+
+def test_main_http_transport(monkeypatch):
+    monkeypatch.setattr(
+        "monarch_mcp.server._PARSED_ARGS",
+        argparse.Namespace(enable_write="false", transport="http", host="0.0.0.0", port=9123),
+    )
+    with (
+        patch("monarch_mcp.server.trigger_auth_flow"),
+        patch("monarch_mcp.server.mcp") as mock_mcp,
+    ):
+        main()
+
+    mock_mcp.run.assert_called_once_with(transport="http", host="0.0.0.0", port=9123)
+
+
+# ===================================================================
+# Shared state across sessions
+# ===================================================================
+
+
+async def test_sessions_share_one_client(mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = {"accounts": []}
+
+    with patch("monarch_mcp.secure_session.MonarchMoney") as mock_cls:
+        mock_cls.return_value = mock_monarch_client
+        async with Client(mcp) as first, Client(mcp) as second:
+            await asyncio.gather(
+                first.call_tool("get_accounts"),
+                second.call_tool("get_accounts"),
+                first.call_tool("get_accounts"),
+            )
+
+    mock_cls.assert_called_once_with(token="fake-token")
+    assert mock_monarch_client.gql_call.await_count == 3
+
+
+async def test_slow_call_does_not_block_other_sessions(mock_monarch_client):
+    other_started = asyncio.Event()
+
+    async def _slow_tags():
+        # Only finishes once the other session's call has run meanwhile
+        await asyncio.wait_for(other_started.wait(), 5)
+        return {"householdTransactionTags": []}
+
+    async def _categories():
+        other_started.set()
+        return {"categories": []}
+
+    mock_monarch_client.get_transaction_tags.side_effect = _slow_tags
+    mock_monarch_client.get_transaction_categories.side_effect = _categories
+    async with Client(mcp) as first, Client(mcp) as second:
+        slow = asyncio.create_task(first.call_tool("get_transaction_tags"))
+        await asyncio.sleep(0.05)
+        fast = await asyncio.wait_for(second.call_tool("get_transaction_categories"), 5)
+        tags = await asyncio.wait_for(slow, 5)
+
+    assert json.loads(fast.content[0].text) == {"categories": []}
+    assert json.loads(tags.content[0].text) == []
@@ -0,0 +1,267 @@
+"""Tests for the cross-process (SQLite / Redis-protocol) cache backends."""
+# pylint: disable=missing-function-docstring
+
+import os
+import pickle
+import stat
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime
+
+import pytest
+
+from monarch_mcp import shared_cache, tenants
+from monarch_mcp.cache import TenantCache, open_configured_store
+from monarch_mcp.timeseries import SeriesEntry
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _sqlite_cache(path):
+    return TenantCache(open_store=lambda: shared_cache.SQLiteStore(str(path)))
+
+
+@pytest.fixture(name="redis_server")
+def _redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def _redis_cache(server):
+    fakeredis = pytest.importorskip("fakeredis")
+    return TenantCache(
+        open_store=lambda: shared_cache.RedisStore(client=fakeredis.FakeRedis(server=server)),
+    )
+
+
+def _store_keys(store):
+    """Every raw key in a SQLite or Redis store."""
+    if isinstance(store, shared_cache.SQLiteStore):
+        rows = store._conn.execute("SELECT key FROM entries").fetchall()  # pylint: disable=protected-access
+        return [row[0] for row in rows]
+    prefix = shared_cache.REDIS_KEY_PREFIX
+    return [
+        key.decode()[len(prefix):]
+        for key in store._redis.scan_iter(match=prefix + "*")  # pylint: disable=protected-access
+    ]
+
+
+class _DownStore:
+    """A store whose server cannot be reached."""
+
+    def __getattr__(self, _name):
+        def _fail(*_args, **_kwargs):
+            raise ConnectionError("connection refused")
+        return _fail
+
+
+# ---------------------------------------------------------------------------
+# Shared behaviour (both backends)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(name="make_cache", params=["sqlite", "redis"])
+def _make_cache(request, tmp_path):
+    if request.param == "sqlite":
+        return lambda: _sqlite_cache(tmp_path / "shared.sqlite3")
+    server = request.getfixturevalue("redis_server")
+    return lambda: _redis_cache(server)
+
+
+def test_workers_share_entries(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+
+    worker_a.set(("reference", "monarch://tags"), [{"id": "t1"}])
+
+    assert worker_b.get(("reference", "monarch://tags")) == [{"id": "t1"}]
+    assert ("reference", "monarch://tags") in worker_b
+
+
+def test_invalidation_is_seen_by_other_workers(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+    worker_a.set(("account_holdings", "a1"), {"h": 1})
+    worker_a.set(("aggregate_snapshots", "2025-01-01", None), {"s": 1})
+    worker_a.set(("aggregate_snapshots", "2025-02-01", None), {"s": 2})
+    worker_a.set(("aggregate", "other"), {"s": 3})
+
+    worker_b.invalidate(("account_holdings", "a1"))
+    removed = worker_b.invalidate_prefix("aggregate_snapshots")
+
+    assert removed == 2
+    assert ("account_holdings", "a1") not in worker_a
+    assert ("aggregate_snapshots", "2025-01-01", None) not in worker_a
+    assert worker_a.get(("aggregate", "other")) == {"s": 3}
+
+
+def test_entries_are_namespaced_by_tenant(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+    worker_a.set(("k",), "default")
+
+    with tenants.use("house-b"):
+        assert ("k",) not in worker_b
+        worker_b.set(("k",), "b")
+        worker_b.clear()
+
+    assert worker_a.get(("k",)) is None
+
+
+def test_entries_expire(make_cache):
+    cache = make_cache()
+
+    cache.set(("k",), "v", ttl=0.05)
+    time.sleep(0.1)
+
+    assert cache.get(("k",), "gone") == "gone"
+
+
+def test_python_objects_round_trip(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+    entry = SeriesEntry(
+        start=date(2025, 1, 1), stable_through=date(2025, 1, 9),
+        fetched_through=date(2025, 1, 10), points=[{"date": "2025-01-01", "a1": 1.5}],
+    )
+
+    worker_a.set(("recent_account_balances", None), entry)
+
+    assert worker_b.get(("recent_account_balances", None)) == entry
+
+
+def test_tagged_values_round_trip(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+    value = {
+        "page": (["t1", "t2"], None),
+        "when": datetime(2025, 1, 2, 3, 4, 5),
+        "day": date(2025, 1, 2),
+        "by_id": {1: "one", ("a", 2): "pair"},
+        "__mcp_type__": "tuple",
+    }
+
+    worker_a.set(("k",), value)
+
+    assert worker_b.get(("k",)) == value
+
+
+def test_unencodable_value_is_not_cached(make_cache):
+    cache = make_cache()
+
+    cache.set(("k",), object())
+
+    assert cache.get(("k",), "miss") == "miss"
+
+
+def test_stored_pickle_is_never_loaded(make_cache, tmp_path):
+    cache = make_cache()
+    cache.set(("k",), "placeholder")
+    marker = tmp_path / "pwned"
+
+    class _Payload:  # pylint: disable=too-few-public-methods
+        def __reduce__(self):
+            return (os.mkdir, (str(marker),))
+
+    store = cache._store  # pylint: disable=protected-access
+    [raw_key] = _store_keys(store)
+    store.set(raw_key, pickle.dumps(_Payload()), 60)
+
+    assert cache.get(("k",), "miss") == "miss"
+    assert not marker.exists()
+
+
+def test_concurrent_increments_are_not_lost(make_cache):
+    workers = [make_cache() for _ in range(4)]
+
+    def _bump(cache):
+        for _ in range(25):
+            cache.incr(("transaction_generation", "tags"), ttl=60)
+
+    threads = [threading.Thread(target=_bump, args=(cache,)) for cache in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert workers[0].get(("transaction_generation", "tags")) == 100
+    assert workers[1].incr(("transaction_generation", "tags"), ttl=60) == 101
+
+
+def test_prefix_with_pattern_characters(make_cache):
+    cache = make_cache()
+    cache.set(("tag*[x]?", "1"), 1)
+    cache.set(("tag", "2"), 2)
+
+    assert cache.invalidate_prefix("tag*[x]?") == 1
+    assert cache.get(("tag", "2")) == 2
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+
+def test_sqlite_uses_wal_and_owner_only_file(tmp_path):
+    path = tmp_path / "shared.sqlite3"
+    store = shared_cache.SQLiteStore(str(path))
+
+    mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]  # pylint: disable=protected-access
+
+    assert mode == "wal"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_sqlite_shared_with_another_process(tmp_path):
+    path = tmp_path / "shared.sqlite3"
+    _sqlite_cache(path).set(("reference", "monarch://accounts"), ["from parent"])
+    script = (
+        "from monarch_mcp import shared_cache\n"
+        "from monarch_mcp.cache import TenantCache\n"
+        f"cache = TenantCache(open_store=lambda: shared_cache.SQLiteStore({str(path)!r}))\n"
+        "print(cache.get(('reference', 'monarch://accounts')))\n"
+        "cache.set(('reference', 'monarch://tags'), ['from child'])\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+    output = subprocess.run(
+        [sys.executable, "-c", script], env=env, capture_output=True, text=True,
+        check=True, timeout=60,
+    ).stdout
+
+    assert "from parent" in output
+    assert _sqlite_cache(path).get(("reference", "monarch://tags")) == ["from child"]
+
+
+# ---------------------------------------------------------------------------
+# Configuration and failure handling
+# ---------------------------------------------------------------------------
+
+
+def test_backend_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("MONARCH_MCP_CACHE_BACKEND", "sqlite")
+
+    TenantCache(open_store=open_configured_store).set(("k",), 1)
+
+    assert (tmp_path / "cache" / "response-cache.sqlite3").exists()
+
+
+def test_memory_backend_is_default(monkeypatch):
+    monkeypatch.delenv("MONARCH_MCP_CACHE_BACKEND", raising=False)
+
+    assert open_configured_store() is None
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cache backend"):
+        shared_cache.open_store("memcached://x", str(tmp_path / "c.sqlite3"))
+
+
+def test_unreachable_store_acts_as_a_miss():
+    cache = TenantCache(open_store=_DownStore)
+
+    cache.set(("k",), "v")
+    cache.invalidate(("k",))
+
+    assert cache.get(("k",)) is None
+    assert cache.invalidate_prefix("k") == 0
@@ -0,0 +1,316 @@
+"""Tests for tenant-scoped sessions, caches and budgets."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastmcp import Client
+from gql.transport.exceptions import TransportServerError
+from mcp.shared.exceptions import McpError
+
+from monarch_mcp import jobs, scheduler, tenants
+from monarch_mcp.cache import TenantCache, cache_dir, response_cache
+from monarch_mcp.secure_session import secure_session
+from monarch_mcp.server import mcp
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+_TOKENS = {"monarch-token": "token-default", "monarch-token:house-b": "token-b"}
+
+# Access token a caller presents to use house-b
+_ACCESS_B = "s3cret-b"
+
+
+@pytest.fixture(name="households")
+def _households(monkeypatch):
+    """Two tenants, each with its own keyring token and client."""
+    monkeypatch.setenv("MONARCH_MCP_TENANTS", "house-b")
+    monkeypatch.setenv("MONARCH_MCP_TENANT_TOKENS", f"house-b={_ACCESS_B}")
+    clients = {}
+
+    def _client(token):
+        client = clients[token] = AsyncMock()
+        client.token = token
+        client.gql_call.return_value = {
+            "accounts": [{"id": f"acct-{token}", "displayName": token}],
+        }
+        return client
+
+    with (
+        patch("monarch_mcp.secure_session.keyring") as mock_kr,
+        patch("monarch_mcp.secure_session.MonarchMoney") as mock_cls,
+    ):
+        mock_kr.get_password.side_effect = lambda _service, user: _TOKENS.get(user)
+        mock_cls.side_effect = _client
+        yield clients, mock_kr
+
+
+async def _call(client, name, **args):
+    text = (await client.call_tool(name, args)).content[0].text
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+# ---------------------------------------------------------------------------
+# Session selection
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("tenant_id, message", [
+    ("house b", "Invalid tenant id"),
+    ("../etc", "Invalid tenant id"),
+    ("house-z", "Unknown tenant"),
+])
+def test_validate_rejects_malformed_and_unlisted_ids(monkeypatch, tenant_id, message):
+    monkeypatch.setenv("MONARCH_MCP_TENANTS", "house-b")
+
+    with pytest.raises(ValueError, match=message):
+        tenants.validate(tenant_id)
+
+
+def test_default_tenant_uses_the_original_keyring_entry():
+    assert tenants.get(tenants.validate(tenants.DEFAULT_TENANT)).session is secure_session
+
+
+
+async def test_sessions_use_their_tenants_client(households):
+    clients, _ = households
+    async with Client(mcp) as first, Client(mcp) as second:
+        selected = await _call(second, "select_tenant", tenant_id="house-b", access_token=_ACCESS_B)
+        accounts_a, accounts_b = await asyncio.gather(
+            _call(first, "get_accounts"), _call(second, "get_accounts"),
+        )
+
+    assert selected == {"tenant": "house-b"}
+    assert accounts_a[0]["id"] == "acct-token-default"
+    assert accounts_b[0]["id"] == "acct-token-b"
+    assert set(clients) == {"token-default", "token-b"}
+
+
+async def test_reference_cache_is_per_tenant(households):
+    clients, _ = households
+    async with Client(mcp) as first, Client(mcp) as second:
+        await _call(second, "select_tenant", tenant_id="house-b", access_token=_ACCESS_B)
+        await _call(first, "get_accounts")
+        await _call(second, "refresh_accounts")
+
+    # The second tenant could not reuse the first tenant's cached account list
+    clients["token-b"].gql_call.assert_awaited_once()
+    clients["token-b"].request_accounts_refresh.assert_awaited_once_with(["acct-token-b"])
+
+
+async def test_header_selects_tenant(households):
+    clients, _ = households
+    with patch(
+        "monarch_mcp.tenants.get_http_headers",
+        return_value={
+            tenants.TENANT_HEADER: "house-b", "authorization": f"Bearer {_ACCESS_B}",
+        },
+    ):
+        async with Client(mcp) as client:
+            accounts = await _call(client, "get_accounts")
+
+    assert accounts[0]["id"] == "acct-token-b"
+    assert "token-default" not in clients
+
+
+async def test_unknown_tenant_is_rejected(mcp_client):
+    result = await _call(mcp_client, "select_tenant", tenant_id="house-z")
+
+    assert "Unknown tenant 'house-z'" in result["error"]
+
+
+@pytest.mark.parametrize("access_token", [None, "guess"])
+async def test_selection_needs_access_token(households, access_token):
+    clients, _ = households
+    async with Client(mcp) as client:
+        selected = await _call(
+            client, "select_tenant", tenant_id="house-b", access_token=access_token,
+        )
+        accounts = await _call(client, "get_accounts")
+
+    assert "wrong access token for tenant 'house-b'" in selected["error"]
+    assert accounts[0]["id"] == "acct-token-default"
+    assert "token-b" not in clients
+
+
+async def test_header_needs_access_token(households):
+    clients, _ = households
+    with patch(
+        "monarch_mcp.tenants.get_http_headers",
+        return_value={tenants.TENANT_HEADER: "house-b", "authorization": "Bearer guess"},
+    ):
+        with pytest.raises(McpError, match="wrong access token for tenant 'house-b'"):
+            async with Client(mcp) as client:
+                await client.call_tool("get_accounts", {})
+
+    assert "token-b" not in clients
+
+
+async def test_tenant_without_access_token_cannot_be_selected(monkeypatch, mcp_client):
+    monkeypatch.setenv("MONARCH_MCP_TENANTS", "house-c")
+
+    result = await _call(mcp_client, "select_tenant", tenant_id="house-c", access_token="x")
+
+    assert "has no access token" in result["error"]
+
+
+async def test_tenant_without_token(monkeypatch, mcp_client, mock_monarch_client):
+    monkeypatch.setenv("MONARCH_MCP_TENANTS", "house-c")
+    monkeypatch.setenv("MONARCH_MCP_TENANT_TOKENS", "house-c=s3cret-c")
+    with patch("monarch_mcp.secure_session.keyring") as mock_kr:
+        mock_kr.get_password.return_value = None
+        await _call(mcp_client, "select_tenant", tenant_id="house-c", access_token="s3cret-c")
+        result = await _call(mcp_client, "get_accounts")
+
+    assert "login_setup.py --tenant house-c" in result
+    mock_monarch_client.gql_call.assert_not_called()
+
+
+async def test_tenant_auth_error_clears_only_its_token(households):
+    clients, mock_kr = households
+    async with Client(mcp) as client:
+        await _call(client, "select_tenant", tenant_id="house-b", access_token=_ACCESS_B)
+        await _call(client, "get_accounts")
+        clients["token-b"].gql_call.side_effect = TransportServerError(
+            "Unauthorized", code=401,
+        )
+        with patch("monarch_mcp.server.trigger_auth_flow") as mock_auth:
+            result = await _call(client, "get_accounts")
+
+    assert "login_setup.py --tenant house-b" in result
+    mock_kr.delete_password.assert_called_once_with(
+        "com.mcp.monarch-mcp", "monarch-token:house-b",
+    )
+    mock_auth.assert_not_called()
+
+
+async def test_jobs_are_private_to_their_tenant(households):
+    clients, _ = households
+    release = asyncio.Event()
+
+    async def _slow_status(**_kwargs):
+        await release.wait()
+        return {"accounts": []}
+
+    async with Client(mcp) as first, Client(mcp) as second:
+        await _call(second, "select_tenant", tenant_id="house-b", access_token=_ACCESS_B)
+        await _call(second, "get_accounts")
+        clients["token-b"].gql_call.side_effect = _slow_status
+        started = await _call(second, "start_accounts_refresh")
+        other = await _call(first, "get_refresh_status", job_id=started["job_id"])
+        own = await _call(second, "get_refresh_status", job_id=started["job_id"])
+        release.set()
+        jobs.job_registry.clear()
+
+    assert other["error"].startswith("Unknown refresh job")
+    assert own["status"] == "running"
+
+
+# ---------------------------------------------------------------------------
+# Scoped storage
+# ---------------------------------------------------------------------------
+
+
+def test_tenant_cache_separates_entries():
+    cache = TenantCache()
+    cache.set(("k",), "default")
+    with tenants.use("house-b"):
+        assert ("k",) not in cache
+        cache.set(("k",), "b")
+        cache.invalidate_prefix("k")
+        assert cache.get(("k",)) is None
+
+    assert cache.get(("k",)) == "default"
+    cache.clear()
+    assert ("k",) not in cache
+
+
+def test_cache_dir_per_tenant(tmp_path):
+    base = str(tmp_path / "cache")
+
+    assert cache_dir("series") == os.path.join(base, "series")
+    with tenants.use("house-b"):
+        assert cache_dir("series") == os.path.join(base, "tenants", "house-b", "series")
+
+
+def test_response_cache_clear_covers_every_tenant():
+    with tenants.use("house-b"):
+        response_cache.set(("k",), 1)
+    response_cache.clear()
+
+    with tenants.use("house-b"):
+        assert ("k",) not in response_cache
+
+
+# ---------------------------------------------------------------------------
+# Request budget
+# ---------------------------------------------------------------------------
+
+
+def test_budget_allows_burst_then_spaces_requests():
+    budget = tenants.RequestBudget(per_minute=3)
+
+    waits = [budget.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(20, abs=0.1)
+    assert waits[4] == pytest.approx(40, abs=0.1)
+
+
+def test_unlimited_budget_never_waits():
+    budget = tenants.RequestBudget(per_minute=0)
+
+    assert all(budget.reserve() == 0.0 for _ in range(100))
+
+
+def test_budget_is_per_tenant(monkeypatch):
+    monkeypatch.setenv("MONARCH_MCP_TENANTS", "house-b")
+    monkeypatch.setenv("MONARCH_MCP_TENANT_RATE_LIMIT", "1")
+
+    tenants.get("default").budget.reserve()
+
+    assert tenants.get("default").budget.reserve() > 0
+    assert tenants.get("house-b").budget.reserve() == 0.0
+
+
+async def test_budget_is_charged_per_upstream_request(monkeypatch, mcp_client, mock_monarch_client):
+    monkeypatch.setenv("MONARCH_MCP_TENANT_RATE_LIMIT", "2")
+    rows = [{"id": str(i), "date": "2025-01-15"} for i in range(500)]
+    pages = iter([
+        {"allTransactions": {"results": rows}},
+        # The next page starts at the cursor's anchor row and holds nothing after it
+        {"allTransactions": {"results": rows[-1:]}},
+    ])
+    mock_monarch_client.get_transactions.side_effect = lambda **_kwargs: next(pages)
+
+    await mcp_client.call_tool("export_transactions", {"background": False})
+
+    # Both pages were charged, so a third request has to wait
+    assert mock_monarch_client.get_transactions.await_count == 2
+    assert tenants.get().budget.reserve() > 0
+
+
+async def test_throttled_tenant_does_not_hold_up_others():
+    class _Client:  # pylint: disable=too-few-public-methods
+        async def get_accounts(self):
+            return {"accounts": []}
+
+    throttled = tenants.RequestBudget(per_minute=1)
+    throttled.reserve()
+    waiting = asyncio.create_task(scheduler.UpstreamClient(_Client(), throttled).get_accounts())
+    other = scheduler.UpstreamClient(_Client(), tenants.RequestBudget(per_minute=1))
+
+    assert await asyncio.wait_for(other.get_accounts(), 1) == {"accounts": []}
+    assert not waiting.done()
+    assert scheduler.scheduler.stats()["classes"]["interactive"]["active"] == 0
+    waiting.cancel()
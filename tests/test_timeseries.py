@@ -0,0 +1,188 @@
+"""Tests for cached, downsampled balance series (aggregate snapshots, recent balances)."""
+# pylint: disable=missing-function-docstring
+
+import json
+from datetime import date, timedelta
+
+from monarch_mcp import timeseries
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+TODAY = date.today()
+
+
+def _day(offset):
+    return (TODAY + timedelta(days=offset)).isoformat()
+
+
+def _snapshots(first, last, value=lambda i: 100.0 + i):
+    """Aggregate snapshots for day offsets first..last (inclusive)."""
+    return {
+        "aggregateSnapshots": [
+            {"date": _day(i), "balance": value(i)} for i in range(first, last + 1)
+        ]
+    }
+
+
+async def _aggregate(client, **args):
+    return json.loads(
+        (await client.call_tool("get_aggregate_snapshots", args)).content[0].text
+    )
+
+
+async def _recent(client, **args):
+    return json.loads(
+        (await client.call_tool("get_recent_account_balances", args)).content[0].text
+    )
+
+
+# ---------------------------------------------------------------------------
+# get_aggregate_snapshots — caching
+# ---------------------------------------------------------------------------
+
+
+async def test_aggregate_second_call_served_from_cache(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(-10, 0)
+
+    first = await _aggregate(mcp_client)
+    second = await _aggregate(mcp_client)
+
+    assert first == second
+    assert len(first["aggregateSnapshots"]) == 11
+    mock_monarch_client.get_aggregate_snapshots.assert_called_once_with()
+
+
+async def test_aggregate_fetches_only_new_days(
+    mcp_client, mock_monarch_client, monkeypatch,
+):
+    monkeypatch.setattr("monarch_mcp.server._SERIES_TAIL_TTL", 0)
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(-10, 0)
+    await _aggregate(mcp_client)
+
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(
+        0, 0, value=lambda i: 999.0,
+    )
+    result = await _aggregate(mcp_client)
+
+    mock_monarch_client.get_aggregate_snapshots.assert_called_with(start_date=_day(0))
+    points = result["aggregateSnapshots"]
+    assert len(points) == 11
+    assert points[-1] == {"date": _day(0), "balance": 999.0}
+    assert points[0]["balance"] == 90.0
+
+
+async def test_aggregate_past_range_served_locally(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(-30, -1)
+    await _aggregate(mcp_client, start_date=_day(-30), end_date=_day(-1))
+
+    result = await _aggregate(mcp_client, start_date=_day(-20), end_date=_day(-11))
+
+    mock_monarch_client.get_aggregate_snapshots.assert_called_once()
+    points = result["aggregateSnapshots"]
+    assert [p["date"] for p in points] == [_day(i) for i in range(-20, -10)]
+
+
+async def test_aggregate_earlier_start_refetches(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(-5, 0)
+    await _aggregate(mcp_client, start_date=_day(-5))
+
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(-20, 0)
+    result = await _aggregate(mcp_client, start_date=_day(-20))
+
+    mock_monarch_client.get_aggregate_snapshots.assert_called_with(start_date=_day(-20))
+    assert len(result["aggregateSnapshots"]) == 21
+
+
+async def test_aggregate_account_type_cached_separately(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(-2, 0)
+
+    await _aggregate(mcp_client)
+    await _aggregate(mcp_client, account_type="brokerage")
+
+    assert mock_monarch_client.get_aggregate_snapshots.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# get_aggregate_snapshots — downsampling
+# ---------------------------------------------------------------------------
+
+
+async def test_aggregate_max_points(mcp_client, mock_monarch_client):
+    spike = -50
+    mock_monarch_client.get_aggregate_snapshots.return_value = _snapshots(
+        -99, 0, value=lambda i: 10_000.0 if i == spike else 100.0,
+    )
+
+    result = await _aggregate(mcp_client, max_points=10)
+
+    points = result["aggregateSnapshots"]
+    assert len(points) == 10
+    assert points[0]["date"] == _day(-99)
+    assert points[-1]["date"] == _day(0)
+    assert {"date": _day(spike), "balance": 10_000.0} in points
+
+
+async def test_aggregate_max_points_invalid(mcp_client):
+    result = await _aggregate(mcp_client, max_points=2)
+    assert "error" in result
+
+
+# ---------------------------------------------------------------------------
+# get_recent_account_balances
+# ---------------------------------------------------------------------------
+
+
+RECENT = {
+    "accounts": [
+        {"id": "acc-1", "recentBalances": [10.0, 20.0, 30.0]},
+        {"id": "acc-2", "recentBalances": [5.0, 5.0, 5.0]},
+    ]
+}
+
+
+async def test_recent_balances_shape_and_cache(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_recent_account_balances.return_value = RECENT
+
+    first = await _recent(mcp_client, start_date=_day(-2))
+    second = await _recent(mcp_client, start_date=_day(-1))
+
+    mock_monarch_client.get_recent_account_balances.assert_called_once_with(
+        start_date=_day(-2),
+    )
+    assert first["startDate"] == _day(-2)
+    assert first["accounts"][0] == {"id": "acc-1", "recentBalances": [10.0, 20.0, 30.0]}
+    assert second["accounts"][0] == {"id": "acc-1", "recentBalances": [20.0, 30.0]}
+
+
+async def test_recent_balances_max_points(mcp_client, mock_monarch_client):
+    mock_monarch_client.get_recent_account_balances.return_value = {
+        "accounts": [{"id": "acc-1", "recentBalances": [float(i) for i in range(32)]}]
+    }
+
+    result = await _recent(mcp_client, max_points=5)
+
+    series = result["accounts"][0]["recentBalances"]
+    assert len(series) == 5
+    assert series[0] == {"date": _day(-31), "balance": 0.0}
+    assert series[-1] == {"date": _day(0), "balance": 31.0}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def test_downsample_drops_missing_values():
+    points = [{"date": _day(i), "v": None if i == 1 else i} for i in range(3)]
+    assert timeseries.downsample(points, 5, "v") == [points[0], points[2]]
+
+
+def test_merge_points_fresh_wins():
+    merged = timeseries.merge_points(
+        [{"date": "2025-01-01", "v": 1}, {"date": "2025-01-02", "v": 2}],
+        [{"date": "2025-01-02", "v": 3}],
+    )
+    assert merged == [{"date": "2025-01-01", "v": 1}, {"date": "2025-01-02", "v": 3}]
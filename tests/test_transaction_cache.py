@@ -0,0 +1,221 @@
+"""Tests for write-through caching of transaction reads."""
+# pylint: disable=missing-function-docstring
+
+import json
+
+from monarch_mcp.cache import response_cache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _txn(**fields):
+    return {
+        "id": "t1", "date": "2025-01-15", "amount": -12.5, "plaidName": "CAFE 123",
+        "category": {"id": "c1", "name": "Coffee"},
+        "account": {"id": "a1", "displayName": "Checking"},
+        "merchant": {"id": "m1", "name": "Cafe"},
+        "notes": None, "pending": False, "isRecurring": False, "hideFromReports": False,
+        "tags": [],
+        **fields,
+    }
+
+
+def _page(*transactions):
+    return {"allTransactions": {"totalCount": len(transactions), "results": list(transactions)}}
+
+
+async def _call(client, tool, **args):
+    return json.loads((await client.call_tool(tool, args)).content[0].text)
+
+
+async def _transactions(client, **args):
+    return (await _call(client, "get_transactions", **args))["transactions"]
+
+
+def _updated(**fields):
+    return {"updateTransaction": {"transaction": {"id": "t1", **fields}, "errors": None}}
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+async def test_repeat_read_is_served_from_cache(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+
+    first = await _transactions(mcp_client, limit=10)
+    second = await _transactions(mcp_client, limit=10)
+
+    assert first == second
+    assert mock_monarch_client.gql_call.await_count == 1
+
+
+async def test_other_filters_are_fetched(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+
+    await _transactions(mcp_client, limit=10)
+    await _transactions(mcp_client, limit=10, has_notes=True)
+
+    assert mock_monarch_client.gql_call.await_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Write-through
+# ---------------------------------------------------------------------------
+
+
+async def test_update_is_read_back_without_upstream_call(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.update_transaction.return_value = _updated(
+        notes="Team lunch", merchant={"id": "m1", "name": "Cafe Nero"},
+        category={"id": "c1"},
+    )
+    await _transactions(mcp_write_client, limit=10)
+
+    await _call(mcp_write_client, "update_transaction", transaction_id="t1", notes="Team lunch")
+    [txn] = await _transactions(mcp_write_client, limit=10)
+
+    assert txn["notes"] == "Team lunch"
+    assert txn["merchant"] == "Cafe Nero"
+    assert txn["category"] == "Coffee"
+    assert mock_monarch_client.gql_call.await_count == 1
+
+
+async def test_new_category_named_from_cached_categories(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.get_transaction_categories.return_value = {
+        "categories": [{"id": "c1", "name": "Coffee"}, {"id": "c2", "name": "Groceries"}],
+    }
+    mock_monarch_client.update_transaction.return_value = _updated(category={"id": "c2"})
+    await _call(mcp_write_client, "get_transaction_categories")
+    await _transactions(mcp_write_client, limit=10)
+
+    await _call(mcp_write_client, "update_transaction", transaction_id="t1", category_id="c2")
+    [txn] = await _transactions(mcp_write_client, limit=10)
+
+    assert txn["category"] == "Groceries"
+    assert mock_monarch_client.gql_call.await_count == 1
+
+
+async def test_unknown_category_drops_cached_copy(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.update_transaction.return_value = _updated(category={"id": "c9"})
+    await _transactions(mcp_write_client, limit=10)
+
+    await _call(mcp_write_client, "update_transaction", transaction_id="t1", category_id="c9")
+    await _transactions(mcp_write_client, limit=10)
+
+    assert mock_monarch_client.gql_call.await_count == 2
+
+
+async def test_only_pages_filtering_on_written_field_are_refetched(
+    mcp_write_client, mock_monarch_client,
+):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.update_transaction.return_value = _updated(notes="Team lunch")
+    await _transactions(mcp_write_client, limit=10, category_ids=["c1"])
+    await _transactions(mcp_write_client, limit=10, has_notes=False)
+
+    await _call(mcp_write_client, "update_transaction", transaction_id="t1", notes="Team lunch")
+    by_category = await _transactions(mcp_write_client, limit=10, category_ids=["c1"])
+    await _transactions(mcp_write_client, limit=10, has_notes=False)
+
+    assert by_category[0]["notes"] == "Team lunch"
+    # Only the has_notes page could now hold other transactions
+    assert mock_monarch_client.gql_call.await_count == 3
+
+
+async def test_set_tags_patches_cached_reads(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.get_transaction_tags.return_value = {"householdTransactionTags": [
+        {"id": "g1", "name": "Work", "color": "#19D2A5", "order": 1, "transactionCount": 3},
+    ]}
+    mock_monarch_client.set_transaction_tags.return_value = {
+        "setTransactionTags": {"errors": None, "transaction": {"id": "t1", "tags": [{"id": "g1"}]}},
+    }
+    await _call(mcp_write_client, "get_transaction_tags")
+    await _transactions(mcp_write_client, limit=10)
+
+    await _call(mcp_write_client, "set_transaction_tags", transaction_id="t1", tag_ids=["g1"])
+    [txn] = await _transactions(mcp_write_client, limit=10)
+
+    assert txn["tags"] == [{"id": "g1", "name": "Work", "color": "#19D2A5"}]
+    assert mock_monarch_client.gql_call.await_count == 1
+
+
+async def test_split_update_patches_cached_splits(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.get_transaction_splits.return_value = {"getTransaction": {
+        "id": "t1", "amount": -20.0, "splitTransactions": [],
+    }}
+    splits = [{"id": "s1", "amount": -20.0, "category": {"id": "c1", "name": "Coffee"}}]
+    mock_monarch_client.update_transaction_splits.return_value = {"updateTransactionSplit": {
+        "errors": None,
+        "transaction": {"id": "t1", "hasSplitTransactions": True, "splitTransactions": splits},
+    }}
+    await _call(mcp_write_client, "get_transaction_splits", transaction_id="t1")
+
+    await _call(
+        mcp_write_client, "update_transaction_splits", transaction_id="t1",
+        split_data=[{"merchantName": "Cafe", "amount": -20.0, "categoryId": "c1"}],
+    )
+    result = await _call(mcp_write_client, "get_transaction_splits", transaction_id="t1")
+
+    assert result["getTransaction"]["splitTransactions"] == splits
+    mock_monarch_client.get_transaction_splits.assert_awaited_once()
+
+
+async def test_update_patches_cached_details(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.get_transaction_details.return_value = {"getTransaction": _txn()}
+    mock_monarch_client.update_transaction.return_value = _updated(amount=-15.0)
+    await _call(mcp_write_client, "get_transaction_details", transaction_id="t1")
+
+    await _call(mcp_write_client, "update_transaction", transaction_id="t1", amount=-15.0)
+    result = await _call(mcp_write_client, "get_transaction_details", transaction_id="t1")
+
+    assert result["getTransaction"]["amount"] == -15.0
+    assert result["getTransaction"]["category"]["name"] == "Coffee"
+    mock_monarch_client.get_transaction_details.assert_awaited_once()
+
+
+async def test_failed_write_drops_cached_copy(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.update_transaction.side_effect = RuntimeError("upstream timeout")
+    await _transactions(mcp_write_client, limit=10)
+
+    await mcp_write_client.call_tool(
+        "update_transaction", {"transaction_id": "t1", "notes": "x"}, raise_on_error=False,
+    )
+    await _transactions(mcp_write_client, limit=10)
+
+    assert mock_monarch_client.gql_call.await_count == 2
+
+
+async def test_create_refetches_pages(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.gql_call.return_value = _page(_txn())
+    mock_monarch_client.create_transaction.return_value = {"createTransaction": {}}
+    await _transactions(mcp_write_client, limit=10)
+
+    await _call(
+        mcp_write_client, "create_transaction", account_id="a1", amount=-5.0,
+        merchant_name="Bakery", category_id="c1", date="2025-01-16",
+    )
+    await _transactions(mcp_write_client, limit=10)
+
+    assert mock_monarch_client.gql_call.await_count == 2
+
+
+async def test_write_drops_derived_aggregates(mcp_write_client, mock_monarch_client):
+    mock_monarch_client.update_transaction.return_value = _updated(notes="x")
+    response_cache.set(("forecast_run_rates", "2025-01-15", 90), {"a1": 1.0})
+    response_cache.set(("forecast_cashflow", "digest"), {"days": []})
+    response_cache.set(("account_holdings", "a1"), {"holdings": []})
+
+    await _call(mcp_write_client, "update_transaction", transaction_id="t1", notes="x")
+
+    assert ("forecast_run_rates", "2025-01-15", 90) not in response_cache
+    assert ("forecast_cashflow", "digest") not in response_cache
+    assert ("account_holdings", "a1") in response_cache
@@ -0,0 +1,205 @@
+"""Tests for cursor pagination in get_transactions."""
+# pylint: disable=missing-function-docstring
+
+import json
+
+from monarch_mcp import pagination
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _FakeLedger:
+    """Serve the transactions query from a list, newest first, like the API."""
+
+    def __init__(self, txns):
+        self.txns = list(txns)
+        self.calls = []
+
+    def add(self, txn):
+        self.txns.append(txn)
+
+    def __call__(self, operation, graphql_query, variables):  # pylint: disable=unused-argument
+        limit, offset = variables["limit"], variables["offset"]
+        start_date = variables["filters"].get("startDate")
+        end_date = variables["filters"].get("endDate")
+        self.calls.append({"limit": limit, "offset": offset,
+                           "start_date": start_date, "end_date": end_date})
+        rows = sorted(self.txns, key=lambda t: (t["date"], t["id"]), reverse=True)
+        if start_date:
+            rows = [t for t in rows if t["date"] >= start_date]
+        if end_date:
+            rows = [t for t in rows if t["date"] <= end_date]
+        return {"allTransactions": {
+            "totalCount": len(rows), "results": rows[offset:offset + limit],
+        }}
+
+
+def _txn(day, n):
+    return {"id": f"{day}-{n:03d}", "date": day, "amount": -1.0}
+
+
+def _ledger(days=6, per_day=4):
+    return _FakeLedger(
+        _txn(f"2025-01-{d:02d}", n) for d in range(1, days + 1) for n in range(per_day)
+    )
+
+
+async def _page(client, **args):
+    return json.loads(
+        (await client.call_tool("get_transactions", args)).content[0].text
+    )
+
+
+async def _iterate(client, ledger, limit, on_page=None):
+    seen = []
+    result = await _page(client, limit=limit)
+    while True:
+        seen.extend(t["id"] for t in result["transactions"])
+        if on_page:
+            on_page(ledger, len(seen))
+        if not result["cursor"]:
+            return seen
+        result = await _page(client, limit=limit, cursor=result["cursor"])
+
+
+# ---------------------------------------------------------------------------
+# Iteration
+# ---------------------------------------------------------------------------
+
+
+async def test_cursor_walks_every_transaction_once(mcp_client, mock_monarch_client):
+    ledger = _ledger()
+    mock_monarch_client.gql_call.side_effect = ledger
+    expected = [
+        t["id"] for t in sorted(ledger.txns, key=lambda t: (t["date"], t["id"]), reverse=True)
+    ]
+
+    seen = await _iterate(mcp_client, ledger, limit=5)
+
+    assert seen == expected
+    # After the first page, offsets never exceed one day's transactions
+    assert all(call["offset"] < 4 for call in ledger.calls[1:])
+
+
+async def test_new_recent_transactions_do_not_shift_pages(mcp_client, mock_monarch_client):
+    ledger = _ledger()
+    mock_monarch_client.gql_call.side_effect = ledger
+    expected = {t["id"] for t in ledger.txns}
+
+    def _sync_newer(led, count):
+        led.add(_txn("2025-02-01", count))
+
+    seen = await _iterate(mcp_client, ledger, limit=3, on_page=_sync_newer)
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
+
+
+async def test_insert_on_anchor_date_rereads_day(mcp_client, mock_monarch_client):
+    ledger = _ledger(days=3, per_day=4)
+    mock_monarch_client.gql_call.side_effect = ledger
+
+    first = await _page(mcp_client, limit=2)
+    assert [t["id"] for t in first["transactions"]] == ["2025-01-03-003", "2025-01-03-002"]
+    # A new transaction lands on the anchor date, ahead of the anchor
+    ledger.add(_txn("2025-01-03", 999))
+    second = await _page(mcp_client, limit=3, cursor=first["cursor"])
+
+    assert [t["id"] for t in second["transactions"]] == [
+        "2025-01-03-001", "2025-01-03-000", "2025-01-02-003",
+    ]
+    assert second["cursor"]
+
+
+async def test_cursor_after_offset_page_continues_without_rereading_day(
+    mcp_client, mock_monarch_client,
+):
+    ledger = _ledger(days=3, per_day=4)
+    mock_monarch_client.gql_call.side_effect = ledger
+
+    # The page's only date began before the offset
+    first = await _page(mcp_client, limit=2, offset=1)
+    assert [t["id"] for t in first["transactions"]] == ["2025-01-03-002", "2025-01-03-001"]
+    assert pagination.decode_cursor(first["cursor"]).position == 3
+
+    ledger.calls.clear()
+    second = await _page(mcp_client, limit=3, cursor=first["cursor"])
+
+    assert [t["id"] for t in second["transactions"]] == [
+        "2025-01-03-000", "2025-01-02-003", "2025-01-02-002",
+    ]
+    assert len(ledger.calls) == 1
+
+
+async def test_cursor_after_offset_page_spanning_dates(mcp_client, mock_monarch_client):
+    ledger = _ledger(days=3, per_day=4)
+    mock_monarch_client.gql_call.side_effect = ledger
+
+    first = await _page(mcp_client, limit=3, offset=2)
+
+    assert [t["id"] for t in first["transactions"]] == [
+        "2025-01-03-001", "2025-01-03-000", "2025-01-02-003",
+    ]
+    assert pagination.decode_cursor(first["cursor"]).position == 1
+    # The last date starts on the page, so no count query is needed
+    assert len(ledger.calls) == 1
+
+
+async def test_last_page_has_null_cursor(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.side_effect = _ledger(days=1, per_day=3)
+
+    result = await _page(mcp_client, limit=5)
+
+    assert len(result["transactions"]) == 3
+    assert result["cursor"] is None
+
+
+async def test_cursor_pages_keep_filters(mcp_client, mock_monarch_client):
+    ledger = _ledger()
+    mock_monarch_client.gql_call.side_effect = ledger
+
+    first = await _page(mcp_client, limit=4, start_date="2025-01-02", end_date="2025-01-05")
+    await _page(
+        mcp_client, limit=4, start_date="2025-01-02", end_date="2025-01-05",
+        cursor=first["cursor"],
+    )
+
+    assert ledger.calls[1]["start_date"] == "2025-01-02"
+    assert ledger.calls[1]["end_date"] == "2025-01-05"
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+
+async def test_cursor_with_different_filters_is_rejected(mcp_client, mock_monarch_client):
+    mock_monarch_client.gql_call.side_effect = _ledger()
+    first = await _page(mcp_client, limit=2)
+
+    result = await _page(mcp_client, limit=2, search="coffee", cursor=first["cursor"])
+
+    assert "different filters" in result["error"]
+
+
+async def test_cursor_and_offset_conflict(mcp_client):
+    cursor = pagination.Cursor("2025-01-01", "t1", 1, "x").encode()
+
+    result = await _page(mcp_client, offset=5, cursor=cursor)
+
+    assert "cursor and offset" in result["error"]
+
+
+async def test_malformed_cursor(mcp_client):
+    result = await _page(mcp_client, cursor="not-a-cursor")
+
+    assert result["error"] == "Malformed cursor."
+
+
+def test_cursor_round_trip():
+    cursor = pagination.Cursor("2025-01-01", "t1", 3, "abc")
+
+    assert pagination.decode_cursor(cursor.encode()) == cursor
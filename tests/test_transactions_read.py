@@ -28,6 +28,21 @@ def _make_txn(i, **overrides):
     return txn
 
 
+def _request(mock_client):
+    """Return (limit, offset, filters) of the one transactions query sent.
+
+    Filters left at their empty defaults are omitted.
+    """
+    mock_client.gql_call.assert_called_once()
+    call = mock_client.gql_call.call_args.kwargs
+    assert call["operation"] == "MCP_GetTransactionsLean"
+    variables = call["variables"]
+    filters = {
+        name: value for name, value in variables["filters"].items() if value not in ("", [])
+    }
+    return variables["limit"], variables["offset"], filters
+
+
 def _wrap(txns):
     """Wrap a list of transaction dicts in the API response envelope."""
     return {"allTransactions": {"results": txns}}
@@ -39,7 +54,7 @@ def _wrap(txns):
 
 
 async def test_basic_limit(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap(
+    mock_monarch_client.gql_call.return_value = _wrap(
         [_make_txn(i) for i in range(10)]
     )
 
@@ -47,8 +62,8 @@ async def test_basic_limit(mcp_client, mock_monarch_client):
         (await mcp_client.call_tool("get_transactions", {"limit": 10})).content[0].text
     )
 
-    assert len(result) == 10
-    mock_monarch_client.get_transactions.assert_called_once_with(limit=10, offset=0)
+    assert len(result["transactions"]) == 10
+    assert _request(mock_monarch_client) == (10, 0, {})
 
 
 # ---------------------------------------------------------------------------
@@ -57,17 +72,17 @@ async def test_basic_limit(mcp_client, mock_monarch_client):
 
 
 async def test_date_range(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions", {"start_date": "2025-01-01", "end_date": "2025-01-31"}
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100,
-        offset=0,
-        start_date="2025-01-01",
-        end_date="2025-01-31",
+    assert _request(mock_monarch_client) == (
+        100, 0, {
+            "startDate": "2025-01-01",
+            "endDate": "2025-01-31",
+        },
     )
 
 
@@ -77,13 +92,11 @@ async def test_date_range(mcp_client, mock_monarch_client):
 
 
 async def test_account_id_filter(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool("get_transactions", {"account_id": "acc-1"})
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, account_ids=["acc-1"]
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"accounts": ["acc-1"]})
 
 
 # ---------------------------------------------------------------------------
@@ -92,19 +105,19 @@ async def test_account_id_filter(mcp_client, mock_monarch_client):
 
 
 async def test_combined_account_and_date(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions",
         {"start_date": "2025-01-01", "end_date": "2025-01-31", "account_id": "acc-1"},
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100,
-        offset=0,
-        start_date="2025-01-01",
-        end_date="2025-01-31",
-        account_ids=["acc-1"],
+    assert _request(mock_monarch_client) == (
+        100, 0, {
+            "startDate": "2025-01-01",
+            "endDate": "2025-01-31",
+            "accounts": ["acc-1"],
+        },
     )
 
 
@@ -140,7 +153,8 @@ async def test_only_end_date_error(mcp_client):
 async def test_pagination_no_overlap(mcp_client, mock_monarch_client):
     page1 = [_make_txn(i) for i in range(5)]
     page2 = [_make_txn(i + 5) for i in range(5)]
-    mock_monarch_client.get_transactions.side_effect = [_wrap(page1), _wrap(page2)]
+    # The offset page is all one date, so its cursor counts the rows after it
+    mock_monarch_client.gql_call.side_effect = [_wrap(page1), _wrap(page2), _wrap([])]
 
     r1 = json.loads(
         (await mcp_client.call_tool("get_transactions", {"limit": 5, "offset": 0})).content[0].text
@@ -149,8 +163,8 @@ async def test_pagination_no_overlap(mcp_client, mock_monarch_client):
         (await mcp_client.call_tool("get_transactions", {"limit": 5, "offset": 5})).content[0].text
     )
 
-    ids1 = {t["id"] for t in r1}
-    ids2 = {t["id"] for t in r2}
+    ids1 = {t["id"] for t in r1["transactions"]}
+    ids2 = {t["id"] for t in r2["transactions"]}
     assert len(ids1 & ids2) == 0, "Pages must not overlap"
 
 
@@ -160,13 +174,13 @@ async def test_pagination_no_overlap(mcp_client, mock_monarch_client):
 
 
 async def test_large_offset_empty(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([])
+    mock_monarch_client.gql_call.return_value = _wrap([])
 
     result = json.loads(
         (await mcp_client.call_tool("get_transactions", {"limit": 10, "offset": 99999})).content[0].text
     )
 
-    assert result == []
+    assert result["transactions"] == []
 
 
 # ---------------------------------------------------------------------------
@@ -175,14 +189,14 @@ async def test_large_offset_empty(mcp_client, mock_monarch_client):
 
 
 async def test_limit_zero(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([])
+    mock_monarch_client.gql_call.return_value = _wrap([])
 
     result = json.loads(
         (await mcp_client.call_tool("get_transactions", {"limit": 0})).content[0].text
     )
 
-    assert result == []
-    mock_monarch_client.get_transactions.assert_called_once_with(limit=0, offset=0)
+    assert result["transactions"] == []
+    assert _request(mock_monarch_client) == (0, 0, {})
 
 
 # ---------------------------------------------------------------------------
@@ -191,14 +205,14 @@ async def test_limit_zero(mcp_client, mock_monarch_client):
 
 
 async def test_negative_limit(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([])
+    mock_monarch_client.gql_call.return_value = _wrap([])
 
     result = json.loads(
         (await mcp_client.call_tool("get_transactions", {"limit": -1})).content[0].text
     )
 
-    assert isinstance(result, list)
-    mock_monarch_client.get_transactions.assert_called_once_with(limit=-1, offset=0)
+    assert isinstance(result["transactions"], list)
+    assert _request(mock_monarch_client) == (-1, 0, {})
 
 
 # ---------------------------------------------------------------------------
@@ -207,14 +221,14 @@ async def test_negative_limit(mcp_client, mock_monarch_client):
 
 
 async def test_negative_offset(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([])
+    mock_monarch_client.gql_call.return_value = _wrap([])
 
     result = json.loads(
         (await mcp_client.call_tool("get_transactions", {"limit": 10, "offset": -1})).content[0].text
     )
 
-    assert isinstance(result, list)
-    mock_monarch_client.get_transactions.assert_called_once_with(limit=10, offset=-1)
+    assert isinstance(result["transactions"], list)
+    assert _request(mock_monarch_client) == (10, -1, {})
 
 
 # ---------------------------------------------------------------------------
@@ -223,7 +237,7 @@ async def test_negative_offset(mcp_client, mock_monarch_client):
 
 
 async def test_very_large_limit(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap(
+    mock_monarch_client.gql_call.return_value = _wrap(
         [_make_txn(i) for i in range(3)]
     )
 
@@ -231,10 +245,8 @@ async def test_very_large_limit(mcp_client, mock_monarch_client):
         (await mcp_client.call_tool("get_transactions", {"limit": 999999})).content[0].text
     )
 
-    assert len(result) == 3
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=999999, offset=0
-    )
+    assert len(result["transactions"]) == 3
+    assert _request(mock_monarch_client) == (999999, 0, {})
 
 
 # ---------------------------------------------------------------------------
@@ -243,7 +255,7 @@ async def test_very_large_limit(mcp_client, mock_monarch_client):
 
 
 async def test_invalid_date_format(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.side_effect = Exception("Invalid date format")
+    mock_monarch_client.gql_call.side_effect = Exception("Invalid date format")
 
     result = (await mcp_client.call_tool(
         "get_transactions", {"start_date": "not-a-date", "end_date": "also-not"}
@@ -259,7 +271,7 @@ async def test_invalid_date_format(mcp_client, mock_monarch_client):
 
 
 async def test_future_dates_empty(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([])
+    mock_monarch_client.gql_call.return_value = _wrap([])
 
     result = json.loads(
         (await mcp_client.call_tool(
@@ -267,7 +279,7 @@ async def test_future_dates_empty(mcp_client, mock_monarch_client):
         )).content[0].text
     )
 
-    assert result == []
+    assert result["transactions"] == []
 
 
 # ---------------------------------------------------------------------------
@@ -276,13 +288,11 @@ async def test_future_dates_empty(mcp_client, mock_monarch_client):
 
 
 async def test_search_filter(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool("get_transactions", {"search": "coffee"})
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, search="coffee"
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"search": "coffee"})
 
 
 # ---------------------------------------------------------------------------
@@ -291,15 +301,13 @@ async def test_search_filter(mcp_client, mock_monarch_client):
 
 
 async def test_category_ids_filter(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions", {"category_ids": ["cat-1", "cat-2"]}
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, category_ids=["cat-1", "cat-2"]
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"categories": ["cat-1", "cat-2"]})
 
 
 # ---------------------------------------------------------------------------
@@ -308,15 +316,13 @@ async def test_category_ids_filter(mcp_client, mock_monarch_client):
 
 
 async def test_account_ids_filter(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions", {"account_ids": ["acc-1", "acc-2"]}
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, account_ids=["acc-1", "acc-2"]
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"accounts": ["acc-1", "acc-2"]})
 
 
 # ---------------------------------------------------------------------------
@@ -339,13 +345,11 @@ async def test_account_id_and_account_ids_conflict(mcp_client):
 
 
 async def test_tag_ids_filter(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool("get_transactions", {"tag_ids": ["tag-1"]})
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, tag_ids=["tag-1"]
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"tags": ["tag-1"]})
 
 
 # ---------------------------------------------------------------------------
@@ -354,15 +358,13 @@ async def test_tag_ids_filter(mcp_client, mock_monarch_client):
 
 
 async def test_bool_filters(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions", {"has_notes": True, "is_recurring": False}
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, has_notes=True, is_recurring=False
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"hasNotes": True, "isRecurring": False})
 
 
 # ---------------------------------------------------------------------------
@@ -371,15 +373,13 @@ async def test_bool_filters(mcp_client, mock_monarch_client):
 
 
 async def test_hidden_from_reports_filter(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions", {"hidden_from_reports": True}
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100, offset=0, hidden_from_reports=True
-    )
+    assert _request(mock_monarch_client) == (100, 0, {"hideFromReports": True})
 
 
 # ---------------------------------------------------------------------------
@@ -388,7 +388,7 @@ async def test_hidden_from_reports_filter(mcp_client, mock_monarch_client):
 
 
 async def test_combined_search_and_filters(mcp_client, mock_monarch_client):
-    mock_monarch_client.get_transactions.return_value = _wrap([_make_txn(0)])
+    mock_monarch_client.gql_call.return_value = _wrap([_make_txn(0)])
 
     await mcp_client.call_tool(
         "get_transactions",
@@ -401,12 +401,12 @@ async def test_combined_search_and_filters(mcp_client, mock_monarch_client):
         },
     )
 
-    mock_monarch_client.get_transactions.assert_called_once_with(
-        limit=100,
-        offset=0,
-        start_date="2025-01-01",
-        end_date="2025-01-31",
-        search="grocery",
-        category_ids=["cat-1"],
-        is_split=False,
+    assert _request(mock_monarch_client) == (
+        100, 0, {
+            "startDate": "2025-01-01",
+            "endDate": "2025-01-31",
+            "search": "grocery",
+            "categories": ["cat-1"],
+            "isSplit": False,
+        },
     )